@@ -0,0 +1,43 @@
+import sys
+import json
+
+"""
+Compare two benchmark result files
+
+    python -m benchmarks.compare before.json after.json
+"""
+
+STATS = ("mean", "p95", "p99")
+
+
+def load(path: str):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def delta(a: float, b: float):
+    """Relative change in percent"""
+    return (b - a) / a * 100 if a else 0.0
+
+
+def compare(before: dict, after: dict):
+    """Print the frame + subsystem changes of every scenario in both files"""
+    print(f"before: {before['meta'].get('commit')}  after: {after['meta'].get('commit')}")
+    for name, a in before["scenarios"].items():
+        b = after["scenarios"].get(name)
+        if not b:
+            continue
+        print(f"\n{name}")
+        rows = [("frame", a["frame"], b["frame"])]
+        rows += [(s, a["subsystems"][s], b["subsystems"][s]) for s in a["subsystems"] if s in b["subsystems"]]
+        for label, sa, sb in rows:
+            cols = "  ".join(f"{stat} {sa[stat]:8.3f} -> {sb[stat]:8.3f} ({delta(sa[stat], sb[stat]):+6.1f}%)"
+                             for stat in STATS)
+            print(f"  {label:16} {cols}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print(__doc__)
+        sys.exit(1)
+    compare(load(sys.argv[1]), load(sys.argv[2]))
@@ -0,0 +1,210 @@
+import os
+import sys
+import time
+import random
+import platform
+import subprocess
+
+"""
+Benchmark harness
+- boots the engine headless, builds a seeded scenario + runs it for a fixed amount of frames
+- every frame advances the clock by the same dt -> runs are comparable across commits
+- per-subsystem times are collected by wrapping the stage methods of the scenario instances
+"""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WINDOW_SIZE = (1280, 720)
+FB_SIZE = (1280//3, 720//3)
+
+# stage --> (owner getter, method name)
+STAGES = {
+    "world.tick": (lambda layer: layer.world, "tick_chunks"),
+    "entities.tick": (lambda layer: layer.handler, "tick_entities"),
+    "world.render": (lambda layer: layer.world, "render_chunks"),
+    "entities.render": (lambda layer: layer.handler, "render_entities"),
+}
+
+
+# -------------------------------------------------- #
+# engine boot
+
+def boot():
+    """Start the engine headless - must run before any engine / scripts import"""
+    os.environ["ENGINE_HEADLESS"] = "1"
+    os.chdir(ROOT)
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    import engine
+    from engine.window import Window
+    Window.create_window("Benchmark", WINDOW_SIZE[0], WINDOW_SIZE[1], 0, 32)
+    return Window.create_framebuffer(FB_SIZE[0], FB_SIZE[1])
+
+
+def seed(value: int):
+    """Seed every rng the game uses"""
+    import numpy as np
+    random.seed(value)
+    np.random.seed(value)
+
+
+def get_meta():
+    """Environment info stored next to the results"""
+    import numpy as np
+    import pygame
+    meta = {"python": platform.python_version(), "pygame": pygame.version.ver, "numpy": np.__version__,
+            "platform": platform.platform(), "commit": None, "dirty": None}
+    try:
+        meta["commit"] = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                                 stderr=subprocess.DEVNULL).decode().strip()
+        meta["dirty"] = bool(subprocess.check_output(["git", "status", "--porcelain", "--untracked-files=no"],
+                                                     cwd=ROOT, stderr=subprocess.DEVNULL).strip())
+    except (OSError, subprocess.CalledProcessError):
+        pass
+    return meta
+
+
+# -------------------------------------------------- #
+# timing
+
+class StageTimer:
+    """
+    Collects per frame times for named stages
+    """
+
+    def __init__(self):
+        """
+        Constructor for StageTimer
+        contains:
+        - current           = dict {str: float} (seconds spent this frame)
+        - frames            = dict {str: list [float]}
+        """
+        self.current = {}
+        self.frames = {}
+
+    def wrap(self, owner, attr: str, name: str):
+        """Replace owner.attr with a timed version of itself"""
+        func = getattr(owner, attr)
+        current = self.current
+        current[name] = 0.0
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            current[name] += time.perf_counter() - start
+            return result
+
+        setattr(owner, attr, timed)
+
+    def time(self, name: str, func, *args):
+        """Time a single call"""
+        start = time.perf_counter()
+        result = func(*args)
+        self.current[name] = self.current.get(name, 0.0) + time.perf_counter() - start
+        return result
+
+    def end_frame(self):
+        """Store the times of this frame + reset"""
+        for name, value in self.current.items():
+            self.frames.setdefault(name, []).append(value)
+            self.current[name] = 0.0
+
+    def clear(self):
+        """Drop every stored frame"""
+        self.frames.clear()
+        for name in self.current:
+            self.current[name] = 0.0
+
+
+def summarize(samples):
+    """mean / p95 / p99 / max of a list of seconds - in milliseconds"""
+    import numpy as np
+    data = np.asarray(samples, dtype=np.float64) * 1000
+    if not len(data):
+        return {"mean": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    return {"mean": round(float(data.mean()), 4), "p95": round(float(np.percentile(data, 95)), 4),
+            "p99": round(float(np.percentile(data, 99)), 4), "max": round(float(data.max()), 4)}
+
+
+# -------------------------------------------------- #
+# bench context
+
+class Bench:
+    """
+    Everything a scenario needs to build itself
+    """
+
+    def __init__(self, fb, fps: int = 60):
+        """
+        Constructor for Bench
+        contains:
+        - fb                = pygame.Surface
+        - fps               = int (simulated frame rate)
+        - scene             = Scene
+        - layer             = Layer
+        - timer             = StageTimer
+        - frame_funcs       = list [func(frame)] (extra per frame work owned by the scenario)
+        """
+        from engine.handler import scenehandler
+        self.fb = fb
+        self.fps = fps
+        self.scene = scenehandler.Scene()
+        self.scene.add_data("bg_color", (153, 220, 80))
+        scenehandler.SceneHandler.push_state(self.scene)
+        self.layer = self.scene.add_layer()
+        self.timer = StageTimer()
+        self.frame_funcs = []
+
+    @property
+    def handler(self):
+        return self.layer.handler
+
+    @property
+    def world(self):
+        return self.layer.world
+
+    def on_frame(self, func):
+        """Run func(frame) every frame - timed as the "scenario" stage"""
+        self.frame_funcs.append(func)
+
+    def instrument(self):
+        """Wrap the engine stages with timers"""
+        from engine.handler.eventhandler import Eventhandler
+        for name, (owner, attr) in STAGES.items():
+            self.timer.wrap(owner(self.layer), attr, name)
+        self.timer.wrap(Eventhandler, "update", "events")
+
+    def frame(self, index: int):
+        """Run a single frame the same way main.py does"""
+        import pygame
+        from engine import headless
+        from engine.window import Window
+        headless.run_frame(1 / self.fps, self.fb)
+        for func in self.frame_funcs:
+            self.timer.time("scenario", func, index)
+        self.timer.time("scale", pygame.transform.scale, self.fb, (Window.WIDTH, Window.HEIGHT))
+
+    def run(self, frames: int, warmup: int = 0):
+        """Run warmup + measured frames, return the frame + stage stats"""
+        from engine.misc import clock
+        from engine.graphics import animation
+        # nothing lazily loaded inside the measured frames
+        animation.AnimationManifest.preload()
+        clock.start(0)
+        self.instrument()
+        for i in range(warmup):
+            self.frame(i)
+            self.timer.end_frame()
+        self.timer.clear()
+        totals = []
+        for i in range(warmup, warmup + frames):
+            start = time.perf_counter()
+            self.frame(i)
+            totals.append(time.perf_counter() - start)
+            self.timer.end_frame()
+        # whatever is not covered by a stage (layer bookkeeping, clock, scene switching)
+        covered = [sum(f) for f in zip(*self.timer.frames.values())] if self.timer.frames else [0.0] * frames
+        self.timer.frames["other"] = [max(t - c, 0.0) for t, c in zip(totals, covered)]
+        return {"frame": summarize(totals),
+                "subsystems": {name: summarize(values) for name, values in sorted(self.timer.frames.items())},
+                "entities": len(self.handler.entities), "chunks": len(self.world.chunks)}
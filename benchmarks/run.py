@@ -0,0 +1,92 @@
+import sys
+import json
+import argparse
+import subprocess
+
+"""
+Run the benchmark suite
+
+    python -m benchmarks.run                          # every scenario, results on stdout
+    python -m benchmarks.run grass-400 crowd-large    # selected scenarios
+    python -m benchmarks.run --out before.json        # save for benchmarks.compare
+
+- every scenario runs in its own process so class level caches + registries never leak between them
+- frame times are in milliseconds
+"""
+
+RESULT_PREFIX = "BENCHMARK-RESULT "
+
+
+def run_scenario(name: str, frames: int, warmup: int, seed: int):
+    """Run a single scenario inside this process"""
+    from benchmarks import harness
+    fb = harness.boot()
+    from benchmarks.scenarios import Scenario
+    scenario = Scenario.get_scenario(name)
+    harness.seed(seed)
+    bench = harness.Bench(fb)
+    scenario.build(bench, **scenario.params)
+    harness.seed(seed)
+    result = bench.run(frames, warmup)
+    result["params"] = scenario.params
+    return result
+
+
+def spawn_scenario(name: str, args):
+    """Run a single scenario in a child process"""
+    output = subprocess.run([sys.executable, "-m", "benchmarks.run", "--child", name, "--frames", str(args.frames),
+                             "--warmup", str(args.warmup), "--seed", str(args.seed)],
+                            cwd=harness_root(), capture_output=True, text=True)
+    for line in output.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    raise RuntimeError(f"scenario {name} failed:\n{output.stderr}")
+
+
+def harness_root():
+    from benchmarks import harness
+    return harness.ROOT
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the frame loop benchmarks headless")
+    parser.add_argument("scenarios", nargs="*", help="scenario names (default: all)")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write the json results to a file")
+    parser.add_argument("--list", action="store_true", help="list the scenarios")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = run_scenario(args.child, args.frames, args.warmup, args.seed)
+        print(RESULT_PREFIX + json.dumps(result))
+        return
+
+    from benchmarks import harness
+    from benchmarks.scenarios import Scenario
+    if args.list:
+        for name, scenario in Scenario.SCENARIOS.items():
+            print(f"{name:20} {scenario.params}")
+        return
+    names = args.scenarios or list(Scenario.SCENARIOS)
+    results = {"meta": harness.get_meta(), "frames": args.frames, "warmup": args.warmup, "seed": args.seed,
+               "scenarios": {}}
+    for name in names:
+        Scenario.get_scenario(name)
+        results["scenarios"][name] = spawn_scenario(name, args)
+        frame = results["scenarios"][name]["frame"]
+        print(f"{name:20} mean {frame['mean']:8.3f}ms  p95 {frame['p95']:8.3f}ms  p99 {frame['p99']:8.3f}ms",
+              file=sys.stderr)
+
+    data = json.dumps(results, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(data)
+    else:
+        print(data)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Benchmark scenarios
+- each scenario builds a world out of the real game objects inside a Bench
+- scripts are imported inside the builders -- the engine has to be booted headless first
+"""
+
+
+# -------------------------------------------------- #
+# scenario registry
+
+class Scenario:
+    """
+    Named + parametrized scenario builder
+    """
+    SCENARIOS = {}
+
+    @classmethod
+    def register(cls, name: str, build, **params):
+        """Register a scenario"""
+        cls.SCENARIOS[name] = Scenario(name, build, params)
+
+    @classmethod
+    def get_scenario(cls, name: str):
+        """Get a scenario"""
+        return cls.SCENARIOS[name]
+
+    def __init__(self, name: str, build, params: dict):
+        """
+        Constructor for Scenario
+        contains:
+        - name              = str
+        - build             = func(bench, **params)
+        - params            = dict
+        """
+        self.name = name
+        self.build = build
+        self.params = params
+
+
+# -------------------------------------------------- #
+# helpers
+
+def spawn_player(bench, x: float = 0, y: float = 0):
+    """Every ai in the game targets the player"""
+    from scripts import singleton
+    from scripts.entities import player
+    singleton.PLAYER = player.Player()
+    singleton.PLAYER.position.xy = (x, y)
+    singleton.PLAYER.move_to_position()
+    bench.handler.add_entity(singleton.PLAYER)
+    return singleton.PLAYER
+
+
+def scatter(radius: float):
+    """Seeded position around the origin"""
+    from engine.misc import maths
+    return maths.normalized_random() * radius, maths.normalized_random() * radius
+
+
+# -------------------------------------------------- #
+# builders
+
+def build_crowd(bench, peasants: int, mages: int, radius: float):
+    """Peasants + mages chasing the player"""
+    from scripts.entities import mage, peasant
+    spawn_player(bench)
+    for i in range(peasants):
+        p = peasant.Peasant()
+        p.position.xy = scatter(radius)
+        bench.handler.add_entity(p)
+    for i in range(mages):
+        m = mage.Mage()
+        m.position.xy = scatter(radius)
+        bench.handler.add_entity(m)
+
+
+def build_grass(bench, grass_count: int, left: int = -2, right: int = 3):
+    """The main.py grass field"""
+    import random
+    from engine import singleton as EGLOB
+    from scripts.environment import grass
+    spawn_player(bench)
+    for x in range(left, right):
+        for y in range(left, right):
+            GG = grass.GrassHandler("assets/sprites/grass.json")
+            GG.position.xy = (x * EGLOB.CHUNK_PIX_WIDTH, y * EGLOB.CHUNK_PIX_HEIGHT)
+            GG.move_to_position()
+            GG.calculate_rel_hitbox()
+            w, h = GG.assets.get_dimensions(0)
+            # same random calls as adding blades one by one -- x, y, variation
+            blades = [(random.randint(0, EGLOB.CHUNK_PIX_WIDTH - w//3), random.randint(0, EGLOB.CHUNK_PIX_HEIGHT - h//3),
+                       random.randint(0, GG.assets.variations - 1)) for i in range(grass_count)]
+            GG.add_blades(*zip(*blades))
+            bench.world.add_env_obj(GG)
+
+
+def build_magic_particles(bench, mages: int, burst: int, every: int):
+    """Mages spawning <burst> MagicParticleHandler particles every <every> frames"""
+    from scripts.entities import mage
+    spawn_player(bench)
+    casters = []
+    for i in range(mages):
+        m = mage.Mage()
+        m.position.xy = scatter(100)
+        bench.handler.add_entity(m)
+        casters.append(m)
+
+    def emit(frame):
+        if frame % every:
+            return
+        for m in casters:
+            for i in range(burst):
+                m.phandler.create_particle()
+
+    bench.on_frame(emit)
+
+
+def build_smoke_particles(bench, mages: int, burst: int, every: int):
+    """Fireball smoke trails - <burst> SmokeParticleHandler particles every <every> frames"""
+    from scripts.attacks import fireball
+    from scripts.entities import mage
+    spawn_player(bench)
+    casters = []
+    for i in range(mages):
+        m = mage.Mage()
+        m.position.xy = scatter(100)
+        bench.handler.add_entity(m)
+        casters.append(m)
+
+    def emit(frame):
+        if frame % every:
+            return
+        for m in casters:
+            ph = m.atk_phandler
+            for i in range(burst):
+                ph.p_count += 1
+                ph.particles[ph.p_count] = fireball.create_smoke_particle(ph.p_count, m.rel_hitbox.centerx,
+                                                                          m.rel_hitbox.centery)
+                ph.ap_count += 1
+
+    bench.on_frame(emit)
+
+
+def build_text(bench, words: int, sections: int, typewriter: bool):
+    """Long TextManager paragraphs drawn over the scene"""
+    import random
+    from engine.graphics import text
+    from engine.graphics.teffects import TypeWriter
+    from engine.handler.filehandler import Filehandler
+    vocab = ["hello", "world", "the", "mage", "casts", "a", "fireball", "peasant", "grass", "sways", "in", "wind"]
+    paragraphs = [" ".join(random.choice(vocab) for i in range(words // sections)) for s in range(sections)]
+    TM = text.TextManager(Filehandler.load_font("assets/font.ttf", 30), "\\p".join(paragraphs),
+                          text.TextManager.ALIGN_LEFT, buffer_is_text=not typewriter)
+    if typewriter:
+        TM.add_effect(TypeWriter.TypeWriter(TM, 1/120))
+
+    bench.on_frame(lambda frame: TM.render_text(bench.fb, (0, 0), True))
+
+
+# -------------------------------------------------- #
+# suite
+
+Scenario.register("crowd-small", build_crowd, peasants=20, mages=5, radius=200)
+Scenario.register("crowd-large", build_crowd, peasants=150, mages=30, radius=600)
+Scenario.register("grass-100", build_grass, grass_count=100)
+Scenario.register("grass-400", build_grass, grass_count=400)
+Scenario.register("grass-1000", build_grass, grass_count=1000)
+Scenario.register("particles-magic", build_magic_particles, mages=5, burst=40, every=5)
+Scenario.register("particles-smoke", build_smoke_particles, mages=5, burst=40, every=5)
+Scenario.register("text-static", build_text, words=600, sections=6, typewriter=False)
+Scenario.register("text-typewriter", build_text, words=600, sections=6, typewriter=True)
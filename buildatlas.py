@@ -0,0 +1,24 @@
+import os
+os.environ["ENGINE_HEADLESS"] = "1"
+
+import engine
+from engine import singleton
+from engine.window import Window
+
+"""
+Packs every animation category in the asset manifest into the sprite atlas
+- run again after changing sprites, outdated categories fall back to their own sheets until then
+"""
+
+Window.create_window("Atlas", 1, 1, 0, 32)
+# pack the sheets themselves, not an older atlas
+singleton.ATLAS = False
+
+from scripts import assets
+from engine.graphics import animation, atlas
+
+animation.AnimationManifest.preload()
+categories = [animation.Category.get_category(name) for name in animation.AnimationManifest.ENTRIES]
+pages = atlas.Atlas.build(categories)
+frames = sum(len(anim.frames) for c in categories for anim in c.anims.values())
+print(f"Packed {frames} frames of {len(categories)} categories into {pages} page(s) in {singleton.ATLAS_DIR}")
@@ -20,6 +20,11 @@ def clearcache(toclear, filepath):
 
 clearcache("__pycache__", os.getcwd())
 
+# compiled animations
+if os.path.isdir(".cache"):
+    shutil.rmtree(".cache")
+    CLEARED.append(os.path.join(os.getcwd(), ".cache"))
+
 for file in CLEARED:
     print(f"Cleared from: {file}")
 
@@ -0,0 +1,27 @@
+import os
+os.environ["ENGINE_HEADLESS"] = "1"
+
+import engine
+from engine import singleton
+from engine.window import Window
+
+"""
+Compiles every asset ahead of time
+- images -> raw containers the game memory maps (singleton.RAW_IMAGE_DIR)
+- animations -> compiled animations (singleton.ANIMATION_CACHE_DIR)
+- the game compiles whatever is missing on first load, this just moves the cost out of the first run
+"""
+
+Window.create_window("Assets", 1, 1, 0, 32)
+
+from scripts import assets
+from engine.graphics import animation, rawimage
+
+images = [os.path.join(root, name) for root, dirs, files in os.walk("assets") for name in files
+          if name.lower().endswith(".png")]
+for path in images:
+    rawimage.load_image(path)
+animation.AnimationManifest.preload()
+print(f"Compiled {len(images)} images into {singleton.RAW_IMAGE_DIR} + "
+      f"the aseprite animations of {len(animation.AnimationManifest.ENTRIES)} categories into "
+      f"{singleton.ANIMATION_CACHE_DIR}")
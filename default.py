@@ -5,7 +5,7 @@ import engine
 
 from engine.handler import scenehandler
 from engine.handler.eventhandler import Eventhandler
-from engine.misc import clock, user_input, maths
+from engine.misc import clock, user_input, maths, profiler
 from engine.handler.filehandler import *
 
 from engine.gamesystem import particle
@@ -23,10 +23,12 @@ WW = 1280//3
 FB_SIZE = [WW, int(WW/16*9)]
 
 FPS = 60
+# simulation ticks per second - 0 runs one tick per rendered frame
+TICK_RATE = 0
 
 Window.create_window(WINDOW_CAPTION, WINDOW_SIZE[0], WINDOW_SIZE[1], pygame.RESIZABLE | pygame.DOUBLEBUF , 16)
 # window.set_icon()
-fb = Window.create_framebuffer(FB_SIZE[0], FB_SIZE[1], flags=0, bits=32).convert_alpha()
+fb = Window.create_framebuffer(FB_SIZE[0], FB_SIZE[1], flags=0, bits=32)
 
 # -------------------------------------------------- #
 # ! CHANGE THESE IF YOU WANT !
@@ -55,8 +57,11 @@ _WORLD = __layer.world
 # -------------------------------------------------- #
 
 _HANDLER.handle_changes()
-clock.start()
+clock.start(tick_rate=TICK_RATE)
 while Window.running:
+    profiler.begin_frame()
+    if user_input.is_key_pressed(pygame.K_LSHIFT) and user_input.is_key_clicked(pygame.K_p):
+        profiler.toggle()
     # -------------------------------------------------- #
     # update current scene
     if scenehandler.SceneHandler.CURRENT:
@@ -65,10 +70,13 @@ while Window.running:
         scenehandler.SceneHandler.CURRENT.update(fb)
 
     # eventhandler updates
-    Eventhandler.update()
+    with profiler.scope("events"):
+        Eventhandler.update()
+    profiler.render_overlay(fb)
 
     # rescale framebuffer to window
-    Window.instance.blit(pygame.transform.scale(fb, (Window.WIDTH, Window.HEIGHT)), (0,0))
+    with profiler.scope("scale"):
+        Window.instance.blit(pygame.transform.scale(fb, (Window.WIDTH, Window.HEIGHT)), (0,0))
 
     user_input.update()
     for e in pygame.event.get():
@@ -95,7 +103,9 @@ while Window.running:
             fbsize = fb.get_size()
             user_input.update_ratio(Window.WIDTH, Window.HEIGHT, fbsize[0], fbsize[1])
 
-    pygame.display.update()
+    with profiler.scope("display"):
+        Window.update()
+    profiler.end_frame()
     clock.update()
 
 # -------------------------------------------------- #
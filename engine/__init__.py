@@ -1,4 +1,11 @@
+import os
 import pygame
+
+from . import singleton
+
+if singleton.HEADLESS:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
 pygame.init()
 
 from .handler import *
@@ -2,15 +2,53 @@ import pygame
 
 from .. import singleton
 from ..handler import scenehandler
+from ..misc import clock
 
 E_COUNT = 0
 
 # -------------------------------------------------- #
 
 
+# activity tiers
+class ActivityTier:
+    """
+    Decides how often an entity is updated based off its chunk distance from the camera
+    - full rate         = every tick
+    - reduced rate      = every <reduced_rate> ticks with the skipped delta time added
+    - dormant           = not updated until it comes back into range
+    """
+    FULL = 0
+    REDUCED = 1
+    DORMANT = 2
+
+    def __init__(self, full_dis: int = None, reduced_dis: int = None, reduced_rate: int = None):
+        """
+        Constructor for ActivityTier
+        contains:
+        - full_dis          = int (chunks)
+        - reduced_dis       = int (chunks)
+        - reduced_rate      = int (ticks)
+        """
+        self.full_dis = singleton.ACTIVITY_FULL_DIS if full_dis is None else full_dis
+        self.reduced_dis = singleton.ACTIVITY_REDUCED_DIS if reduced_dis is None else reduced_dis
+        self.reduced_rate = singleton.ACTIVITY_REDUCED_RATE if reduced_rate is None else reduced_rate
+
+    def get_tier(self, dis: int):
+        """Get the tier for a chunk distance"""
+        if dis <= self.full_dis:
+            return ActivityTier.FULL
+        if dis <= self.reduced_dis:
+            return ActivityTier.REDUCED
+        return ActivityTier.DORMANT
+
+
 # entity types
 class EntityTypes:
     TYPES = {}
+    # type class : name
+    NAMES = {}
+    # name : ActivityTier
+    ACTIVITY = {}
 
     @classmethod
     def get_entity_type(cls, name):
@@ -18,9 +56,25 @@ class EntityTypes:
         return cls.TYPES[name] if name in cls.TYPES else None
 
     @classmethod
-    def register_entity_type(cls, name, etype):
-        """Register the entity type"""
+    def register_entity_type(cls, name, etype, activity=None):
+        """Register the entity type - activity = ActivityTier (None = always updated)"""
         cls.TYPES[name] = etype
+        cls.NAMES[etype] = name
+        if activity:
+            cls.ACTIVITY[name] = activity
+
+    @classmethod
+    def set_activity(cls, name, activity):
+        """Set the ActivityTier for an entity type"""
+        if activity:
+            cls.ACTIVITY[name] = activity
+        else:
+            cls.ACTIVITY.pop(name, None)
+
+    @classmethod
+    def get_activity(cls, entity):
+        """Get the ActivityTier of an entity given its type"""
+        return cls.ACTIVITY.get(cls.NAMES.get(type(entity)))
 
 
 # entities
@@ -40,6 +94,7 @@ class Entity:
         - motion            = [float, float]
         - dead              = bool
         - visible           = bool
+        - cullable          = bool (skip rendering when outside the camera viewport)
         - rect              = pygame.Rect
         - hitbox            = pygame.Rect
         - rel_hitbox        = pygame.Rect
@@ -47,6 +102,13 @@ class Entity:
         - chunk             = (int, int)
         - p_chunk           = (int, int)
         - tiles_area        = (int, int)
+        - transform         = TransformRow (set when the handler owns a TransformStore)
+        - prev_pos          = [int, int] (rect position before the last simulation tick)
+        - activity          = ActivityTier (set by the handler from EntityTypes)
+        - tier              = int (ActivityTier.FULL/REDUCED/DORMANT)
+        - skipped_time      = float (delta time skipped at reduced rate)
+        - skipped_ticks     = int (ticks skipped since the last update)
+        - tick_span         = int (ticks the last update covered, rendering blends over all of them)
         
         # for encoding / serializing
         - data [dict]
@@ -64,6 +126,7 @@ class Entity:
             self.name = str(self.id)
         self.dead = False
         self.visible = True
+        self.cullable = True
         self.priority = False
 
         self.sprite = None
@@ -80,6 +143,13 @@ class Entity:
         self.rel_hitbox = pygame.Rect(0, 0, 0, 0)
         self.motion = pygame.math.Vector2(0, 0)
         self.velocity = self.motion
+        self.transform = None
+        self.prev_pos = [0, 0]
+        self.activity = None
+        self.tier = ActivityTier.FULL
+        self.skipped_time = 0.0
+        self.skipped_ticks = 0
+        self.tick_span = 1
 
         # parents
         self.layer = None
@@ -87,13 +157,21 @@ class Entity:
     def start(self):
         pass
 
+    def save_state(self):
+        """Save the state that rendering interpolates from"""
+        self.prev_pos[0] = self.rect.x
+        self.prev_pos[1] = self.rect.y
+
     def update(self):
         pass
 
     def render(self, surface):
-        """Default render"""
+        """Default render - queued on the layer render queue"""
         if self.visible and self.sprite:
-            surface.blit(self.sprite, self.get_glob_pos())
+            if self.layer:
+                self.layer.render_queue.submit(self.sprite, self.get_glob_pos())
+            else:
+                surface.blit(self.sprite, self.get_glob_pos())
     
     def debug(self, surface):
         """Debug render"""
@@ -116,13 +194,26 @@ class Entity:
         if self.layer:
             self.layer.handler.remove_entity(self.id)
     
+    def get_interp_offset(self):
+        """Get the offset from the current state to the interpolated render state"""
+        # reduced rate entities blend from prev_pos over every tick their last update covered
+        a = min((self.skipped_ticks + clock.alpha) / self.tick_span, 1.0) - 1
+        return (self.rect.x - self.prev_pos[0]) * a, (self.rect.y - self.prev_pos[1]) * a
+
     def get_glob_pos(self):
         """Gets the position with global translation applied"""
-        return self.rect.x + singleton.WORLD_OFFSET_X, self.rect.y + singleton.WORLD_OFFSET_Y
+        if clock.alpha == 1 and self.tick_span == 1:
+            return self.rect.x + singleton.WORLD_OFFSET_X, self.rect.y + singleton.WORLD_OFFSET_Y
+        ox, oy = self.get_interp_offset()
+        return self.rect.x + ox + singleton.WORLD_OFFSET_X, self.rect.y + oy + singleton.WORLD_OFFSET_Y
 
     def get_glob_cpos(self):
         """Get the global center position"""
-        return self.rel_hitbox.centerx + singleton.WORLD_OFFSET_X, self.rel_hitbox.centery + singleton.WORLD_OFFSET_Y
+        if clock.alpha == 1 and self.tick_span == 1:
+            return self.rel_hitbox.centerx + singleton.WORLD_OFFSET_X, self.rel_hitbox.centery + singleton.WORLD_OFFSET_Y
+        ox, oy = self.get_interp_offset()
+        return (self.rel_hitbox.centerx + ox + singleton.WORLD_OFFSET_X,
+                self.rel_hitbox.centery + oy + singleton.WORLD_OFFSET_Y)
 
     def distance_to_other(self, other):
         """Get the distance to another entity"""
@@ -4,7 +4,8 @@ Layer system -- handles events according to layer
 
 from ..handler import handler, eventhandler
 from ..world import world
-from ..graphics import camera
+from ..graphics import camera, renderqueue
+from ..misc import clock, profiler
 from .. import singleton
 
 
@@ -15,14 +16,39 @@ class Layer:
         self.handler = handler.Handler(self)
         self.world = world.World(self)
         self.camera = camera.Camera()
+        self.render_queue = renderqueue.RenderQueue()
 
     def handle(self, surface):
+        """Tick + render the layer"""
+        self.tick()
+        self.render(surface)
+
+    def tick(self):
+        """Run one simulation tick"""
+        self.camera.save_state()
+        with profiler.scope("world.tick"):
+            self.world.tick_chunks(singleton.RENDER_DIS)
+        with profiler.scope("entities.tick"):
+            self.handler.tick_entities()
+
+    def render(self, surface):
+        """Render the layer - interpolated between the last two ticks"""
         # print(self.camera.chunkpos)
+        if clock.TICK_RATE:
+            self.camera.interpolate(clock.alpha)
         if singleton.DEBUG:
-            self.world.debug_handle_chunks(surface, singleton.RENDER_DIS)
-            self.handler.debug_handle_entities(surface)
+            with profiler.scope("world.render"):
+                self.world.debug_render_chunks(surface, singleton.RENDER_DIS)
+                self.render_queue.flush(surface)
+            with profiler.scope("entities.render"):
+                self.handler.debug_render_entities(surface)
+                self.render_queue.flush(surface)
         else:
-            self.world.handle_chunks(surface, singleton.RENDER_DIS)
-            self.handler.handle_entities(surface)
+            with profiler.scope("world.render"):
+                self.world.render_chunks(surface, singleton.RENDER_DIS)
+                self.render_queue.flush(surface)
+            with profiler.scope("entities.render"):
+                self.handler.render_entities(surface)
+                self.render_queue.flush(surface)
 
 
@@ -1,5 +1,6 @@
 import pygame
 import json
+import numpy as np
 
 from engine.singleton import *
 
@@ -32,6 +33,7 @@ class ParticleHandler(entity.Entity):
         - ap_count              = int (active particles count)
         - create_func           = void func(self)
         - update_func           = void func(self, particle, surface)
+        - force_func            = (fx, fy) func(xs, ys) or None (pixels / second pushing every particle)
         """
         super().__init__()
         self.parent = parent
@@ -42,6 +44,7 @@ class ParticleHandler(entity.Entity):
 
         self.create_func = self._create
         self.update_func = self._update
+        self.force_func = None
 
         self.color = (255, 255, 255)
         self.decay = 0.1
@@ -97,8 +100,29 @@ class ParticleHandler(entity.Entity):
             self.timer.changed = False
             self.create_particle()
 
+    def apply_force(self):
+        """Push every particle by force_func - one call for all of them"""
+        particles = list(self.particles.values())
+        count = len(particles)
+        force = self.force_func(np.fromiter((p[PARTICLE_X] for p in particles), np.float64, count),
+                                np.fromiter((p[PARTICLE_Y] for p in particles), np.float64, count))
+        if force is None:
+            return
+        for p, x, y in zip(particles, (force[0] * clock.delta_time).tolist(), (force[1] * clock.delta_time).tolist()):
+            p[PARTICLE_X] += x
+            p[PARTICLE_Y] += y
+
     def render(self, surface):
-        """Update particles"""
+        """Update particles - drawn in order with the layer render queue"""
+        if self.layer:
+            self.layer.render_queue.submit_draw(self.render_particles)
+        else:
+            self.render_particles(surface)
+
+    def render_particles(self, surface):
+        """Update + draw particles onto surface"""
+        if self.force_func and self.particles:
+            self.apply_force()
         for particle in self.particles.values():
             self.update_func(particle, surface)
         self.ap_count -= len(self.rq)
@@ -123,6 +147,10 @@ class ParticleHandler(entity.Entity):
         """Set the particle update function"""
         self.update_func = func
     
+    def set_force_func(self, func):
+        """Set the function pushing particles - (fx, fy) func(xs, ys), may return None for no force"""
+        self.force_func = func
+
     def set_color(self, color):
         """Set the particle color"""
         self.color = color
\ No newline at end of file
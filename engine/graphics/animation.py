@@ -1,11 +1,134 @@
-import json
 import os
+import weakref
 import pygame
+import numpy as np
 
 from ..singleton import *
-from ..handler.filehandler import Filehandler
+from ..handler.filehandler import Filehandler, AssetHandle, AssetRefs, decode_image
 from ..handler.eventhandler import Eventhandler
 from ..misc import clock
+from . import animcache, atlas, surfcache
+
+
+# -------------------------------------------------- #
+# animation clock
+
+class AnimationClock:
+    """
+    Frame index, elapsed time + loop count of every Registry, stored in arrays
+    - Registry.update() only queues its slot + the delta time
+    - step() advances every queued slot at once, run at the start of every scene tick
+      -> a frame change shows one tick after the update() that caused it
+      -> a slot advances as many frames as its queued time covers, the leftover carries over
+    - frame durations of every data set are kept in one table, slots point at their data set with an offset
+      -> the range of a removed data set is reused by the next one that fits
+    """
+    SIZE = 64
+    count = 0
+    free = []
+    # slots of deleted registries -- reused after the next step, queued updates may still point at them
+    released = []
+    # Registry.update() calls since the last step
+    queued = []
+    queued_dt = []
+    fnum = np.zeros(SIZE, dtype=np.int32)
+    tpass = np.zeros(SIZE, dtype=np.float64)
+    fini = np.zeros(SIZE, dtype=np.int32)
+    pending = np.zeros(SIZE, dtype=np.float64)
+    # data set of every slot
+    offset = np.zeros(SIZE, dtype=np.int32)
+    length = np.ones(SIZE, dtype=np.int32)
+    # every data set's frame durations back to back
+    durations = np.zeros(0, dtype=np.float64)
+    # (offset, length) ranges of removed data sets
+    spare = []
+
+    @classmethod
+    def add_slot(cls, dataset) -> int:
+        """Get a slot for a registry of the data set"""
+        if cls.free:
+            slot = cls.free.pop()
+        else:
+            if cls.count == len(cls.fnum):
+                cls.grow()
+            slot = cls.count
+            cls.count += 1
+        cls.fnum[slot] = 0
+        cls.tpass[slot] = 0.0
+        cls.fini[slot] = 0
+        cls.pending[slot] = 0.0
+        cls.set_dataset(slot, dataset)
+        return slot
+
+    @classmethod
+    def remove_slot(cls, slot: int):
+        """Free the slot of a deleted registry"""
+        cls.released.append(slot)
+
+    @classmethod
+    def grow(cls):
+        """Double the slot arrays"""
+        for name in ("fnum", "tpass", "fini", "pending", "offset", "length"):
+            old = getattr(cls, name)
+            new = np.ones(len(old) * 2, dtype=old.dtype) if name == "length" else np.zeros(len(old) * 2, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(cls, name, new)
+
+    @classmethod
+    def set_dataset(cls, slot: int, dataset):
+        """Point a slot at the duration table of a data set"""
+        if dataset.clock_offset is None:
+            dataset.clock_offset = cls.claim(dataset.durations)
+        cls.offset[slot] = dataset.clock_offset
+        cls.length[slot] = dataset.length
+
+    @classmethod
+    def claim(cls, durations) -> int:
+        """Put frame durations in the table - in a spare range when one fits - returns the offset"""
+        size = len(durations)
+        for i, (offset, length) in enumerate(cls.spare):
+            if length >= size:
+                if length == size:
+                    del cls.spare[i]
+                else:
+                    cls.spare[i] = (offset + size, length - size)
+                cls.durations[offset:offset + size] = durations
+                return offset
+        offset = len(cls.durations)
+        cls.durations = np.concatenate((cls.durations, durations))
+        return offset
+
+    @classmethod
+    def release_dataset(cls, dataset):
+        """Give the durations of a removed data set back to the table"""
+        if dataset.clock_offset is not None:
+            cls.spare.append((dataset.clock_offset, len(dataset.durations)))
+            dataset.clock_offset = None
+
+    @classmethod
+    def step(cls):
+        """Advance every registry that was updated since the last step"""
+        if cls.queued:
+            cls.pending[:cls.count] += np.bincount(cls.queued, cls.queued_dt, cls.count)
+            cls.queued.clear()
+            cls.queued_dt.clear()
+        cls.free += cls.released
+        cls.released.clear()
+        active = np.flatnonzero(cls.pending[:cls.count])
+        if not len(active):
+            return
+        cls.tpass[active] += cls.pending[active]
+        cls.pending[active] = 0.0
+        # one frame per pass until the queued time is used up -- usually a single pass
+        while len(active):
+            duration = cls.durations[cls.offset[active] + cls.fnum[active]]
+            due = cls.tpass[active] >= duration
+            active, duration = active[due], duration[due]
+            cls.tpass[active] -= duration
+            cls.fnum[active] += 1
+            looped = active[cls.fnum[active] >= cls.length[active]]
+            cls.fnum[looped] = 0
+            cls.fini[looped] += 1
 
 
 # -------------------------------------------------- #
@@ -15,29 +138,59 @@ class Registry:
     """
     Registry allos different objects to access animation frames
     - maintains the fps of an animation
+    - a view of a slot in the AnimationClock -- frames change when the clock steps
     """
 
     def __init__(self, parent):
         """
         Constructor for Registry
         - parent                = AnimationDataSet
+        - slot                  = int (AnimationClock slot)
         - fnum                  = int
         - tpass                 = float
         - fini                  = int (# times it loops)
         """
-        self.parent = parent
-        self.fnum = 0
-        self.tpass = 0.0
-        self.fini = 0
+        self._parent = parent
+        self.slot = AnimationClock.add_slot(parent)
+        weakref.finalize(self, AnimationClock.remove_slot, self.slot)
+
+    @property
+    def parent(self):
+        return self._parent
+
+    @parent.setter
+    def parent(self, parent):
+        self._parent = parent
+        AnimationClock.set_dataset(self.slot, parent)
+
+    @property
+    def fnum(self):
+        return AnimationClock.fnum.item(self.slot)
+
+    @fnum.setter
+    def fnum(self, value: int):
+        AnimationClock.fnum[self.slot] = value
+
+    @property
+    def tpass(self):
+        return AnimationClock.tpass.item(self.slot)
+
+    @tpass.setter
+    def tpass(self, value: float):
+        AnimationClock.tpass[self.slot] = value
+
+    @property
+    def fini(self):
+        return AnimationClock.fini.item(self.slot)
+
+    @fini.setter
+    def fini(self, value: int):
+        AnimationClock.fini[self.slot] = value
 
     def update(self):
-        self.tpass += clock.delta_time
-        if self.tpass >= self.parent.frames[self.fnum].duration:
-            self.tpass = 0.0
-            self.fnum += 1
-            if self.fnum >= self.parent.length:
-                self.fnum = 0
-                self.fini += 1
+        """Queue this frame's time - applied by the next AnimationClock.step(), at the start of the next tick"""
+        AnimationClock.queued.append(self.slot)
+        AnimationClock.queued_dt.append(clock.delta_time)
 
     def has_finished(self):
         if self.fini:
@@ -45,9 +198,13 @@ class Registry:
             return True
         return False
 
-    def get_frame(self):
-        """Get the frame"""
-        return self.parent.frames[self.fnum].frame
+    def get_frame(self, flip: bool = False):
+        """Get the frame - flip = the horizontally mirrored frame"""
+        return self.parent.frames[self.fnum].get_frame(flip)
+
+    def get_atlas_frame(self):
+        """Get (surface, area) of the frame for blit / blits - an atlas page + rect when packed"""
+        return self.parent.frames[self.fnum].get_atlas_frame()
 
     def get_frame_data(self):
         """Get the frame data"""
@@ -61,9 +218,9 @@ class Registry:
             self.tpass = 0.0
             self.changed = True
 
-    def get_hitbox(self):
-        """Get hitbox at a certain frame"""
-        return self.parent.frames[self.fnum].hitbox
+    def get_hitbox(self, flip: bool = False):
+        """Get hitbox at a certain frame - flip = hitbox of the mirrored frame"""
+        return self.parent.frames[self.fnum].get_hitbox(flip)
 
 
 # -------------------------------------------------- #
@@ -90,6 +247,13 @@ class FrameData:
         Loaded after creation
         - origin frame image        = pygame.Surface
         - the frame image           = pygame.Surface
+        - atlas                     = pygame.Surface (atlas page holding the frame, None if not packed)
+        - area                      = pygame.Rect (area of the frame on the atlas page)
+
+        Mirrored variants (built when first asked for)
+        - flipped                   = pygame.Surface
+        - fhitbox                   = pygame.Rect
+        - fpoints                   = dict {str: (int, int)}
         """
         self.parent = None
         self.frame_number = 0
@@ -103,20 +267,45 @@ class FrameData:
         # get the frame
         self.oframe = None
         self.frame = None
+        self.atlas = None
+        self.area = None
         self.ohitbox = pygame.Rect(0, 0, s_size['w'], s_size['h'])
         self.hitbox = pygame.Rect(0, 0, s_size['w'], s_size['h'])
         self.scale = 1
+        self.flipped = None
+        self.fhitbox = None
+        self.fpoints = {}
 
     def get_sprite(self):
         """After loading data + parsing aseprite | call this to get the image"""
         self.oframe = self.parent.sprite.subsurface(self.sprite_source_location)
         self.frame = self.oframe
+        self.flipped = None
+
+    def set_atlas(self, page, area):
+        """Use an atlas page area as the frame image"""
+        scaled = self.frame is not self.oframe
+        self.atlas = page
+        self.area = area
+        self.oframe = page.subsurface(area)
+        if scaled:
+            self.rescale_sprite(self.scale)
+        else:
+            self.frame = self.oframe
+            self.flipped = None
+
+    def get_atlas_frame(self):
+        """Get (surface, area) - the atlas page + area when packed and unscaled, else (frame, None)"""
+        if self.atlas and self.frame is self.oframe:
+            return self.atlas, self.area
+        return self.frame, None
 
     def rescale_sprite(self, scale):
         """Resize a sprite based off scale"""
         self.scale = scale
         self.frame = pygame.transform.scale(self.oframe, (
             int(self.oframe.get_size()[0] * scale), int(self.oframe.get_size()[1] * scale)))
+        self.flipped = None
         self.update_hitbox()
 
     def set_hitbox(self, new):
@@ -134,10 +323,33 @@ class FrameData:
         self.hitbox.y = int(ts * newsize[1] * self.scale)
         self.hitbox.w = int((rs - ls) * newsize[0] * self.scale)
         self.hitbox.h = int((bs - ts) * newsize[1] * self.scale)
-
-    def get_point(self, point: str):
-        """Get a point given the identifier"""
-        return self.points[point]
+        self.fhitbox = None
+
+    def get_frame(self, flip: bool = False):
+        """Get the frame image - flip = horizontally mirrored copy, made once + kept"""
+        if not flip:
+            return self.frame
+        if not self.flipped:
+            self.flipped = pygame.transform.flip(self.frame, True, False)
+        return self.flipped
+
+    def get_hitbox(self, flip: bool = False):
+        """Get the hitbox - flip = hitbox of the mirrored frame"""
+        if not flip:
+            return self.hitbox
+        if not self.fhitbox:
+            self.fhitbox = self.hitbox.copy()
+            self.fhitbox.x = self.frame.get_width() - self.hitbox.right
+        return self.fhitbox
+
+    def get_point(self, point: str, flip: bool = False):
+        """Get a point given the identifier - flip = point on the mirrored (unscaled) frame"""
+        if not flip:
+            return self.points[point]
+        if point not in self.fpoints:
+            x, y = self.points[point]
+            self.fpoints[point] = (self.oframe.get_width() - 1 - x, y)
+        return self.fpoints[point]
 
     def __str__(self):
         return f"{self.frame_number}-{self.source_size}"
@@ -165,6 +377,9 @@ class AnimationDataSet:
         self.frames = frames
         self.length = len(frames)
         self.parent = parent
+        # frame durations for the AnimationClock + where they are in its table
+        self.durations = np.array([f.duration for f in frames], dtype=np.float64)
+        self.clock_offset = None
         for f in self.frames:
             f.parent = self
             f.get_sprite()
@@ -173,11 +388,24 @@ class AnimationDataSet:
         """Get a registry to access frames"""
         return Registry(self)
 
-    def hitbox_analysis(self):
-        """Perform hitbox analysis"""
-        # print(self.name)
+    def hitbox_analysis(self, markers=None):
+        """Perform hitbox analysis - markers = SheetMarkers shared by every animation on the sheet"""
+        scan = markers or SheetMarkers(self.sprite)
         for f in self.frames:
-            f.set_hitbox(find_and_remove_image_hitbox(f.frame))
+            f.set_hitbox(scan.find_hitbox(f.sprite_source_location))
+        if not markers:
+            scan.clear()
+
+    def point_analysis(self, colors: dict, markers=None):
+        """Find + remove the named marker points {name: color} of every frame"""
+        scan = markers or SheetMarkers(self.sprite)
+        for f in self.frames[:self.length]:
+            f.points.update(scan.find_points(f.sprite_source_location, colors))
+        # frames created after loading (rotations) are not part of the sheet
+        for f in self.frames[self.length:]:
+            f.points.update(find_and_remove_image_points(f.oframe, colors))
+        if not markers:
+            scan.clear()
 
     def rescale_images(self, scale: float):
         """Resize all sprite images"""
@@ -211,13 +439,58 @@ class Category:
 
     @classmethod
     def get_category(cls, name):
+        """Get a category - loads it from the manifest if it has not been loaded yet"""
+        if name not in Category.CATEGORIES and name in AnimationManifest.ENTRIES:
+            return AnimationManifest.load(name)
+        if name in Category.CATEGORIES:
+            AssetRefs.use("category", name)
         return Category.CATEGORIES.get(name)
 
-    def __init__(self, name: str, related_animations: dict, raw_data: dict):
+    @classmethod
+    def add_category(cls, category, sheet: str = None):
+        """
+        Register a fully loaded category - frames are moved onto the sprite atlas if it holds them
+        - sheet = path of the image the frames were cut from, held by the category unless they are on the atlas
+        - returns True if the frames are on the atlas
+        """
+        packed = atlas.Atlas.attach(category)
+        if packed:
+            # nothing is cut from the sheet anymore
+            for anim in category.anims.values():
+                anim.sprite = None
+        elif sheet:
+            category.hold_image(sheet)
+        Category.CATEGORIES[category.name] = category
+        AssetRefs.use("category", category.name)
+        return packed
+
+    @classmethod
+    def remove_category(cls, name: str):
+        """Unload a category - it is loaded again from the manifest when used"""
+        category = Category.CATEGORIES.pop(name, None)
+        if not category:
+            return
+        for filepath in [f for f, c in Category.LOADED_JSONS.items() if c == name]:
+            del Category.LOADED_JSONS[filepath]
+        if name in AnimationManifest.HANDLES:
+            AnimationManifest.HANDLES[name].category = None
+        # rotations of the frames are useless now
+        frames = {f.get_frame(flip) for anim in category.anims.values() for f in anim.frames for flip in (0, 1)
+                  if flip == 0 or f.flipped}
+        surfcache.ROTATIONS.remove_matching(lambda key: key[0] in frames)
+        for handle in category.handles:
+            handle.release()
+        category.handles.clear()
+        for anim in category.anims.values():
+            AnimationClock.release_dataset(anim)
+
+    def __init__(self, name: str, related_animations: dict, raw_data: dict, key: str = None):
         """
         An animation category
         contains:
         - related_animations
+        - key (content hash of the source files)
+        - handles (images the frames are cut from)
 
         Groups related animations together
         - for example, a player may have run, idle, etc animations
@@ -226,6 +499,24 @@ class Category:
         self.name = name
         self.anims = related_animations
         self.raw_data = raw_data
+        self.key = key
+        self.handles = []
+
+    def hold_image(self, path: str):
+        """Keep an image loaded for as long as the category is"""
+        if all(h.key != path for h in self.handles):
+            self.handles.append(AssetHandle("image", path))
+
+    def get_memory_size(self):
+        """Bytes of the frames owned by the category - not counting the sheets, they are images"""
+        size = 0
+        for anim in self.anims.values():
+            for f in anim.frames:
+                if f.frame is not f.oframe:
+                    size += surfcache.get_surface_bytes(f.frame)
+                if f.flipped:
+                    size += surfcache.get_surface_bytes(f.flipped)
+        return size
 
     def get_animation(self, name):
         """Get an animation"""
@@ -245,26 +536,178 @@ class Category:
         for x in self.anims.values():
             x.apply_func_to_frames(_func)
 
+    def point_analysis(self, colors: dict):
+        """Find + remove the named marker points {name: color} of every animation - one scan per sheet"""
+        sheets = {}
+        for anim in self.anims.values():
+            # frames on the atlas come from an already cleaned page
+            if anim.sprite is None:
+                continue
+            if id(anim.sprite) not in sheets:
+                sheets[id(anim.sprite)] = SheetMarkers(anim.sprite)
+            anim.point_analysis(colors, sheets[id(anim.sprite)])
+        for markers in sheets.values():
+            markers.clear()
+
+
+AssetRefs.register_kind("category", Category.remove_category,
+                        lambda name: Category.CATEGORIES[name].get_memory_size(), lambda: Category.CATEGORIES.keys())
+
+
+# -------------------------------------------------- #
+# manifest
+
+class CategoryHandle:
+    """
+    Lazy reference to a Category
+    - resolves through the AnimationManifest on first use
+    - attribute access is forwarded to the category
+    """
+
+    def __init__(self, name: str):
+        """
+        Constructor for CategoryHandle
+        contains:
+        - name              = str
+        - category          = Category (None until loaded)
+        """
+        self.name = name
+        self.category = None
+
+    def get(self):
+        """Get the category - loads it if needed"""
+        if not self.category:
+            self.category = AnimationManifest.load(self.name)
+        else:
+            AssetRefs.use("category", self.name)
+        return self.category
+
+    def is_loaded(self):
+        """Check if the category is loaded"""
+        return self.name in Category.CATEGORIES
+
+    def __getattr__(self, attr):
+        return getattr(self.get(), attr)
+
+
+class AnimationManifest:
+    """
+    Declares which file every animation category comes from
+    - nothing is loaded until a category is used or preloaded
+    """
+    # category: (filepath, loader, kwargs)
+    ENTRIES = {}
+    HANDLES = {}
+
+    @classmethod
+    def register(cls, category: str, filepath: str, loader=None, **kwargs):
+        """Declare a category - loader(filepath, **kwargs) defaults to load_and_parse_aseprite_animation"""
+        cls.ENTRIES[category] = (filepath, loader or load_and_parse_aseprite_animation, kwargs)
+        return cls.get_handle(category)
+
+    @classmethod
+    def get_handle(cls, category: str):
+        """Get the lazy handle of a category"""
+        if category not in cls.HANDLES:
+            cls.HANDLES[category] = CategoryHandle(category)
+        return cls.HANDLES[category]
+
+    @classmethod
+    def load(cls, category: str):
+        """Load a category if it is not loaded yet"""
+        if category in Category.CATEGORIES:
+            AssetRefs.use("category", category)
+            return Category.CATEGORIES[category]
+        if category not in cls.ENTRIES:
+            raise KeyError(f"Animation category '{category}' is not in the manifest")
+        filepath, loader, kwargs = cls.ENTRIES[category]
+        loader(filepath, **kwargs)
+        if category not in Category.CATEGORIES:
+            raise KeyError(f"'{filepath}' does not contain the animation category '{category}'")
+        return Category.CATEGORIES[category]
+
+    @classmethod
+    def get_prepare_args(cls, category: str):
+        """Get the prepare_aseprite_animation arguments of a category - the worker half of loading it"""
+        filepath, loader, kwargs = cls.ENTRIES[category]
+        if loader is load_and_parse_aseprite_animation:
+            return filepath, kwargs.get("points"), True
+        # other loaders only get their sprite sheet decoded ahead of time
+        return filepath, None, False
+
+    @classmethod
+    def finish(cls, category: str, prepared):
+        """Main thread half of loading a category"""
+        if category in Category.CATEGORIES:
+            return Category.CATEGORIES[category]
+        filepath, loader, kwargs = cls.ENTRIES[category]
+        if loader is load_and_parse_aseprite_animation:
+            loader(filepath, prepared=prepared, **kwargs)
+        else:
+            source, compiled, image = prepared
+            if image:
+                Filehandler.add_decoded_image(source.image_path, image)
+        return cls.load(category)
+
+    @classmethod
+    def iter_preload(cls, categories=None):
+        """Load categories one by one - yields (loaded, total) so a loading screen can draw progress"""
+        categories = list(cls.ENTRIES) if categories is None else list(categories)
+        for i, category in enumerate(categories):
+            cls.load(category)
+            yield i + 1, len(categories)
+
+    @classmethod
+    def preload(cls, categories=None):
+        """Load categories right away (default: everything in the manifest)"""
+        for progress in cls.iter_preload(categories):
+            pass
+
 
 # -------------------------------------------------- #
 # functions
 
-def load_and_parse_aseprite_animation(filepath) -> dict:
-    """Loads and parses an asesprite animation"""
+def prepare_aseprite_animation(filepath, points: dict = None, compiled: bool = True):
+    """
+    Worker half of loading an aseprite animation - file reading, json parsing + image decoding
+    - returns (AnimationSource, compiled animation or None, decoded sheet or None)
+    - never touches the display, finish with load_and_parse_aseprite_animation(..., prepared=result)
+    """
+    source = animcache.AnimationSource(filepath, points)
+    compiled = animcache.read(source) if compiled else None
+    image = None if compiled else decode_image(source.image_path)
+    return source, compiled, image
+
+
+def load_and_parse_aseprite_animation(filepath, points: dict = None, prepared=None) -> dict:
+    """
+    Loads and parses an asesprite animation
+    - points = named marker colors {name: color} to find on every frame
+    - prepared = prepare_aseprite_animation result (background loading)
+    """
     # don't load things twice
     if filepath in Category.LOADED_JSONS:
-        return {"file": filepath, "cat": list(Category.get_category(filepath))}
-    # get data
-    with open(filepath, 'r') as file:
-        filedata = json.load(file)
-        file.close()
-    # loaded data - now parse data
-    metadata = filedata["meta"]
-    framedata = filedata["frames"]
-    # prase frame data
-    parsedframedata = parse_frame_data(framedata)
-    # create AnimationDataSet and Category Objects
-    load_categories(metadata, filepath, parsedframedata)
+        return {"file": filepath, "cat": [Category.LOADED_JSONS[filepath]]}
+    if prepared:
+        source, compiled, image = prepared
+        if image:
+            Filehandler.add_decoded_image(source.image_path, image)
+    else:
+        source, compiled = animcache.AnimationSource(filepath, points), None
+    cached = animcache.load(source, FrameData, compiled)
+    if cached:
+        # already parsed + analysed
+        metadata, parsedframedata, sheet = cached
+        load_categories(metadata, filepath, parsedframedata, sheet=Filehandler.convert(sheet), key=source.key)
+    else:
+        # loaded data - now parse data
+        metadata = source.data["meta"]
+        framedata = source.data["frames"]
+        # prase frame data
+        parsedframedata = parse_frame_data(framedata)
+        # create AnimationDataSet and Category Objects
+        sheet = load_categories(metadata, filepath, parsedframedata, points=points, key=source.key)
+        animcache.save(source, metadata, parsedframedata, sheet)
 
     # add important info to buffer -- get first animation bc aseprite only holds one cat
     Category.LOADED_JSONS[filepath] = list(parsedframedata.keys())[0]
@@ -274,18 +717,39 @@ def load_and_parse_aseprite_animation(filepath) -> dict:
     return info
 
 
-def load_categories(metadata, filepath, parsedframedata):
-    """Given parsed frame data, all the animations are created and cached"""
-    image = metadata['image']
+def load_categories(metadata, filepath, parsedframedata, points: dict = None, sheet=None, key: str = None):
+    """
+    Given parsed frame data, all the animations are created and cached
+    - sheet = an already cleaned sprite sheet (compiled animation) -- skips hitbox + point analysis
+    """
+    path = os.path.join(os.path.dirname(filepath), metadata['image'])
+    analyse = sheet is None
+    if analyse:
+        sheet = Filehandler.get_image(path)
+        markers = SheetMarkers(sheet)
+    # a category holds the sheet only if its frames are not on the atlas
+    held = False
     for category in parsedframedata:
         # create object
-        result = Category(category, {}, parsedframedata)
+        result = Category(category, {}, parsedframedata, key)
         # for every animation (layer) in aseprite -- create a dataset
         for animation in parsedframedata[category]:
-            result.anims[animation] = AnimationDataSet(animation, Filehandler.get_image(
-                os.path.join(os.path.dirname(filepath), image)), parsedframedata[category][animation], result)
-            result.anims[animation].hitbox_analysis()
-        Category.CATEGORIES[category] = result
+            result.anims[animation] = AnimationDataSet(animation, sheet, parsedframedata[category][animation], result)
+            if not analyse:
+                result.anims[animation].apply_func_to_frames(FrameData.update_hitbox)
+                continue
+            result.anims[animation].hitbox_analysis(markers)
+            if points:
+                result.anims[animation].point_analysis(points, markers)
+        held |= not Category.add_category(result, path)
+    if analyse:
+        markers.clear()
+        if not held:
+            # every frame is on the atlas -- only the animation cache still wants the sheet
+            Filehandler.unload_image(path)
+    elif held:
+        Filehandler.add_image(path, sheet)
+    return sheet
 
 
 def parse_frame_data(framedata) -> dict:
@@ -311,60 +775,113 @@ def parse_frame_data(framedata) -> dict:
 
 def find_and_remove_image_hitbox(image):
     """Find hitboxes on an image given hitbox color"""
-    size = image.get_size()
-    result = pygame.Rect(0, 0, size[0], size[1])
-    hfx = size[0] // 2
-    hfy = size[1] // 2
-    # look for left hitbox
-    done = False
-    for x in range(hfx):
-        for y in range(size[1]):
-            if image.get_at((x, y)) == HORIZONTAL_HITBOX_COL:
-                result.x = x + 1
-                image.set_at((x, y), (0, 0, 0, 0))
-                done = True
-                break
-        if done:
-            break
-    if not done:
-        result.x = 0
-    # look for right
-    done = False
-    for x in range(size[0] - 1, hfx - 1, -1):
-        for y in range(size[1]):
-            if image.get_at((x, y)) == HORIZONTAL_HITBOX_COL:
-                result.w = x - result.x
-                image.set_at((x, y), (0, 0, 0, 0))
-                done = True
-                break
-        if done:
-            break
-    if not done:
-        result.w = size[0] - result.x
-    # look for top
-    done = False
-    for x in range(size[0]):
-        for y in range(hfy):
-            if image.get_at((x, y)) == VERTICAL_HITBOX_COL:
-                result.y = y + 1
-                image.set_at((x, y), (0, 0, 0, 0))
-                done = True
-                break
-        if done:
-            break
-    if not done:
-        result.y = 0
-    # look for bottom
-    done = False
-    for x in range(size[0]):
-        for y in range(size[1] - 1, hfy - 1, -1):
-            if image.get_at((x, y)) == VERTICAL_HITBOX_COL:
-                result.h = y - result.y
-                image.set_at((x, y), (0, 0, 0, 0))
-                done = True
-                break
-        if done:
-            break
-    if not done:
-        result.h = size[1] - result.y
+    markers = SheetMarkers(image)
+    result = markers.find_hitbox(image.get_rect())
+    markers.clear()
+    return result
+
+
+def find_and_remove_image_points(image, colors: dict) -> dict:
+    """Find + remove the named marker points {name: color} on an image"""
+    markers = SheetMarkers(image)
+    result = markers.find_points(image.get_rect(), colors)
+    markers.clear()
     return result
+
+
+# -------------------------------------------------- #
+# marker scanning
+
+def pack_color(color) -> int:
+    """Pack an rgb(a) color into one int - alpha defaults to 255 like pygame.Color comparisons"""
+    return (color[0] << 24) | (color[1] << 16) | (color[2] << 8) | (color[3] if len(color) > 3 else 255)
+
+
+class SheetMarkers:
+    """
+    Finds marker colored pixels on a sprite sheet
+    - the sheet is read once, every marker color is compared against the whole sheet at once
+    - frames are searched column by column (x, then y) just like a get_at scan
+    - found markers are cleared from the sheet together in clear()
+    """
+
+    def __init__(self, sheet):
+        """
+        Constructor for SheetMarkers
+        contains:
+        - sheet             = pygame.Surface
+        - packed            = np.ndarray [w, h] uint32 (rgba)
+        - masks             = dict {int: np.ndarray [w, h] bool}
+        - found             = list [(x, y)] (sheet positions to clear)
+        """
+        self.sheet = sheet
+        rgb = pygame.surfarray.array3d(sheet).astype(np.uint32)
+        alpha = pygame.surfarray.array_alpha(sheet).astype(np.uint32)
+        self.packed = (rgb[:, :, 0] << 24) | (rgb[:, :, 1] << 16) | (rgb[:, :, 2] << 8) | alpha
+        self.masks = {}
+        self.found = []
+
+    def get_mask(self, color):
+        """Get the pixels of the sheet matching a color"""
+        key = pack_color(color)
+        if key not in self.masks:
+            self.masks[key] = self.packed == key
+        return self.masks[key]
+
+    def scan(self, mask, x0: int, x1: int, y0: int, y1: int, last_x: bool = False, last_y: bool = False):
+        """Get the first marked pixel inside [x0, x1) x [y0, y1) - column by column - or None"""
+        region = mask[x0:x1, y0:y1]
+        cols = np.flatnonzero(region.any(axis=1))
+        if not len(cols):
+            return None
+        x = cols[-1] if last_x else cols[0]
+        rows = np.flatnonzero(region[x])
+        y = rows[-1] if last_y else rows[0]
+        self.found.append((x0 + x, y0 + y))
+        return int(x0 + x), int(y0 + y)
+
+    def find_hitbox(self, area):
+        """Find the hitbox markers inside an area of the sheet - the result is relative to the area"""
+        result = pygame.Rect(0, 0, area.w, area.h)
+        hmask = self.get_mask(HORIZONTAL_HITBOX_COL)
+        vmask = self.get_mask(VERTICAL_HITBOX_COL)
+        hfx = area.x + area.w // 2
+        hfy = area.y + area.h // 2
+        # left + right
+        left = self.scan(hmask, area.x, hfx, area.y, area.bottom)
+        result.x = left[0] - area.x + 1 if left else 0
+        right = self.scan(hmask, hfx, area.right, area.y, area.bottom, last_x=True)
+        result.w = (right[0] - area.x if right else area.w) - result.x
+        # top + bottom
+        top = self.scan(vmask, area.x, area.right, area.y, hfy)
+        result.y = top[1] - area.y + 1 if top else 0
+        bottom = self.scan(vmask, area.x, area.right, hfy, area.bottom, last_y=True)
+        result.h = (bottom[1] - area.y if bottom else area.h) - result.y
+        return result
+
+    def find_points(self, area, colors: dict) -> dict:
+        """Find the named marker points {name: color} inside an area - relative to the area, (0, 0) if missing"""
+        result = {}
+        for name, color in colors.items():
+            pos = self.scan(self.get_mask(color), area.x, area.right, area.y, area.bottom)
+            result[name] = (pos[0] - area.x, pos[1] - area.y) if pos else (0, 0)
+        return result
+
+    def clear(self):
+        """Clear every found marker from the sheet"""
+        if not self.found:
+            return
+        xs, ys = np.array(self.found).T
+        pixels = pygame.surfarray.pixels3d(self.sheet)
+        pixels[xs, ys] = 0
+        del pixels
+        if self.sheet.get_flags() & pygame.SRCALPHA:
+            alpha = pygame.surfarray.pixels_alpha(self.sheet)
+            alpha[xs, ys] = 0
+            del alpha
+            self.packed[xs, ys] = 0
+        else:
+            self.packed[xs, ys] = 255
+        for mask in self.masks.values():
+            mask[xs, ys] = False
+        self.found.clear()
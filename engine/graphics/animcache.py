@@ -0,0 +1,130 @@
+import os
+import json
+import struct
+import hashlib
+import pygame
+
+from . import rawimage
+from .. import singleton
+
+"""
+Compiled animation cache
+- one binary file per aseprite json: parsed frame data + hitboxes + points + the cleaned sprite sheet pixels
+- keyed by the content hash of the json + png (+ marker colors) -> edited assets are recompiled automatically
+
+file layout
+- header            = magic, version, meta length, pixel offset
+- meta              = utf-8 json {"meta", "size", "categories": {cat: {anim: [frame]}}}
+- pixels            = the cleaned sheet in the display format, page aligned (see rawimage)
+-> the sheet is memory mapped, not read
+"""
+
+MAGIC = b"RPGANIM\0"
+VERSION = 2
+HEADER = struct.Struct("<8sIII")
+
+
+# -------------------------------------------------- #
+# source files
+
+class AnimationSource:
+    """
+    The files an aseprite animation is built from
+    """
+
+    def __init__(self, filepath: str, points: dict = None):
+        """
+        Constructor for AnimationSource
+        contains:
+        - filepath          = str
+        - data              = dict (aseprite json)
+        - image_path        = str
+        - key               = str (content hash)
+        """
+        self.filepath = filepath
+        with open(filepath, 'rb') as file:
+            raw = file.read()
+        self.data = json.loads(raw)
+        self.image_path = os.path.join(os.path.dirname(filepath), self.data["meta"]["image"])
+        digest = hashlib.sha1(raw)
+        with open(self.image_path, 'rb') as file:
+            digest.update(file.read())
+        # anything that changes the analysis result is part of the key
+        digest.update(repr((VERSION, singleton.HORIZONTAL_HITBOX_COL, singleton.VERTICAL_HITBOX_COL,
+                            sorted((points or {}).items()))).encode())
+        self.key = digest.hexdigest()
+
+    def get_cache_path(self):
+        """Get the cache file of this source"""
+        name = os.path.splitext(self.filepath)[0].replace(os.sep, "_").replace("/", "_").strip("._")
+        return os.path.join(singleton.ANIMATION_CACHE_DIR, f"{name}-{self.key[:16]}.anim")
+
+
+# -------------------------------------------------- #
+# frames
+
+def frame_to_dict(frame) -> dict:
+    """Get the cached data of a FrameData"""
+    loc = frame.sprite_source_location
+    hbox = frame.ohitbox
+    return {"rotated": frame.rotated, "trimmed": frame.trimmed, "source_size": frame.source_size,
+            "frame": {'x': loc.x, 'y': loc.y, 'w': loc.w, 'h': loc.h}, "duration": frame.duration,
+            "hitbox": [hbox.x, hbox.y, hbox.w, hbox.h], "points": {k: list(v) for k, v in frame.points.items()}}
+
+
+def frame_from_dict(data: dict, frame_type):
+    """Create a FrameData from cached data - hitbox + points are already analysed"""
+    result = frame_type(0, data["rotated"], data["trimmed"], data["source_size"], data["frame"], data["duration"])
+    result.ohitbox = pygame.Rect(data["hitbox"])
+    result.points = {k: tuple(v) for k, v in data["points"].items()}
+    return result
+
+
+# -------------------------------------------------- #
+# reading + writing
+
+def read(source: AnimationSource):
+    """Read the compiled (data, pixel offset) of a source - None if missing or outdated - safe on worker processes"""
+    if not singleton.ANIMATION_CACHE:
+        return None
+    path = source.get_cache_path()
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as file:
+            magic, version, meta_len, offset = HEADER.unpack(file.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                return None
+            data = json.loads(file.read(meta_len))
+        if os.path.getsize(path) < offset + data["size"][0] * data["size"][1] * 4:
+            return None
+    except (OSError, ValueError, KeyError, struct.error):
+        return None
+    return data, offset
+
+
+def load(source: AnimationSource, frame_type, compiled=None):
+    """Get (metadata, parsed frames, sheet) from the cache - compiled = an earlier read() result"""
+    compiled = compiled or read(source)
+    if not compiled:
+        return None
+    data, offset = compiled
+    try:
+        sheet = rawimage.map_pixels(source.get_cache_path(), offset, tuple(data["size"]))
+    except (OSError, ValueError):
+        return None
+    parsed = {cat: {anim: [frame_from_dict(f, frame_type) for f in frames] for anim, frames in anims.items()}
+              for cat, anims in data["categories"].items()}
+    return data["meta"], parsed, sheet
+
+
+def save(source: AnimationSource, metadata: dict, parsed: dict, sheet):
+    """Write the compiled animation + drop outdated files of the same source"""
+    if not singleton.ANIMATION_CACHE:
+        return
+    path = source.get_cache_path()
+    data = {"meta": metadata, "size": list(sheet.get_size()),
+            "categories": {cat: {anim: [frame_to_dict(f) for f in frames] for anim, frames in anims.items()}
+                           for cat, anims in parsed.items()}}
+    meta = json.dumps(data).encode()
+    rawimage.write_container(path, lambda offset: HEADER.pack(MAGIC, VERSION, len(meta), offset), sheet, meta)
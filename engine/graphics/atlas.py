@@ -0,0 +1,131 @@
+import os
+import json
+import pygame
+
+from ..handler.filehandler import Filehandler
+from .. import singleton
+
+"""
+Sprite atlas
+- build step (buildatlas.py): every frame of every loaded category is packed into a few large pages
+  + a frame index is written next to them
+- runtime: categories are pointed at their atlas areas as they load
+  -> frames become subsurfaces of a shared page + Registry.get_atlas_frame gives (page, area) for blits
+  -> the sheets packed frames were cut from are not kept loaded, only the pages are
+- index entries are keyed by the category source hash, outdated entries are ignored
+"""
+
+INDEX_FILE = "atlas.json"
+PADDING = 1
+
+
+# -------------------------------------------------- #
+# packing
+
+def pack_rects(sizes: list, page_size: int) -> list:
+    """
+    Shelf pack (w, h) sizes into square pages - returns [(page, x, y)] in the order of sizes
+    - tallest first, rows are filled left to right
+    """
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    result = [None] * len(sizes)
+    page, x, y, shelf = 0, 0, 0, 0
+    for i in order:
+        w, h = sizes[i][0] + PADDING, sizes[i][1] + PADDING
+        if w > page_size or h > page_size:
+            raise ValueError(f"Frame of size {sizes[i]} does not fit into a {page_size} atlas page")
+        if x + w > page_size:
+            x, y, shelf = 0, y + shelf, 0
+        if y + h > page_size:
+            page, x, y, shelf = page + 1, 0, 0, 0
+        result[i] = (page, x, y)
+        x += w
+        shelf = max(shelf, h)
+    return result
+
+
+# -------------------------------------------------- #
+# atlas
+
+class Atlas:
+    """
+    Packed frame pages shared by every category
+    """
+    PAGES = []
+    # {category: {"key": str, "anims": {anim: [[page, x, y, w, h]]}}}
+    INDEX = None
+
+    @classmethod
+    def load(cls, directory: str = None):
+        """Load the atlas index - pages are loaded when a category uses them"""
+        directory = directory or singleton.ATLAS_DIR
+        cls.INDEX = {}
+        cls.PAGES = []
+        path = os.path.join(directory, INDEX_FILE)
+        if not os.path.exists(path):
+            return False
+        with open(path, 'r') as file:
+            data = json.load(file)
+        cls.INDEX = data["categories"]
+        cls.PAGES = [os.path.join(directory, page) for page in data["pages"]]
+        return True
+
+    @classmethod
+    def get_page(cls, page: int):
+        """Get an atlas page surface"""
+        return Filehandler.get_image(cls.PAGES[page])
+
+    @classmethod
+    def attach(cls, category):
+        """Point the frames of a category at the atlas - returns False if the category is not (validly) packed"""
+        if not singleton.ATLAS:
+            return False
+        if cls.INDEX is None:
+            cls.load()
+        entry = cls.INDEX.get(category.name)
+        if not entry or entry["key"] != category.key or set(entry["anims"]) != set(category.anims):
+            return False
+        # every frame has to match -- otherwise the atlas is from other assets
+        for name, anim in category.anims.items():
+            areas = entry["anims"][name]
+            if len(areas) != len(anim.frames):
+                return False
+            for f, area in zip(anim.frames, areas):
+                if f.oframe.get_size() != (area[3], area[4]):
+                    return False
+        for name, anim in category.anims.items():
+            for f, area in zip(anim.frames, entry["anims"][name]):
+                f.set_atlas(cls.get_page(area[0]), pygame.Rect(area[1:]))
+                category.hold_image(cls.PAGES[area[0]])
+        return True
+
+    @classmethod
+    def build(cls, categories, directory: str = None, page_size: int = None):
+        """Pack every frame of the categories into pages + write them with their index - returns the page count"""
+        directory = directory or singleton.ATLAS_DIR
+        page_size = page_size or singleton.ATLAS_PAGE_SIZE
+        frames = [(category, name, f) for category in categories for name, anim in category.anims.items()
+                  for f in anim.frames]
+        places = pack_rects([f.oframe.get_size() for c, n, f in frames], page_size)
+        count = max((p[0] for p in places), default=-1) + 1
+        # crop every page to its used area
+        used = [[0, 0] for i in range(count)]
+        for (c, n, f), (page, x, y) in zip(frames, places):
+            w, h = f.oframe.get_size()
+            used[page][0] = max(used[page][0], x + w)
+            used[page][1] = max(used[page][1], y + h)
+        pages = [pygame.Surface(size, pygame.SRCALPHA, 32) for size in used]
+        index = {}
+        for (category, name, f), (page, x, y) in zip(frames, places):
+            pages[page].blit(f.oframe, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+            entry = index.setdefault(category.name, {"key": category.key, "anims": {}})
+            entry["anims"].setdefault(name, []).append([page, x, y] + list(f.oframe.get_size()))
+        os.makedirs(directory, exist_ok=True)
+        names = [f"atlas{i}.png" for i in range(count)]
+        for page, name in zip(pages, names):
+            pygame.image.save(page, os.path.join(directory, name))
+        with open(os.path.join(directory, INDEX_FILE), 'w') as file:
+            json.dump({"pages": names, "categories": index}, file)
+        # the runtime index is outdated now
+        cls.INDEX = None
+        return count
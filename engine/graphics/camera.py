@@ -13,6 +13,8 @@ class Camera:
         """
         self.campos = pygame.math.Vector2(0, 0)
         self.position = pygame.math.Vector2(0, 0)
+        # position before the last simulation tick
+        self.prev_position = pygame.math.Vector2(0, 0)
         self.chunkpos = [0, 0]
         self.screenchunkpos = [0, 0]
         # ----------------------------------- #
@@ -47,6 +49,15 @@ class Camera:
         """Updates EGLOB Offsets"""
         EGLOB.WORLD_OFFSET_X = self.position.x
         EGLOB.WORLD_OFFSET_Y = self.position.y
+
+    def save_state(self):
+        """Save the position that rendering interpolates from"""
+        self.prev_position.xy = self.position.xy
+
+    def interpolate(self, alpha: float):
+        """Updates EGLOB Offsets between the last two simulation states"""
+        EGLOB.WORLD_OFFSET_X = self.prev_position.x + (self.position.x - self.prev_position.x) * alpha
+        EGLOB.WORLD_OFFSET_Y = self.prev_position.y + (self.position.y - self.prev_position.y) * alpha
     
     def get_target_rel_pos(self):
         """Get the raget relative position"""
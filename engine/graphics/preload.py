@@ -0,0 +1,119 @@
+import time
+
+from concurrent import futures
+
+from ..handler.filehandler import Filehandler, AssetRefs
+from . import animation
+from .. import singleton
+
+"""
+Background asset preloading
+- file reading, json parsing + image decoding run on the Filehandler worker pool
+- finished work is handed back to the main thread in poll() for surface conversion + frame building
+- scenes queue their assets ahead of time and poll the progress every frame
+- loaded assets are held by the owner of the queue, not whichever scene is current
+"""
+
+
+class AssetQueue:
+    """
+    A list of assets being loaded in the background
+    """
+
+    def __init__(self, images=(), categories=(), owner=None):
+        """
+        Constructor for AssetQueue
+        contains:
+        - owner             = Scene (holds the loaded assets, None = the current scene)
+        - pending           = list [(kind, name, future)]
+        - total             = int
+        - done              = int
+        - errors            = list [(name, Exception)]
+        """
+        self.owner = owner
+        self.pending = []
+        self.total = 0
+        self.done = 0
+        self.errors = []
+        for path in images:
+            self.add_image(path)
+        for category in categories:
+            self.add_category(category)
+
+    def add_image(self, path: str):
+        """Queue an image"""
+        self.total += 1
+        if path in Filehandler.LOADED_IMAGES:
+            self.hold("image", path)
+            self.done += 1
+            return
+        self.pending.append(("image", path, Filehandler.load_image_async(path)))
+
+    def add_category(self, category: str):
+        """Queue an animation category from the AnimationManifest"""
+        self.total += 1
+        if category in animation.Category.CATEGORIES:
+            self.hold("category", category)
+            self.done += 1
+            return
+        args = animation.AnimationManifest.get_prepare_args(category)
+        self.pending.append(("category", category, Filehandler.submit(animation.prepare_aseprite_animation, *args)))
+
+    def hold(self, kind: str, key):
+        """The owner holds an already loaded asset"""
+        if self.owner:
+            self.owner.hold(kind, key)
+        else:
+            AssetRefs.use(kind, key)
+
+    def finish(self, kind: str, name: str, result):
+        """Main thread half of loading an asset"""
+        previous = AssetRefs.OWNER
+        if self.owner:
+            AssetRefs.set_owner(self.owner)
+        try:
+            if kind == "image":
+                Filehandler.add_decoded_image(name, result)
+            else:
+                animation.AnimationManifest.finish(name, result)
+        finally:
+            AssetRefs.set_owner(previous)
+
+    def poll(self, budget: float = None):
+        """Finish loaded assets for up to <budget> seconds - returns the progress [0, 1]"""
+        budget = singleton.LOADER_FRAME_BUDGET if budget is None else budget
+        start = time.perf_counter()
+        for item in list(self.pending):
+            kind, name, future = item
+            if not future.done():
+                continue
+            self.pending.remove(item)
+            try:
+                self.finish(kind, name, future.result())
+            except Exception as e:
+                self.errors.append((name, e))
+            self.done += 1
+            if time.perf_counter() - start > budget:
+                break
+        return self.get_progress()
+
+    def wait(self):
+        """Block until everything is loaded - failed assets end up in errors like in poll()"""
+        while self.pending:
+            futures.wait([future for kind, name, future in self.pending])
+            self.poll(budget=float("inf"))
+
+    def cancel(self):
+        """Stop loading the pending assets"""
+        for kind, name, future in self.pending:
+            future.cancel()
+        self.total -= len(self.pending)
+        self.pending.clear()
+
+    def get_progress(self):
+        """Get the loaded fraction [0, 1]"""
+        return self.done / self.total if self.total else 1.0
+
+    def is_done(self):
+        """Check if every asset is loaded"""
+        return not self.pending
@@ -0,0 +1,131 @@
+import os
+import mmap
+import struct
+import hashlib
+import pygame
+
+from .. import singleton
+
+"""
+Raw pixel containers
+- pixels are stored uncompressed in the display pixel format, starting on a page boundary
+- loading maps the file copy-on-write + wraps the pixels with pygame.image.frombuffer -> no decoding, no copy
+- processes mapping the same file share its pages (until one of them draws onto the surface)
+
+file layout
+- header            = magic, version, width, height, pixel offset
+- pixels            = width * height * 4 bytes in FORMAT, at a multiple of mmap.ALLOCATIONGRANULARITY
+"""
+
+MAGIC = b"RPGRAW\0\0"
+VERSION = 1
+HEADER = struct.Struct("<8sIIII")
+# byte order of SDL's ARGB8888 -- what convert_alpha gives on little endian displays
+FORMAT = "BGRA"
+
+
+def align(offset: int) -> int:
+    """Round up to the next mappable offset"""
+    page = mmap.ALLOCATIONGRANULARITY
+    return (offset + page - 1) // page * page
+
+
+# -------------------------------------------------- #
+# pixels
+
+def get_pixels(surface) -> bytes:
+    """Get the pixels of a surface in FORMAT"""
+    return pygame.image.tobytes(surface, FORMAT)
+
+
+def write_pixels(file, surface):
+    """Pad the file to the next page + write the pixels of a surface - returns their offset"""
+    offset = align(file.tell())
+    file.write(b"\0" * (offset - file.tell()))
+    file.write(get_pixels(surface))
+    return offset
+
+
+def map_pixels(path: str, offset: int, size: tuple):
+    """Wrap pixels of a file as a surface - the surface keeps the mapping alive"""
+    with open(path, 'rb') as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+    length = size[0] * size[1] * 4
+    if offset + length > len(mapped):
+        raise ValueError(f"'{path}' is too short for a {size[0]}x{size[1]} image")
+    return pygame.image.frombuffer(memoryview(mapped)[offset:offset + length], size, FORMAT)
+
+
+# -------------------------------------------------- #
+# compiled images
+
+def get_compiled_path(path: str):
+    """Get the container of an image file - keyed by the file contents"""
+    with open(path, 'rb') as file:
+        key = hashlib.sha1(file.read()).hexdigest()
+    name = os.path.splitext(path)[0].replace(os.sep, "_").replace("/", "_").strip("._")
+    return os.path.join(singleton.RAW_IMAGE_DIR, f"{name}-{key[:16]}.raw")
+
+
+def load(path: str):
+    """Map a container - None if it is missing or invalid"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as file:
+            magic, version, width, height, offset = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            return None
+        return map_pixels(path, offset, (width, height))
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def write_container(path: str, header, surface, meta: bytes = b""):
+    """
+    Write header + meta + the pixels of a surface + drop outdated files of the same source
+    - header = function pixel offset -> packed header (the offset is 0 until the pixels are written)
+    - files named <prefix>-<key> with the same extension + key length are outdated
+    """
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        name = os.path.basename(path)
+        prefix, extension = name.rsplit("-", 1)[0] + "-", os.path.splitext(name)[1]
+        for old in os.listdir(os.path.dirname(path)):
+            if old.startswith(prefix) and old.endswith(extension) and len(old) == len(name):
+                os.remove(os.path.join(os.path.dirname(path), old))
+        # write + swap so a crash never leaves half a file behind
+        with open(path + ".tmp", 'wb') as file:
+            file.write(header(0))
+            file.write(meta)
+            offset = write_pixels(file, surface)
+            file.seek(0)
+            file.write(header(offset))
+        os.replace(path + ".tmp", path)
+    except OSError:
+        pass
+
+
+def save(path: str, surface):
+    """Write a surface into a container + drop outdated containers of the same image"""
+    write_container(path, lambda offset: HEADER.pack(MAGIC, VERSION, surface.get_width(), surface.get_height(),
+                                                     offset), surface)
+
+
+def load_image(path: str):
+    """Load an image file through its container - compiles the container first if needed"""
+    compiled = get_compiled_path(path)
+    surface = load(compiled)
+    if surface is None:
+        image = pygame.image.load(path)
+        save(compiled, image)
+        surface = load(compiled)
+        # cache directory not writable
+        if surface is None:
+            return image
+    return surface
+
+
+def is_compiled(path: str):
+    """Check if an image file has an up to date container"""
+    return os.path.exists(get_compiled_path(path))
@@ -0,0 +1,57 @@
+"""
+RenderQueue batches sprite draws for a layer
+- entities submit (surface, dest, area, flags) tuples
+- the layer flushes them with a single Surface.blits call
+- direct draws (pygame.draw, particles) are queued as calls -> they keep their place between the blits
+"""
+
+
+class RenderQueue:
+    """
+    Stores blits + draw calls in submission order
+    - anything drawn straight to the surface should be queued with submit_draw
+    """
+
+    def __init__(self):
+        """
+        Constructor for RenderQueue
+        contains:
+        - items             = list [(pygame.Surface, (x, y), pygame.Rect, int)]
+        - draws             = list [(int, func, tuple)] (blit index, func(target, *args), args)
+        - last_count        = int (blits issued by the last flush)
+        """
+        self.items = []
+        self.draws = []
+        self.last_count = 0
+
+    def submit(self, surface, dest, area=None, flags: int = 0):
+        """Queue a blit"""
+        self.items.append((surface, dest, area, flags))
+
+    def submit_many(self, items):
+        """Queue a sequence of (surface, dest, area, flags) tuples"""
+        self.items.extend(items)
+
+    def submit_draw(self, func, *args):
+        """Queue a direct draw - func(target, *args) runs after the blits submitted before it"""
+        self.draws.append((len(self.items), func, args))
+
+    def flush(self, target):
+        """Draw all queued blits + draw calls onto target"""
+        self.last_count = len(self.items)
+        # blits between two draw calls stay one batch
+        start = 0
+        for index, func, args in self.draws:
+            if index > start:
+                target.blits(self.items[start:index], doreturn=False)
+                start = index
+            func(target, *args)
+        if start < len(self.items):
+            target.blits(self.items[start:] if start else self.items, doreturn=False)
+        self.items.clear()
+        self.draws.clear()
+
+    def clear(self):
+        """Drop all queued blits + draw calls"""
+        self.items.clear()
+        self.draws.clear()
@@ -0,0 +1,114 @@
+import pygame
+
+from collections import OrderedDict
+
+from .. import singleton
+
+"""
+Derived surface caches
+- surfaces made from other surfaces (rotations, scales, flips) are built when first asked for
+- every cache has a byte budget, the least recently used surfaces are dropped once it is exceeded
+- hit / miss / eviction counts are kept for the profiler
+"""
+
+
+def get_surface_bytes(surface) -> int:
+    """Memory used by the pixels of a surface"""
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+# -------------------------------------------------- #
+# lru cache
+
+class SurfaceCache:
+    """
+    Byte budgeted LRU cache of surfaces
+    """
+    # name: SurfaceCache
+    CACHES = {}
+
+    @classmethod
+    def get_cache(cls, name: str):
+        """Get a cache by name"""
+        return cls.CACHES[name]
+
+    def __init__(self, name: str, budget: int):
+        """
+        Constructor for SurfaceCache
+        contains:
+        - name              = str
+        - budget            = int (bytes)
+        - surfaces          = OrderedDict {key: pygame.Surface} (least recently used first)
+        - bytes             = int (bytes held)
+        - hits              = int
+        - misses            = int
+        - evictions         = int
+        """
+        self.name = name
+        self.budget = budget
+        self.surfaces = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        SurfaceCache.CACHES[name] = self
+
+    def get(self, key, create, *args):
+        """Get the surface of a key - create(*args) builds it on a miss"""
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = create(*args)
+        self.add(key, surface)
+        return surface
+
+    def add(self, key, surface):
+        """Store a surface + evict until the cache fits its budget again"""
+        if key in self.surfaces:
+            self.bytes -= get_surface_bytes(self.surfaces.pop(key))
+        self.surfaces[key] = surface
+        self.bytes += get_surface_bytes(surface)
+        # the newest surface always stays, even if it alone is over budget
+        while self.bytes > self.budget and len(self.surfaces) > 1:
+            old_key, old = self.surfaces.popitem(last=False)
+            self.bytes -= get_surface_bytes(old)
+            self.evictions += 1
+
+    def remove(self, key):
+        """Drop a surface"""
+        if key in self.surfaces:
+            self.bytes -= get_surface_bytes(self.surfaces.pop(key))
+
+    def remove_matching(self, func):
+        """Drop every surface whose key passes func(key)"""
+        for key in [key for key in self.surfaces if func(key)]:
+            self.remove(key)
+
+    def clear(self):
+        """Drop every surface - stats are kept"""
+        self.surfaces.clear()
+        self.bytes = 0
+
+    def get_stats(self):
+        """Get {"surfaces", "bytes", "budget", "hits", "misses", "evictions"}"""
+        return {"surfaces": len(self.surfaces), "bytes": self.bytes, "budget": self.budget, "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions}
+
+    def __len__(self):
+        return len(self.surfaces)
+
+
+# -------------------------------------------------- #
+# rotations
+
+ROTATIONS = SurfaceCache("rotations", singleton.ROTATION_CACHE_BYTES)
+
+
+def get_rotation(surface, angle: float):
+    """Get surface rotated counterclockwise by angle degrees - shared by every user of the same surface"""
+    if not angle:
+        return surface
+    return ROTATIONS.get((surface, angle), pygame.transform.rotate, surface, angle)
@@ -5,6 +5,7 @@
 import pygame
 
 from ..misc import maths
+from ..handler.filehandler import Filehandler
 from .. import singleton
 
 # -------------------------------------------------- #
@@ -165,7 +166,7 @@ class Paragraph:
                 # if we go out of width bounds - add a new line
                 if width < self.config["maxwidth"] < width:
                     rendered.append([])
-                rendered[-1].append(render.convert_alpha())
+                rendered[-1].append(Filehandler.convert(render))
 
         # render spaces
         space_area = self.config["font"].render(" ", self.config["aa"], color, self.config["background"]).get_size()
@@ -189,7 +190,7 @@ class Paragraph:
 
         # create surface
         # print("texture area: ", area)
-        result = pygame.Surface(area, 0, 32).convert_alpha()
+        result = Filehandler.convert(pygame.Surface(area, 0, 32))
 
         # render!!!
         left = 0
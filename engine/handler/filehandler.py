@@ -1,56 +1,252 @@
+import os
 import pygame
 import pickle
 
+from concurrent import futures
+
 from ..world import chunk
+from ..graphics import surfcache, rawimage
 from .. import singleton
 
 """
 Filehandler stores + handles files
 - images
 - audio files
+
+Loaded assets are reference counted (AssetRefs)
+- assets used while a scene is current are held by that scene
+- popping / cleaning a scene unloads whatever no other scene or asset still holds
 """
 
 
+# -------------------------------------------------- #
+# worker functions -- no display calls, results can be pickled for a process pool
+
+def decode_image(path: str):
+    """Decode an image file into (RGBA bytes, size) - None if it has a raw container (mapping it is faster)"""
+    if singleton.RAW_IMAGES and rawimage.is_compiled(path):
+        return None
+    image = pygame.image.load(path)
+    return pygame.image.tobytes(image, "RGBA"), image.get_size()
+
+
+# -------------------------------------------------- #
+# asset lifetimes
+
+class AssetHandle:
+    """
+    One reference to a loaded asset
+    """
+
+    def __init__(self, kind: str, key):
+        """
+        Constructor for AssetHandle
+        contains:
+        - kind              = str ("image", "font", "category", ...)
+        - key               = hashable (path, name, ...)
+        - released          = bool
+        """
+        self.kind = kind
+        self.key = key
+        self.released = False
+        AssetRefs.acquire(kind, key)
+
+    def release(self):
+        """Drop the reference - the asset is unloaded with its last reference"""
+        if not self.released:
+            self.released = True
+            AssetRefs.release(self.kind, self.key)
+
+
+class AssetRefs:
+    """
+    Reference counts of every loaded asset
+    - OWNER (the current scene) gets a handle to every asset used while it is set
+    """
+    # kind: (unload func(key), size func(key) -> bytes, keys func() -> iterable)
+    KINDS = {}
+    # (kind, key): int
+    COUNTS = {}
+    # has hold(kind, key) -- SceneHandler sets the current scene
+    OWNER = None
+
+    @classmethod
+    def register_kind(cls, kind: str, unload, get_size, get_keys):
+        """Register a kind of asset + how to unload, measure + list it"""
+        cls.KINDS[kind] = (unload, get_size, get_keys)
+
+    @classmethod
+    def set_owner(cls, owner):
+        """Set who holds assets used from now on"""
+        cls.OWNER = owner
+
+    @classmethod
+    def use(cls, kind: str, key):
+        """An asset is being used - the owner holds it"""
+        if cls.OWNER is not None:
+            cls.OWNER.hold(kind, key)
+
+    @classmethod
+    def acquire(cls, kind: str, key):
+        cls.COUNTS[(kind, key)] = cls.COUNTS.get((kind, key), 0) + 1
+
+    @classmethod
+    def release(cls, kind: str, key):
+        cls.COUNTS[(kind, key)] -= 1
+        if cls.COUNTS[(kind, key)] <= 0:
+            del cls.COUNTS[(kind, key)]
+            cls.KINDS[kind][0](key)
+
+    @classmethod
+    def get_memory_report(cls):
+        """Get every resident asset as [(bytes, kind, key, references)] - largest first"""
+        rows = [(size(key), kind, key, cls.COUNTS.get((kind, key), 0))
+                for kind, (unload, size, keys) in cls.KINDS.items() for key in list(keys())]
+        rows += [(cache.bytes, "cache", name, len(cache)) for name, cache in surfcache.SurfaceCache.CACHES.items()]
+        rows.sort(key=lambda row: -row[0])
+        return rows
+
+
 class Filehandler:
     # str : surface
     LOADED_IMAGES = {}
     # str: {int: font}
     LOADED_FONTS = {}
+    # masks of convert_alpha surfaces -- found on first use
+    DISPLAY_MASKS = None
+    # (path, transform kind, args) : surface
+    DERIVED_IMAGES = surfcache.SurfaceCache("images", singleton.IMAGE_CACHE_BYTES)
+    # background loading
+    POOL = None
 
     # -------------------------------------------------- #
     # file loading
 
+    @classmethod
+    def convert(cls, surface):
+        """Convert a surface to the display format - skipped when headless (there is no display)"""
+        if singleton.HEADLESS or cls.is_display_format(surface):
+            return surface
+        return surface.convert_alpha()
+
+    @classmethod
+    def is_display_format(cls, surface):
+        """Check if a surface already has the pixel format convert_alpha would give it"""
+        if cls.DISPLAY_MASKS is None:
+            cls.DISPLAY_MASKS = pygame.Surface((1, 1), pygame.SRCALPHA, 32).convert_alpha().get_masks()
+        return surface.get_flags() & pygame.SRCALPHA and surface.get_masks() == cls.DISPLAY_MASKS
+
+    @classmethod
+    def load_image_file(cls, path: str):
+        """Read an image file - through its raw container when RAW_IMAGES is on"""
+        if singleton.RAW_IMAGES:
+            return rawimage.load_image(path)
+        return pygame.image.load(path)
+
     @classmethod
     def get_image(cls, path: str):
         """Loads images + converts to alpha so they are faster to use"""
+        AssetRefs.use("image", path)
         if path in cls.LOADED_IMAGES:
             return cls.LOADED_IMAGES[path]
-        cls.LOADED_IMAGES[path] = pygame.image.load(path).convert_alpha()
+        cls.LOADED_IMAGES[path] = cls.convert(cls.load_image_file(path))
         return cls.LOADED_IMAGES[path]
 
+    @classmethod
+    def add_image(cls, path: str, surface):
+        """Store an image that was loaded some other way"""
+        AssetRefs.use("image", path)
+        cls.LOADED_IMAGES[path] = surface
+        return surface
+
+    @classmethod
+    def unload_image(cls, path: str):
+        """Drop an image + everything derived from it"""
+        cls.LOADED_IMAGES.pop(path, None)
+        cls.DERIVED_IMAGES.remove_matching(lambda key: key[0] == path)
+
+    @classmethod
+    def get_derived_image(cls, path: str, kind: str, func, *args):
+        """
+        Get func(image, *args) of a loaded image - cached by (path, kind, args)
+        - the result is shared by every caller -> copy it before drawing onto it
+        """
+        return cls.DERIVED_IMAGES.get((path, kind, args), cls.derive_image, path, func, args)
+
+    @classmethod
+    def derive_image(cls, path: str, func, args):
+        return func(cls.get_image(path), *args)
+
     @classmethod
     def get_image_and_scale_float(cls, path: str, scale: list):
         """
         Loads images + optional scaling + converts to alpha so they are faster to use
         - scale = list [float, float]
         multiplies the original width by float values
+        - the scaled image is cached + shared, copy it before drawing onto it
         """
-        if path in cls.LOADED_IMAGES:
-            i_size = cls.LOADED_IMAGES[path].get_size()
-            return pygame.transform.scale(cls.LOADED_IMAGES[path],
-                                          (int(i_size[0] * scale[0]), int(i_size[1] * scale[1])))
-        cls.LOADED_IMAGES[path] = pygame.image.load(path).convert_alpha()
-        i_size = cls.LOADED_IMAGES[path].get_size()
-        return pygame.transform.scale(cls.LOADED_IMAGES[path],
-                                      (int(i_size[0] * scale[0]), int(i_size[1] * scale[1])))
+        i_size = cls.get_image(path).get_size()
+        return cls.get_derived_image(path, "scale", pygame.transform.scale,
+                                     (int(i_size[0] * scale[0]), int(i_size[1] * scale[1])))
+
+    @classmethod
+    def get_image_rotated(cls, path: str, angle: float):
+        """Get a loaded image rotated counterclockwise by angle degrees - cached + shared"""
+        return cls.get_derived_image(path, "rotate", pygame.transform.rotate, angle)
+
+    @classmethod
+    def get_image_flipped(cls, path: str, flip_x: bool, flip_y: bool = False):
+        """Get a mirrored loaded image - cached + shared"""
+        return cls.get_derived_image(path, "flip", pygame.transform.flip, bool(flip_x), bool(flip_y))
+
+    # -------------------------------------------------- #
+    # background loading
+
+    @classmethod
+    def get_pool(cls):
+        """Get the worker pool used for background loading"""
+        if not cls.POOL:
+            if singleton.LOADER_PROCESSES:
+                cls.POOL = futures.ProcessPoolExecutor(max_workers=singleton.LOADER_WORKERS)
+            else:
+                cls.POOL = futures.ThreadPoolExecutor(max_workers=singleton.LOADER_WORKERS)
+        return cls.POOL
+
+    @classmethod
+    def submit(cls, func, *args):
+        """Run func(*args) on the worker pool - returns a future"""
+        return cls.get_pool().submit(func, *args)
+
+    @classmethod
+    def load_image_async(cls, path: str):
+        """Decode an image on the worker pool - finish it on the main thread with add_decoded_image"""
+        return cls.submit(decode_image, path)
+
+    @classmethod
+    def add_decoded_image(cls, path: str, decoded):
+        """Turn a decoded (RGBA bytes, size) image into a cached surface - main thread only"""
+        if decoded is None:
+            return cls.get_image(path)
+        AssetRefs.use("image", path)
+        if path not in cls.LOADED_IMAGES:
+            cls.LOADED_IMAGES[path] = cls.convert(pygame.image.frombytes(decoded[0], decoded[1], "RGBA"))
+        return cls.LOADED_IMAGES[path]
+
+    @classmethod
+    def shutdown_pool(cls):
+        """Stop the worker pool"""
+        if cls.POOL:
+            cls.POOL.shutdown(wait=False, cancel_futures=True)
+            cls.POOL = None
 
     # -------------------------------------------------- #
     # font / text loading
     @classmethod
     def load_font(cls, path: str, size: int):
         """Load .ttf files / fonts for the program + cache"""
+        AssetRefs.use("font", (path, size))
         # if font is already loaded with the size
-        if path in cls.LOADED_IMAGES and size in cls.LOADED_FONTS[path]:
+        if path in cls.LOADED_FONTS and size in cls.LOADED_FONTS[path]:
             return cls.LOADED_FONTS[path][size]
         # load the font
         font = pygame.font.Font(path, size)
@@ -60,6 +256,31 @@ class Filehandler:
         cls.LOADED_FONTS[path][size] = font
         return font
 
+    @classmethod
+    def unload_font(cls, key: tuple):
+        """Drop a (path, size) font"""
+        path, size = key
+        if path in cls.LOADED_FONTS:
+            cls.LOADED_FONTS[path].pop(size, None)
+            if not cls.LOADED_FONTS[path]:
+                del cls.LOADED_FONTS[path]
+
+    @classmethod
+    def get_font_keys(cls):
+        return [(path, size) for path, sizes in cls.LOADED_FONTS.items() for size in sizes]
+
+    @staticmethod
+    def get_font_bytes(key: tuple):
+        """Fonts keep their file in memory -- the file size is close enough"""
+        return os.path.getsize(key[0]) if os.path.exists(key[0]) else 0
+
+
+AssetRefs.register_kind("image", Filehandler.unload_image,
+                        lambda path: surfcache.get_surface_bytes(Filehandler.LOADED_IMAGES[path]),
+                        lambda: Filehandler.LOADED_IMAGES.keys())
+AssetRefs.register_kind("font", Filehandler.unload_font, Filehandler.get_font_bytes, Filehandler.get_font_keys)
+
+
 # -------------------------------------------------- #
 # chunk saving
 
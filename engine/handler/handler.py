@@ -1,17 +1,26 @@
 # -------------------------------------------------- #
 # handler class
 
+import numpy as np
+
+from itertools import chain
+
 from .. import singleton as EGLOB
+from ..misc import clock, profiler
+from ..gamesystem import entity as gentity
+from . import transform
 
 class Handler:
     """
     Handles all pygame.sprite.Sprite objects
     - update + render
     """
-    def __init__(self, layer):
+    def __init__(self, layer, transforms: bool = None, chunked: bool = True):
         """
         Handler Constructor
         - stores arrays of pygame.sprite.Group objects
+        - transforms        = TransformStore (optional, see singleton.TRANSFORM_STORE)
+        - chunked           = bool (entities are added to chunk.entities -- the env handler's objects live in chunk.env)
         """
         self.entity_buffer = {}
         self.entities = set()
@@ -23,38 +32,148 @@ class Handler:
         # world
         self.layer = layer
         self.scene = layer.scene
+
+        # transform store
+        if transforms is None:
+            transforms = EGLOB.TRANSFORM_STORE
+        self.transforms = transform.TransformStore() if transforms else None
+        self.chunked = chunked
+
+        # activity tiers
+        self.ticks = 0
+        self.tier_counts = [0, 0, 0]
+
+        # viewport culling -- draws skipped in the current / last frame
+        self.culled = 0
+        self.last_culled = 0
     
     def handle_entities(self, window):
         """Update and render entities to supplied window"""
-        # priority entities :)
-        for i in self.priority_entities:
-            self.entity_buffer[i].update()
-            if i not in self.to_remove:
-                # update some data
-                self.entity_buffer[i].render(window)
-        # update and render entities
-        for i in self.entities:
-            self.entity_buffer[i].update()
-            if i not in self.to_remove:
-                # update some data
-                self.entity_buffer[i].render(window)
-        self.handle_changes()
+        self.tick_entities()
+        self.render_entities(window)
     
     def debug_handle_entities(self, window):
         """Update and render entities to supplied window + debug"""
+        self.tick_entities()
+        self.debug_render_entities(window)
+
+    def tick_entities(self):
+        """Update entities - one simulation tick"""
+        # entities added / removed since the last tick
+        self.handle_changes()
+        # rendering interpolates from the state before an entity's last update
+        interp = bool(clock.TICK_RATE)
         # priority entities :)
         for i in self.priority_entities:
-            self.entity_buffer[i].update()
-            if i not in self.to_remove:
-                # update some data
-                self.entity_buffer[i].render(window)
-        # entities
+            entity = self.entity_buffer[i]
+            if interp:
+                entity.save_state()
+            entity.update()
+        if self.transforms:
+            # the other entities see where the priority entities (player) moved to
+            self.layer.world.move_entities()
+        # update entities by activity tier
+        self.ticks += 1
+        self.tier_counts[0] = self.tier_counts[1] = self.tier_counts[2] = 0
+        camchunk = self.layer.camera.chunkpos
+        profiled = profiler.ENABLED
         for i in self.entities:
-            self.entity_buffer[i].update()
-            if i not in self.to_remove:
-                self.entity_buffer[i].render(window)
-                self.entity_buffer[i].debug(window)
-        self.handle_changes()
+            entity = self.entity_buffer[i]
+            if profiled:
+                start = profiler.now()
+            if entity.activity:
+                self.update_tiered_entity(entity, camchunk)
+            else:
+                if interp:
+                    entity.save_state()
+                entity.update()
+            if profiled:
+                profiler.add_entity_time(entity, profiler.UPDATE, profiler.now() - start)
+        if self.transforms:
+            # integrate all queued motion at once
+            self.layer.world.move_entities()
+
+    def update_tiered_entity(self, entity, camchunk):
+        """Update an entity according to its activity tier"""
+        tier = entity.activity.get_tier(max(abs(entity.chunk[0] - camchunk[0]), abs(entity.chunk[1] - camchunk[1])))
+        entity.tier = tier
+        self.tier_counts[tier] += 1
+        if tier == gentity.ActivityTier.DORMANT:
+            # do not catch up on time spent asleep + draw where it stopped
+            entity.skipped_time = 0.0
+            entity.skipped_ticks = 0
+            entity.tick_span = 1
+            if clock.TICK_RATE:
+                entity.save_state()
+            return
+        # stagger reduced entities across ticks
+        if tier == gentity.ActivityTier.REDUCED and (self.ticks + entity.id) % entity.activity.reduced_rate:
+            entity.skipped_time += clock.delta_time
+            entity.skipped_ticks += 1
+            return
+        # snapshot only when updating -- rendering blends over all the ticks this update covers
+        if clock.TICK_RATE:
+            entity.save_state()
+            entity.tick_span = entity.skipped_ticks + 1
+        entity.skipped_ticks = 0
+        if entity.skipped_time:
+            dt = clock.delta_time
+            clock.delta_time = dt + entity.skipped_time
+            entity.skipped_time = 0.0
+            entity.update()
+            clock.delta_time = dt
+        else:
+            entity.update()
+
+    def render_entities(self, window):
+        """Render entities to supplied window"""
+        self.reset_cull_count()
+        for entity in self.cull_entities(self.priority_entities):
+            entity.render(window)
+        if profiler.ENABLED:
+            self.profile_render_entities(window)
+            return
+        for entity in self.cull_entities(self.entities):
+            entity.render(window)
+
+    def profile_render_entities(self, window):
+        """Render entities + time each entity type"""
+        for entity in self.cull_entities(self.entities):
+            start = profiler.now()
+            entity.render(window)
+            profiler.add_entity_time(entity, profiler.RENDER, profiler.now() - start)
+
+    def debug_render_entities(self, window):
+        """Render entities to supplied window + debug"""
+        self.reset_cull_count()
+        for entity in self.cull_entities(self.priority_entities):
+            entity.render(window)
+        for entity in self.cull_entities(self.entities):
+            entity.render(window)
+            # debug draws on top of the queued sprite
+            self.layer.render_queue.flush(window)
+            entity.debug(window)
+
+    def reset_cull_count(self):
+        """Start counting culled draws for a new frame"""
+        self.last_culled = self.culled
+        self.culled = 0
+
+    def cull_entities(self, eids):
+        """Get the entities whose rel_hitbox intersects the camera viewport + margin"""
+        entities = [self.entity_buffer[i] for i in eids if i not in self.to_remove]
+        if not entities:
+            return entities
+        # test every hitbox at once
+        boxes = np.fromiter(chain.from_iterable(e.rel_hitbox for e in entities), np.int32,
+                            len(entities) * 4).reshape(-1, 4)
+        viewport = self.layer.camera.viewport
+        margin = EGLOB.CULL_MARGIN
+        visible = ((boxes[:, 0] < viewport.right + margin) & (boxes[:, 0] + boxes[:, 2] > viewport.left - margin) &
+                   (boxes[:, 1] < viewport.bottom + margin) & (boxes[:, 1] + boxes[:, 3] > viewport.top - margin))
+        result = [e for e, v in zip(entities, visible.tolist()) if v or not e.cullable]
+        self.culled += len(entities) - len(result)
+        return result
 
     def add_entity(self, entity):
         """Add an entity"""
@@ -74,11 +193,20 @@ class Handler:
         for entity in self.prio_to_add:
             self.entity_buffer[entity.id] = entity
             self.priority_entities.add(entity.id)
-            self.layer.world.get_chunk(entity.p_chunk[0], entity.p_chunk[1]).add_entity(entity)
+            entity.save_state()
+            if self.chunked:
+                self.layer.world.get_chunk(entity.p_chunk[0], entity.p_chunk[1]).add_entity(entity)
+            if self.transforms:
+                self.transforms.add(entity)
         for entity in self.to_add:
             self.entity_buffer[entity.id] = entity
             self.entities.add(entity.id)
-            self.layer.world.get_chunk(entity.p_chunk[0], entity.p_chunk[1]).add_entity(entity)
+            entity.save_state()
+            entity.activity = gentity.EntityTypes.get_activity(entity)
+            if self.chunked:
+                self.layer.world.get_chunk(entity.p_chunk[0], entity.p_chunk[1]).add_entity(entity)
+            if self.transforms:
+                self.transforms.add(entity)
         for eid in self.to_remove:
             entity = self.entity_buffer[eid]
             self.entity_buffer[eid] = None
@@ -86,7 +214,10 @@ class Handler:
                 self.priority_entities.remove(eid)
             else:
                 self.entities.remove(eid)
-            self.layer.world.get_chunk(entity.p_chunk[0], entity.p_chunk[1]).remove_entity(entity)
+            if self.chunked:
+                self.layer.world.remove_from_chunk(entity)
+            if self.transforms:
+                self.transforms.remove(entity)
         self.to_add.clear()
         self.prio_to_add.clear()
         self.to_remove.clear()
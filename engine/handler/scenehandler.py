@@ -1,5 +1,8 @@
 import pygame
 from ..gamesystem import layer
+from ..misc import clock, profiler
+from ..graphics import preload, animation
+from .filehandler import AssetHandle, AssetRefs
 from . import statehandler
 
 from queue import deque
@@ -21,18 +24,24 @@ class SceneHandler:
         """Push a new scene onto the queue"""
         SceneHandler.QUEUE.append(scene)
         SceneHandler.CURRENT = scene
+        AssetRefs.set_owner(scene)
 
     @staticmethod
     def pop_state():
-        """Pop the last state off the queue"""
-        SceneHandler.QUEUE.pop()
+        """Pop the last state off the queue - its assets are released"""
+        scene = SceneHandler.QUEUE.pop()
         SceneHandler.CURRENT = None
         if SceneHandler.QUEUE:
             SceneHandler.CURRENT = SceneHandler.QUEUE[-1]
+        AssetRefs.set_owner(SceneHandler.CURRENT)
+        scene.clean()
+        return scene
 
     @staticmethod
     def clean():
         """Cleans all scenes from queue"""
+        SceneHandler.CURRENT = None
+        AssetRefs.set_owner(None)
         while SceneHandler.QUEUE:
             scene = SceneHandler.QUEUE.pop()
             scene.clean()
@@ -55,6 +64,14 @@ class SceneState(statehandler.State):
         for layer in self.scene.layers:
             layer.handle(surface)
 
+    def tick_scene(self):
+        for layer in self.scene.layers:
+            layer.tick()
+
+    def render_scene(self, surface):
+        for layer in self.scene.layers:
+            layer.render(surface)
+
 
 # -------------------------------------------------- #
 # scene class
@@ -70,9 +87,13 @@ class Scene:
         contains:
         - handler               = handler.Handler()
         - world                 = world.World()
+        - assets                = preload.AssetQueue (assets loading in the background)
+        - handles               = dict {(kind, key): AssetHandle} (assets the scene keeps loaded)
         """
         self.layers = []
         self.data = {}
+        self.assets = None
+        self.handles = {}
         self.state = statehandler.StateHandler(SceneState.NAME)
         self.state.add_state(SceneState(self))
 
@@ -89,6 +110,62 @@ class Scene:
     def get_layer(self, index):
         return self.layers[index]
 
+    def preload(self, images=(), categories=()):
+        """Start loading images + animation categories in the background"""
+        if not self.assets:
+            self.assets = preload.AssetQueue(owner=self)
+        for path in images:
+            self.assets.add_image(path)
+        for category in categories:
+            self.assets.add_category(category)
+        return self.assets
+
+    def get_load_progress(self):
+        """Get the loaded fraction of the queued assets [0, 1]"""
+        return self.assets.get_progress() if self.assets else 1.0
+
+    def is_loaded(self):
+        """Check if every queued asset is loaded"""
+        return not self.assets or self.assets.is_done()
+
+    def hold(self, kind: str, key):
+        """Keep an asset loaded for as long as the scene lives"""
+        if (kind, key) not in self.handles:
+            self.handles[(kind, key)] = AssetHandle(kind, key)
+
+    def clean(self):
+        """Release every asset of the scene - assets nothing else holds are unloaded"""
+        if self.assets:
+            self.assets.cancel()
+            self.assets = None
+        handles = list(self.handles.values())
+        self.handles.clear()
+        for handle in handles:
+            handle.release()
+
     def update(self, surface):
+        """Run the simulation ticks owed this frame + render once"""
+        self.simulate()
+        self.render(surface)
+
+    def simulate(self):
+        """Run the simulation ticks owed this frame"""
+        if self.assets and not self.assets.is_done():
+            self.assets.poll()
+        ticks = clock.consume_ticks()
+        clock.use_tick_delta()
+        for i in range(ticks):
+            self.tick()
+        clock.use_frame_delta()
+
+    def tick(self):
+        """Run one simulation tick"""
+        # animations updated last tick advance together
+        with profiler.scope("animations"):
+            animation.AnimationClock.step()
         # implement scene state handler
-        self.state.states[self.state.current_state].update_scene(surface)
+        self.state.states[self.state.current_state].tick_scene()
+
+    def render(self, surface):
+        """Render the scene"""
+        self.state.states[self.state.current_state].render_scene(surface)
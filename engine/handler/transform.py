@@ -0,0 +1,160 @@
+import numpy as np
+
+"""
+TransformStore holds entity transforms in contiguous arrays
+- position, motion, rect, rel_hitbox, chunk
+- entities keep their pygame objects, the store syncs them around batched passes
+"""
+
+
+# -------------------------------------------------- #
+# transform row
+
+class TransformRow:
+    """
+    A view of a single entity inside the TransformStore
+    - every attribute is a numpy view into the store arrays
+    """
+
+    def __init__(self, store, slot: int):
+        """
+        Constructor for TransformRow
+        contains:
+        - store             = TransformStore
+        - slot              = int
+        """
+        self.store = store
+        self.slot = slot
+
+    @property
+    def position(self):
+        return self.store.position[self.slot]
+
+    @property
+    def motion(self):
+        return self.store.motion[self.slot]
+
+    @property
+    def rect(self):
+        return self.store.rect[self.slot]
+
+    @property
+    def rel_hitbox(self):
+        return self.store.rel_hitbox[self.slot]
+
+    @property
+    def chunk(self):
+        return self.store.chunk[self.slot]
+
+
+# -------------------------------------------------- #
+# transform store
+
+class TransformStore:
+    """
+    Struct of arrays for entity transforms
+    - owned by a Handler
+    """
+    DEFAULT_CAPACITY = 64
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """
+        Constructor for TransformStore
+        contains:
+        - capacity          = int
+        - position          = np.ndarray [n, 2] float
+        - motion            = np.ndarray [n, 2] float
+        - rect              = np.ndarray [n, 4] int (x, y, w, h)
+        - rel_hitbox        = np.ndarray [n, 4] int (x, y, w, h)
+        - chunk             = np.ndarray [n, 2] int
+        - p_chunk           = np.ndarray [n, 2] int
+        - alive             = np.ndarray [n] bool
+        - moving            = np.ndarray [n] bool (queued for the next batched move)
+        - slots             = dict {eid: int}
+        - entities          = list [Entity]
+        """
+        self.capacity = 0
+        self.position = np.zeros((0, 2), dtype=np.float64)
+        self.motion = np.zeros((0, 2), dtype=np.float64)
+        self.rect = np.zeros((0, 4), dtype=np.int32)
+        self.rel_hitbox = np.zeros((0, 4), dtype=np.int32)
+        self.chunk = np.zeros((0, 2), dtype=np.int32)
+        self.p_chunk = np.zeros((0, 2), dtype=np.int32)
+        self.alive = np.zeros(0, dtype=bool)
+        self.moving = np.zeros(0, dtype=bool)
+        self.slots = {}
+        self.entities = []
+        self.free = []
+        self.grow(capacity)
+
+    # -------------------------------------------------- #
+    # storage
+
+    def grow(self, capacity: int):
+        """Grow the arrays to hold at least <capacity> entities"""
+        if capacity <= self.capacity:
+            return
+        extra = capacity - self.capacity
+        self.position = np.concatenate((self.position, np.zeros((extra, 2), dtype=np.float64)))
+        self.motion = np.concatenate((self.motion, np.zeros((extra, 2), dtype=np.float64)))
+        self.rect = np.concatenate((self.rect, np.zeros((extra, 4), dtype=np.int32)))
+        self.rel_hitbox = np.concatenate((self.rel_hitbox, np.zeros((extra, 4), dtype=np.int32)))
+        self.chunk = np.concatenate((self.chunk, np.zeros((extra, 2), dtype=np.int32)))
+        self.p_chunk = np.concatenate((self.p_chunk, np.zeros((extra, 2), dtype=np.int32)))
+        self.alive = np.concatenate((self.alive, np.zeros(extra, dtype=bool)))
+        self.moving = np.concatenate((self.moving, np.zeros(extra, dtype=bool)))
+        self.entities.extend([None] * extra)
+        # hand out the lowest slots first
+        self.free.extend(range(capacity - 1, self.capacity - 1, -1))
+        self.capacity = capacity
+
+    def add(self, entity):
+        """Register an entity + give it a transform row"""
+        if entity.id in self.slots:
+            return
+        if not self.free:
+            self.grow(max(self.capacity * 2, TransformStore.DEFAULT_CAPACITY))
+        slot = self.free.pop()
+        self.slots[entity.id] = slot
+        self.entities[slot] = entity
+        self.alive[slot] = True
+        self.moving[slot] = False
+        self.pull(entity, slot)
+        entity.transform = TransformRow(self, slot)
+
+    def remove(self, entity):
+        """Unregister an entity"""
+        slot = self.slots.pop(entity.id, None)
+        if slot is None:
+            return
+        self.entities[slot] = None
+        self.alive[slot] = False
+        self.moving[slot] = False
+        self.free.append(slot)
+        entity.transform = None
+
+    def has(self, entity):
+        """Check if an entity is stored"""
+        return entity.id in self.slots
+
+    # -------------------------------------------------- #
+    # syncing
+
+    def pull(self, entity, slot: int):
+        """Copy an entities pygame objects into the arrays"""
+        self.position[slot] = (entity.position.x, entity.position.y)
+        self.motion[slot] = (entity.motion.x, entity.motion.y)
+        self.rect[slot] = entity.rect
+        self.rel_hitbox[slot] = entity.rel_hitbox
+        self.chunk[slot] = entity.chunk
+        self.p_chunk[slot] = entity.p_chunk
+
+    def queue_move(self, entity):
+        """Queue an entity to be moved in the next batched move"""
+        slot = self.slots[entity.id]
+        self.pull(entity, slot)
+        self.moving[slot] = True
+
+    def get_moving(self):
+        """Get the slots that are queued for a move"""
+        return np.flatnonzero(self.moving)
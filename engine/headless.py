@@ -0,0 +1,72 @@
+import os
+import pygame
+
+from . import singleton as EGLOB
+from .window import Window
+from .misc import clock
+from .handler import scenehandler
+from .handler.eventhandler import Eventhandler
+
+"""
+Headless mode - run the engine without a window
+- SDL dummy video + audio drivers, surfaces are never converted to the display format
+- run() drives the current scene with a simulated fixed dt as fast as possible, or in real time
+- used by tests/servermain.py and the benchmarks
+"""
+
+
+# -------------------------------------------------- #
+# setup
+
+def enable():
+    """Switch the engine to headless mode - call before creating the window / loading images"""
+    EGLOB.HEADLESS = True
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    if pygame.display.get_init() and pygame.display.get_driver() != "dummy":
+        pygame.display.quit()
+    pygame.display.init()
+
+
+# -------------------------------------------------- #
+# loop
+
+def run_frame(dt: float = None, surface=None):
+    """
+    Step the clock + tick the current scene (+ render it if a surface is given)
+    - dt = None --> wall time since the last frame, capped at clock.FPS
+    """
+    if dt is None:
+        clock.update()
+    else:
+        clock.step(dt)
+    scene = scenehandler.SceneHandler.CURRENT
+    if scene:
+        if surface:
+            if "bg_color" in scene.data:
+                surface.fill(scene.data["bg_color"])
+            scene.update(surface)
+        else:
+            scene.simulate()
+    Eventhandler.update()
+
+
+def run(frames: int = 0, fps: int = 60, surface=None, callback=None, realtime: bool = False):
+    """
+    Run the current scene for <frames> frames (0 = until Window.running is False)
+    - realtime = False  --> uncapped, every frame advances the clock by 1/fps seconds regardless of wall time
+    - realtime = True   --> frames are capped at <fps> and advance the clock by the measured wall time
+    - callback(frame) is called after every frame
+    """
+    dt = None if realtime else 1 / fps
+    if realtime:
+        clock.start(fps, clock.TICK_RATE)
+    frame = 0
+    Window.running = True
+    while Window.running and (not frames or frame < frames):
+        run_frame(dt, surface)
+        pygame.event.pump()
+        if callback:
+            callback(frame)
+        frame += 1
+    return frame
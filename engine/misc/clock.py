@@ -14,13 +14,28 @@ run_time: float = 0
 engine_start_time: float = time.time()
 engine_uptime: float = 0
 
+# fixed timestep simulation
+# TICK_RATE = 0 --> one tick per rendered frame using the frame delta
+TICK_RATE: float = 0
+MAX_FRAME_TICKS: int = 5
+tick_time: float = 0
+frame_delta: float = 0
+accumulator: float = 0
+alpha: float = 1.0
 
-def start(fps=30):
-    """Start clock"""
-    global delta_time, start_time, end_time, frame_time, FPS
+
+def start(fps=30, tick_rate=0):
+    """Start clock - tick_rate = fixed simulation ticks per second (0 = tick once per frame)"""
+    global delta_time, start_time, end_time, frame_time, FPS, TICK_RATE, tick_time, frame_delta, accumulator, alpha
     FPS = fps
-    frame_time = 1/fps
+    # fps = 0 --> uncapped
+    frame_time = 1/fps if fps else 0
     delta_time = 0
+    TICK_RATE = tick_rate
+    tick_time = 1/tick_rate if tick_rate else 0
+    frame_delta = 0
+    accumulator = 0
+    alpha = 1.0
     start_time = time.time()
     end_time = start_time
     print(f"[Engine Initialization Time] Finished in {get_engine_uptime():.2f}s!")
@@ -28,12 +43,54 @@ def start(fps=30):
 
 def update():
     """Update clock and delta time"""
-    global delta_time, start_time, end_time, frame_time, run_time, FPS, PG_CLOCK
+    global delta_time, start_time, end_time, frame_time, run_time, FPS, PG_CLOCK, frame_delta, accumulator
     PG_CLOCK.tick(FPS)
     end_time = time.time()
-    delta_time = end_time - start_time
+    frame_delta = end_time - start_time
+    delta_time = frame_delta
     start_time = time.time()
-    run_time += delta_time
+    run_time += frame_delta
+    if TICK_RATE:
+        accumulator += frame_delta
+
+
+def step(dt: float):
+    """Advance the clock by a fixed dt instead of wall time - used by headless simulations"""
+    global delta_time, frame_delta, run_time, accumulator
+    frame_delta = dt
+    delta_time = dt
+    run_time += dt
+    if TICK_RATE:
+        accumulator += dt
+
+
+def consume_ticks() -> int:
+    """Get the amount of simulation ticks to run this frame + update the render alpha"""
+    global accumulator, alpha
+    if not TICK_RATE:
+        alpha = 1.0
+        return 1
+    ticks = int(accumulator / tick_time)
+    if ticks > MAX_FRAME_TICKS:
+        # too far behind -- drop the backlog instead of spiralling
+        ticks = MAX_FRAME_TICKS
+        accumulator = 0
+    else:
+        accumulator -= ticks * tick_time
+    alpha = accumulator / tick_time
+    return ticks
+
+
+def use_tick_delta():
+    """Set delta_time for simulation ticks"""
+    global delta_time
+    delta_time = tick_time if TICK_RATE else frame_delta
+
+
+def use_frame_delta():
+    """Set delta_time for rendering"""
+    global delta_time
+    delta_time = frame_delta
 
 
 def get_engine_uptime() -> float:
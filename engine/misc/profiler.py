@@ -0,0 +1,234 @@
+import time
+import numpy as np
+import pygame
+
+from ..graphics import surfcache
+from ..handler.filehandler import AssetRefs
+
+"""
+Frame profiler
+- scoped stage timers + per entity type update / render timers
+- every value is pushed into a ring buffer once per frame -> rolling mean / p95 / max
+- toggled at runtime (Shift+P in main.py), every entry point returns right away while disabled
+- the overlay also lists the derived surface caches (hit rate, memory, evictions)
+  + the largest resident assets while SHOW_ASSETS is on (Shift+M in main.py)
+"""
+
+ENABLED: bool = False
+HISTORY_SIZE: int = 240
+# entity types shown in the overlay
+OVERLAY_TYPES: int = 5
+# largest assets shown in the overlay
+OVERLAY_ASSETS: int = 10
+SHOW_ASSETS: bool = False
+OVERLAY_COLOR = (255, 255, 255)
+OVERLAY_BACKGROUND = (0, 0, 0, 160)
+
+UPDATE = 0
+RENDER = 1
+KIND_NAMES = ("update", "render")
+
+now = time.perf_counter
+
+frame_start: float = 0
+# time spent this frame {name: seconds}
+current = {}
+# rolling history {name: RingBuffer}
+stages = {}
+# {(type name, kind): seconds} + {(type name, kind): RingBuffer}
+entity_current = {}
+entity_types = {}
+scopes = {}
+font = None
+
+
+# -------------------------------------------------- #
+# ring buffer
+
+class RingBuffer:
+    """
+    Fixed size float history
+    """
+
+    def __init__(self, size: int = None):
+        """
+        Constructor for RingBuffer
+        contains:
+        - data              = np.ndarray [size] float
+        - index             = int (next write)
+        - count             = int
+        """
+        self.data = np.zeros(size or HISTORY_SIZE, dtype=np.float64)
+        self.index = 0
+        self.count = 0
+
+    def push(self, value: float):
+        """Add a value - overwrites the oldest one when full"""
+        self.data[self.index] = value
+        self.index = (self.index + 1) % len(self.data)
+        self.count = min(self.count + 1, len(self.data))
+
+    def get_values(self):
+        """Get the stored values, oldest first"""
+        if self.count < len(self.data):
+            return self.data[:self.count]
+        return np.roll(self.data, -self.index)
+
+    def get_stats(self):
+        """Get the mean / p95 / max in milliseconds"""
+        if not self.count:
+            return 0.0, 0.0, 0.0
+        values = self.data[:self.count] * 1000
+        return float(values.mean()), float(np.percentile(values, 95)), float(values.max())
+
+
+# -------------------------------------------------- #
+# scoped timer
+
+class Scope:
+    """
+    Reusable context manager timing a named stage
+    """
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        if ENABLED:
+            self.start = now()
+        return self
+
+    def __exit__(self, *args):
+        if ENABLED and self.start:
+            current[self.name] = current.get(self.name, 0.0) + now() - self.start
+        self.start = 0
+
+
+def scope(name: str):
+    """Get the timer for a stage - with profiler.scope("name"): ..."""
+    if name not in scopes:
+        scopes[name] = Scope(name)
+    return scopes[name]
+
+
+def add(name: str, seconds: float):
+    """Add time to a stage"""
+    current[name] = current.get(name, 0.0) + seconds
+
+
+def add_entity_time(entity, kind: int, seconds: float):
+    """Add update / render time to the type of an entity"""
+    key = (entity.__class__.__name__, kind)
+    entity_current[key] = entity_current.get(key, 0.0) + seconds
+
+
+# -------------------------------------------------- #
+# frames
+
+def begin_frame():
+    """Start timing a frame"""
+    global frame_start
+    if ENABLED:
+        frame_start = now()
+
+
+def end_frame():
+    """Push everything timed this frame into the histories"""
+    if not ENABLED:
+        return
+    if frame_start:
+        current["frame"] = now() - frame_start
+    for name, value in current.items():
+        if name not in stages:
+            stages[name] = RingBuffer()
+        stages[name].push(value)
+        current[name] = 0.0
+    for key, value in entity_current.items():
+        if key not in entity_types:
+            entity_types[key] = RingBuffer()
+        entity_types[key].push(value)
+        entity_current[key] = 0.0
+
+
+def set_enabled(enabled: bool):
+    """Turn the profiler on / off - turning it on starts with empty histories"""
+    global ENABLED, frame_start
+    if enabled and not ENABLED:
+        clear()
+    ENABLED = enabled
+    frame_start = 0
+
+
+def toggle():
+    """Flip the profiler on / off"""
+    set_enabled(not ENABLED)
+
+
+def toggle_assets():
+    """Flip the asset memory rows of the overlay on / off - showing them turns the profiler on"""
+    global SHOW_ASSETS
+    SHOW_ASSETS = not SHOW_ASSETS
+    if SHOW_ASSETS:
+        set_enabled(True)
+
+
+def clear():
+    """Drop all histories"""
+    current.clear()
+    stages.clear()
+    entity_current.clear()
+    entity_types.clear()
+
+
+def get_stats():
+    """Get {stage: (mean, p95, max)} + {(type, kind): (mean, p95, max)} in milliseconds"""
+    return ({name: ring.get_stats() for name, ring in stages.items()},
+            {key: ring.get_stats() for key, ring in entity_types.items()})
+
+
+def get_cache_stats():
+    """Get {cache name: {"surfaces", "bytes", "budget", "hits", "misses", "evictions"}}"""
+    return {name: cache.get_stats() for name, cache in surfcache.SurfaceCache.CACHES.items()}
+
+
+# -------------------------------------------------- #
+# overlay
+
+def render_overlay(surface, pos=(2, 2)):
+    """Draw the rolling stage + entity type timings onto a surface"""
+    global font
+    if not ENABLED:
+        return
+    if not font:
+        font = pygame.font.Font(None, 12)
+    stage_stats, type_stats = get_stats()
+    rows = [("ms", "mean", "p95", "max")]
+    rows += [(name, f"{m:.2f}", f"{p:.2f}", f"{x:.2f}") for name, (m, p, x) in sorted(stage_stats.items())]
+    worst = sorted(type_stats.items(), key=lambda item: -item[1][0])[:OVERLAY_TYPES]
+    rows += [(f"{t} {KIND_NAMES[k]}", f"{m:.2f}", f"{p:.2f}", f"{x:.2f}") for (t, k), (m, p, x) in worst]
+    rows.append(("cache", "hit %", "kb", "evict"))
+    for name, stats in sorted(get_cache_stats().items()):
+        lookups = stats["hits"] + stats["misses"]
+        rows.append((name, f"{100 * stats['hits'] / lookups if lookups else 0:.1f}", f"{stats['bytes'] // 1024}",
+                     str(stats["evictions"])))
+    if SHOW_ASSETS:
+        rows.append(("asset", "refs", "kb", "kind"))
+        rows += [(str(key)[-32:], str(refs), f"{size // 1024}", kind)
+                 for size, kind, key, refs in AssetRefs.get_memory_report()[:OVERLAY_ASSETS]]
+    # font is not monospaced -- lay out columns by their widest cell
+    renders = [[font.render(cell, False, OVERLAY_COLOR) for cell in row] for row in rows]
+    widths = [max(row[c].get_width() for row in renders) + 6 for c in range(len(rows[0]))]
+    height = font.get_linesize()
+    background = pygame.Surface((sum(widths) + 4, height * len(renders) + 4), pygame.SRCALPHA)
+    background.fill(OVERLAY_BACKGROUND)
+    surface.blit(background, pos)
+    blits = []
+    for i, row in enumerate(renders):
+        left = pos[0] + 2
+        for c, cell in enumerate(row):
+            # numbers are right aligned
+            blits.append((cell, (left + (widths[c] - 6 - cell.get_width() if c else 0), pos[1] + 2 + i * height)))
+            left += widths[c]
+    surface.blits(blits, doreturn=False)
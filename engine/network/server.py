@@ -46,6 +46,7 @@ class Server:
         # ----------------------------------- #
         # setup main thread
         self.main_thread = threading.Thread(target=main_thread, args=(self,), daemon=True)
+        self.main_thread.start()
 
         # ----------------------------------- # 
         # loop
@@ -1,7 +1,11 @@
+import os
+
 # ----------------------------------- #
 # game settings
 
 DEBUG = False
+# no window -- SDL dummy driver + no surface conversion (set ENGINE_HEADLESS=1 before importing engine)
+HEADLESS = bool(os.environ.get("ENGINE_HEADLESS"))
 DEBUG_COLOR = (255, 0, 0)
 
 # -------------------------------------------------- #
@@ -27,6 +31,13 @@ TILE_HEIGHT = 18
 CHUNK_PIX_WIDTH = TILE_WIDTH * TILEMAP_WIDTH
 CHUNK_PIX_HEIGHT = TILE_HEIGHT * TILEMAP_HEIGHT
 
+# max loaded chunks per world before least recently used chunks are unloaded
+CHUNK_BUDGET = 512
+# chunks freed past the budget per eviction pass -- headroom so the next new chunks do not trigger another pass
+CHUNK_EVICT_HEADROOM = 32
+# ticks to wait before scanning again when every chunk over the budget is still in use
+CHUNK_EVICT_RETRY = 60
+
 
 # -------------------------------------------------- #
 # camera
@@ -34,12 +45,48 @@ WORLD_OFFSET_X = 0
 WORLD_OFFSET_Y = 0
 
 RENDER_DIS = [0, 0]
+# entities whose hitbox is this many pixels outside the viewport are not rendered
+CULL_MARGIN = 32
+
+# -------------------------------------------------- #
+# handler
+# store entity transforms in contiguous arrays + move entities in one batched pass
+TRANSFORM_STORE = False
+
+# activity tiers -- chunk distance from the camera
+ACTIVITY_FULL_DIS = 3
+ACTIVITY_REDUCED_DIS = 6
+ACTIVITY_REDUCED_RATE = 4
 
 # -------------------------------------------------- #
 # animation
 HORIZONTAL_HITBOX_COL = (255, 0, 0)
 VERTICAL_HITBOX_COL = (0, 0, 255)
 
+# compiled animations (frame data + hitboxes + points + cleaned sheet) -- rebuilt when the json / png change
+ANIMATION_CACHE = True
+ANIMATION_CACHE_DIR = ".cache/animations"
+
+# images are loaded through uncompressed, memory mapped copies in the display pixel format
+RAW_IMAGES = True
+RAW_IMAGE_DIR = ".cache/images"
+
+# sprite atlas (built with buildatlas.py) -- categories use it when it holds their current frames
+ATLAS = True
+ATLAS_DIR = ".cache/atlas"
+ATLAS_PAGE_SIZE = 1024
+
+# rotated frames are built when first drawn + kept in a shared LRU cache of this many bytes
+ROTATION_CACHE_BYTES = 16 * 1024 * 1024
+# scaled / rotated / flipped images made by the Filehandler -- same kind of cache
+IMAGE_CACHE_BYTES = 16 * 1024 * 1024
+
+# background asset loading -- worker count + use processes instead of threads
+LOADER_WORKERS = 2
+LOADER_PROCESSES = False
+# seconds per frame spent finishing loaded assets on the main thread
+LOADER_FRAME_BUDGET = 0.004
+
 
 # -------------------------------------------------- #
 # particles
@@ -18,9 +18,12 @@ class Window:
 
     @classmethod
     def create_window(cls, title: str, width: int, height: int, flags: int, bits: int):
-        """Create a window with the given information"""
-        cls.instance = pygame.display.set_mode((width, height), flags, bits)
-        pygame.display.set_caption(title)
+        """Create a window with the given information - a plain surface when headless"""
+        if EGLOB.HEADLESS:
+            cls.instance = pygame.Surface((width, height))
+        else:
+            cls.instance = pygame.display.set_mode((width, height), flags, bits)
+            pygame.display.set_caption(title)
         cls.running = True
         cls.TITLE = title
         cls.WIDTH = width
@@ -34,7 +37,8 @@ class Window:
     @classmethod
     def set_icon(cls, surface):
         """Set the icon surface"""
-        pygame.display.set_icon(surface)
+        if not EGLOB.HEADLESS:
+            pygame.display.set_icon(surface)
     
     @classmethod
     def handle_resize(cls, resize_event):
@@ -49,7 +53,14 @@ class Window:
         EGLOB.FB_HEIGHT = height
         EGLOB.FBWHALF = width//2
         EGLOB.FBHHALF = height//2
-        return pygame.Surface((width, height), flags=flags, depth=bits).convert_alpha()
+        result = pygame.Surface((width, height), flags=flags, depth=bits)
+        return result if EGLOB.HEADLESS else result.convert_alpha()
+
+    @classmethod
+    def update(cls):
+        """Push the window to the screen"""
+        if not EGLOB.HEADLESS:
+            pygame.display.update()
 
 
 
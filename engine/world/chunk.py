@@ -3,6 +3,20 @@ import pygame
 from .. singleton import *
 
 
+# -------------------------------------------------- #
+# chunk keys
+
+def pack_key(x: int, y: int) -> int:
+    """Pack chunk coordinates into one int key - coords must be within [-32768, 32767]"""
+    return (x << 16) | (y & 0xFFFF)
+
+
+def unpack_key(key: int) -> tuple:
+    """Unpack an int key into chunk coordinates"""
+    y = key & 0xFFFF
+    return key >> 16, y - 0x10000 if y & 0x8000 else y
+
+
 class Chunk:
     def __init__(self, x, y, world):
         """
@@ -13,7 +27,7 @@ class Chunk:
         - world_rel_pos     = [float, float]
         - tilemap           = [Tile...etc]
         - environment       = [static_entity...etc]
-        - id                = str
+        - id                = int (see pack_key)
 
         Tiles can be updated externally via custom-made entities
         - some premade entities include AnimatedTiles etc
@@ -21,7 +35,7 @@ class Chunk:
         Tiles can be modified by getting then changing specific params
         - new tiles cannot be set
         """
-        self.id = f"{x}-{y}"
+        self.id = pack_key(x, y)
         self.world_chunk_tile = (x,y)
         self.world_rel_pos = (x * TILE_WIDTH * TILEMAP_WIDTH, y * TILE_HEIGHT * TILEMAP_HEIGHT)
         self.area_rect = pygame.Rect(self.world_rel_pos, (TILE_WIDTH * TILEMAP_WIDTH, TILE_HEIGHT * TILEMAP_HEIGHT))
@@ -30,26 +44,45 @@ class Chunk:
         self.env = set()
         self.entities = set()
         self.world = world
+        # residency tick this chunk was last used
+        self.last_used = 0
 
     def handle(self, surface):
         """Handle all objects within the chunk"""
-        # update entities in the chunk
+        self.update()
+        self.render(surface)
+
+    def debug_handle(self, surface):
+        """Debug handle all objects within the chunk"""
+        self.update()
+        self.debug_render(surface)
+
+    def update(self):
+        """Update all objects within the chunk"""
+        buffer = self.world.env.entity_buffer
+        for e in self.env:
+            # objects are buffered until the env handler adds them
+            if buffer.get(e) is not None:
+                buffer[e].update()
+
+    def render(self, surface):
+        """Render all objects within the chunk"""
+        buffer = self.world.env.entity_buffer
         for e in self.env:
-            self.world.env.entity_buffer[e].update()
             # check if entities are to be removed
-            if e not in self.world.env.to_remove:
-                self.world.env.entity_buffer[e].render(surface)
+            if buffer.get(e) is not None and e not in self.world.env.to_remove:
+                buffer[e].render(surface)
         # that is all :)
 
-    def debug_handle(self, surface):
-        """Debug handle all objects within the chunk"""
-        # update entities
+    def debug_render(self, surface):
+        """Debug render all objects within the chunk"""
+        buffer = self.world.env.entity_buffer
         for e in self.env:
-            self.world.env.entity_buffer[e].update()
             # check if entiites are to be removed
-            if e not in self.world.env.to_remove:
-                self.world.env.entity_buffer[e].render(surface)
-                self.world.env.entity_buffer[e].debug(surface)
+            if buffer.get(e) is not None and e not in self.world.env.to_remove:
+                buffer[e].render(surface)
+                self.world.layer.render_queue.flush(surface)
+                buffer[e].debug(surface)
 
     def add_env_obj(self, obj):
         """Environment object"""
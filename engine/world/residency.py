@@ -0,0 +1,70 @@
+import heapq
+
+from .. import singleton
+
+"""
+ChunkResidency keeps the world chunk count under a budget
+- chunks are stamped with the tick they were last used
+- least recently used chunks are unloaded first
+- chunks holding environment objects stay resident, nothing rebuilds them once unloaded
+"""
+
+
+class ChunkResidency:
+    """
+    Unloads empty, distant chunks once a world holds more than <budget> chunks
+    - chunks holding entities, environment objects or inside the render distance are never unloaded
+    """
+
+    def __init__(self, world, budget: int = None):
+        """
+        Constructor for ChunkResidency
+        contains:
+        - world             = World
+        - budget            = int (max resident chunks)
+        - tick              = int
+        - next_evict        = int (tick the next eviction pass may run)
+        - created           = int
+        - evicted           = int
+        """
+        self.world = world
+        self.budget = singleton.CHUNK_BUDGET if budget is None else budget
+        self.tick = 0
+        self.next_evict = 0
+        self.created = 0
+        self.evicted = 0
+
+    def get_resident(self):
+        """Get the amount of loaded chunks"""
+        return len(self.world.chunks)
+
+    def get_stats(self):
+        """Get the residency counters"""
+        return {"resident": len(self.world.chunks), "created": self.created, "evicted": self.evicted}
+
+    def update(self):
+        """Advance the tick + unload chunks if over budget"""
+        self.tick += 1
+        over = len(self.world.chunks) - self.budget
+        if over > 0 and self.tick >= self.next_evict:
+            if self.evict(over + singleton.CHUNK_EVICT_HEADROOM) < over:
+                # the rest are in use -- do not rescan every tick
+                self.next_evict = self.tick + singleton.CHUNK_EVICT_RETRY
+
+    def can_evict(self, c, camchunk, keep_dis: int):
+        """Check if a chunk can be unloaded"""
+        if c.entities or c.env:
+            return False
+        return max(abs(c.world_chunk_tile[0] - camchunk[0]), abs(c.world_chunk_tile[1] - camchunk[1])) > keep_dis
+
+    def evict(self, count: int):
+        """Unload up to <count> least recently used chunks - returns the amount unloaded"""
+        camchunk = self.world.layer.camera.chunkpos
+        keep_dis = max(singleton.RENDER_DIS) + 1
+        candidates = heapq.nsmallest(count, (c for c in self.world.chunks.values()
+                                             if self.can_evict(c, camchunk, keep_dis)),
+                                     key=lambda c: c.last_used)
+        for c in candidates:
+            self.world.unload_chunk(c)
+        self.evicted += len(candidates)
+        return len(candidates)
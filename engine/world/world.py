@@ -1,6 +1,8 @@
 import pygame
+import numpy as np
+
 from .. import singleton
-from . import chunk
+from . import chunk, residency
 from ..handler import handler
 
 
@@ -16,15 +18,20 @@ class World:
         """
         Constructor for World
         contains:
-        - chunks        = dict [str, list]
+        - chunks        = dict [int, Chunk] (keys from chunk.pack_key)
+        - residency     = ChunkResidency
+
+        chunks double as a spatial hash for entities
+        - entities are binned by the chunk of their position (top left)
         """
         self.layer = layer
         self.scene = layer.scene
         self.chunks = {}
+        self.residency = residency.ChunkResidency(self)
 
         # -------------------------------------------------- #
         # environment objects
-        self.env = handler.Handler(self.layer)
+        self.env = handler.Handler(self.layer, transforms=False, chunked=False)
 
     def add_chunk(self, chunk):
         """Adds a chunk to the world"""
@@ -32,42 +39,80 @@ class World:
         chunk.world = self
 
     def get_chunk(self, x: int, y: int):
-        """Get a chunk"""
-        key = f"{x}-{y}"
-        if key not in self.chunks:
-            self.chunks[key] = chunk.Chunk(x, y, self)
-        return self.chunks[key]
+        """Get a chunk - creates it if it does not exist"""
+        # same as chunk.pack_key -- inlined, this is called a lot
+        key = (x << 16) | (y & 0xFFFF)
+        c = self.chunks.get(key)
+        if c is None:
+            c = self.chunks[key] = chunk.Chunk(x, y, self)
+            self.residency.created += 1
+        c.last_used = self.residency.tick
+        return c
+
+    def peek_chunk(self, x: int, y: int):
+        """Get a chunk if it exists - never creates chunks"""
+        return self.chunks.get((x << 16) | (y & 0xFFFF))
+
+    def unload_chunk(self, c):
+        """Unload a chunk - the chunk should hold no entities or environment objects"""
+        self.chunks.pop(c.id, None)
 
     def handle_chunks(self, surface, render_dis: list = (0, 0)):
         """Handles rendering of chunks"""
-        # update entiyt handler
-        self.env.handle_changes()
-        # update chunks and entities
+        self.tick_chunks(render_dis)
+        self.render_chunks(surface, render_dis)
+
+    def debug_handle_chunks(self, surface, render_dis: list = (0, 0)):
+        """Debug Handles Rendering of Chunks"""
+        self.tick_chunks(render_dis)
+        self.debug_render_chunks(surface, render_dis)
+
+    def get_visible_chunks(self, render_dis: list = (0, 0)):
+        """Get loaded chunks within render distance that intersect the camera - is an iterable"""
         for ix in range(self.layer.camera.chunkpos[0] - render_dis[0],
                         self.layer.camera.chunkpos[0] + render_dis[0] + 1):
             for iy in range(self.layer.camera.chunkpos[1] - render_dis[1],
                             self.layer.camera.chunkpos[1] + render_dis[1] + 1):
                 # print(ix, iy)
-                c = self.get_chunk(ix, iy)
-                if not self.layer.camera.viewport.colliderect(c.area_rect):
+                c = self.peek_chunk(ix, iy)
+                if c is None or not self.layer.camera.viewport.colliderect(c.area_rect):
                     continue
-                # update chunk
-                c.handle(surface)
+                c.last_used = self.residency.tick
+                yield c
 
-    def debug_handle_chunks(self, surface, render_dis: list = (0, 0)):
-        """Debug Handles Rendering of Chunks"""
-        self.handle_chunks(surface, render_dis)
+    def tick_chunks(self, render_dis: list = (0, 0)):
+        """Update chunks - one simulation tick"""
+        # update entiyt handler
+        self.env.handle_changes()
+        self.residency.update()
+        # update chunks and entities
+        for c in self.get_visible_chunks(render_dis):
+            c.update()
+
+    def render_chunks(self, surface, render_dis: list = (0, 0)):
+        """Render chunks"""
+        for c in self.get_visible_chunks(render_dis):
+            c.render(surface)
+
+    def debug_render_chunks(self, surface, render_dis: list = (0, 0)):
+        """Debug Render Chunks"""
+        self.render_chunks(surface, render_dis)
         for ix in range(self.layer.camera.chunkpos[0] - render_dis[0],
                         self.layer.camera.chunkpos[0] + render_dis[0] + 1):
             for iy in range(self.layer.camera.chunkpos[1] - render_dis[1],
                             self.layer.camera.chunkpos[1] + render_dis[1] + 1):
-                c = self.get_chunk(ix, iy)
-                rect = pygame.Rect(c.area_rect.x + singleton.WORLD_OFFSET_X, c.area_rect.y + singleton.WORLD_OFFSET_Y,
-                                   c.area_rect.w, c.area_rect.h)
+                rect = pygame.Rect(ix * singleton.CHUNK_PIX_WIDTH + singleton.WORLD_OFFSET_X,
+                                   iy * singleton.CHUNK_PIX_HEIGHT + singleton.WORLD_OFFSET_Y,
+                                   singleton.CHUNK_PIX_WIDTH, singleton.CHUNK_PIX_HEIGHT)
                 pygame.draw.rect(surface, singleton.DEBUG_COLOR, rect, 1)
 
     def move_entity(self, entity):
         """Move an entity through the chunk"""
+        # batched -- handled in move_entities
+        store = self.layer.handler.transforms
+        if store and store.has(entity):
+            store.queue_move(entity)
+            return
         # find range of intercepting tiles
         intercept = pygame.Rect((entity.rect.x // singleton.TILE_WIDTH - 1, entity.rect.y // singleton.TILE_HEIGHT - 1),
                                 entity.tiles_area)
@@ -82,20 +127,99 @@ class World:
         entity.chunk = [int(entity.position.x) // singleton.CHUNK_PIX_WIDTH,
                         int(entity.position.y) // singleton.CHUNK_PIX_HEIGHT]
         if entity.chunk != entity.p_chunk:
-            self.get_chunk(entity.p_chunk[0], entity.p_chunk[1]).remove_entity(entity)
+            self.remove_from_chunk(entity)
             entity.p_chunk = entity.chunk
             self.get_chunk(entity.chunk[0], entity.chunk[1]).add_entity(entity)
         # print(entity.name, entity.chunk)
 
+    def move_entities(self):
+        """
+        Move all queued entities in the handler TransformStore in one pass
+        - rect, rel_hitbox + the camera are brought up to date here -> entity code ran before the move
+        """
+        store = self.layer.handler.transforms
+        slots = store.get_moving()
+        store.moving[slots] = False
+        if not len(slots):
+            return
+        # integrate motion
+        position = store.position[slots] + store.motion[slots]
+        store.position[slots] = position
+        # same as int(x) // CHUNK_PIX_WIDTH
+        chunk = np.trunc(position).astype(np.int32) // (singleton.CHUNK_PIX_WIDTH, singleton.CHUNK_PIX_HEIGHT)
+        store.chunk[slots] = chunk
+        store.rect[slots, :2] = np.round(position)
+        changed = np.any(chunk != store.p_chunk[slots], axis=1)
+        store.p_chunk[slots] = chunk
+        # write back to the entities
+        for slot, (px, py), (cx, cy), (rx, ry), moved in zip(slots.tolist(), position.tolist(), chunk.tolist(),
+                                                             store.rect[slots, :2].tolist(), changed.tolist()):
+            entity = store.entities[slot]
+            entity.position.update(px, py)
+            entity.rect.x = rx
+            entity.rect.y = ry
+            entity.chunk = [cx, cy]
+            # not calculate_rel_hitbox -- that also rewrites the chunk bookkeeping
+            entity.rel_hitbox.topleft = (rx + entity.hitbox.x, ry + entity.hitbox.y)
+            store.rel_hitbox[slot] = entity.rel_hitbox
+            if moved:
+                self.remove_from_chunk(entity)
+                entity.p_chunk = entity.chunk
+                self.get_chunk(cx, cy).add_entity(entity)
+        # the camera followed its target before the target was moved
+        camera = self.layer.camera
+        if camera.target is not None and store.has(camera.target):
+            camera.track_target()
+            camera.update()
+
+    def remove_from_chunk(self, entity):
+        """Remove an entity from the chunk at its p_chunk"""
+        c = self.peek_chunk(entity.p_chunk[0], entity.p_chunk[1])
+        if c is not None:
+            c.remove_entity(entity)
+
     def find_nearby_entities(self, cpos: tuple, crange: int):
         """Searches nearby chunks for entities - is an iterable"""
+        entities = self.layer.handler.entities
+        buffer = self.layer.handler.entity_buffer
         for ix in range(cpos[0] - crange, cpos[0] + crange + 1):
             for iy in range(cpos[1] - crange, cpos[1] + crange + 1):
-                c = self.get_chunk(ix, iy)
+                c = self.peek_chunk(ix, iy)
+                if c is None:
+                    continue
                 # find entities in chunk
                 for e in c.entities:
-                    if e in self.layer.handler.entities:
-                        yield self.layer.handler.entity_buffer[e]
+                    if e in entities:
+                        yield buffer[e]
+
+    def scan_area(self, left: int, top: int, right: int, bottom: int, include_priority: bool = False):
+        """Find entities binned in the chunks an area (right + bottom exclusive) can reach into - is an iterable"""
+        handler = self.layer.handler
+        entities, priority, buffer = handler.entities, handler.priority_entities, handler.entity_buffer
+        # entities are binned by their top left -- also check the chunk before
+        for ix in range(left // singleton.CHUNK_PIX_WIDTH - 1, (right - 1) // singleton.CHUNK_PIX_WIDTH + 1):
+            for iy in range(top // singleton.CHUNK_PIX_HEIGHT - 1, (bottom - 1) // singleton.CHUNK_PIX_HEIGHT + 1):
+                c = self.peek_chunk(ix, iy)
+                if c is None:
+                    continue
+                for e in c.entities:
+                    if e in entities or include_priority and e in priority:
+                        yield buffer[e]
+
+    def query_rect(self, rect, include_priority: bool = False):
+        """Find entities whose rel_hitbox intersects rect - include_priority = the player too - is an iterable"""
+        for entity in self.scan_area(rect.left, rect.top, rect.right, rect.bottom, include_priority):
+            if rect.colliderect(entity.rel_hitbox):
+                yield entity
+
+    def query_radius(self, center: tuple, radius: float):
+        """Find entities whose rel_hitbox center is within radius pixels of center - is an iterable"""
+        cx, cy = center
+        r2 = radius * radius
+        for entity in self.scan_area(int(cx - radius), int(cy - radius), int(cx + radius) + 1, int(cy + radius) + 1):
+            ex, ey = entity.rel_hitbox.center
+            if (ex - cx) * (ex - cx) + (ey - cy) * (ey - cy) <= r2:
+                yield entity
 
     def add_env_obj(self, obj):
         """Add an object to world"""
@@ -106,4 +230,7 @@ class World:
 
     def remove_env_obj(self, obj):
         """Remove env obj"""
-        self.env.remove_entity(obj)
+        self.env.remove_entity(obj.id)
+        c = self.peek_chunk(obj.chunk[0], obj.chunk[1])
+        if c is not None:
+            c.remove_env_obj(obj)
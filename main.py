@@ -3,10 +3,11 @@ import random
 
 from engine.handler import scenehandler
 from engine.handler.eventhandler import Eventhandler
-from engine.misc import clock, user_input, maths
+from engine.misc import clock, user_input, maths, profiler
 from engine.handler.filehandler import *
 
 from engine.gamesystem import particle
+from engine.graphics import animation
 from engine.window import Window
 
 from engine import singleton as EGLOB
@@ -20,10 +21,12 @@ WW = 1280//3
 FB_SIZE = [WW, int(WW/16*9)]
 
 FPS = 60
+# simulation ticks per second - 0 runs one tick per rendered frame
+TICK_RATE = 0
 
 Window.create_window(WINDOW_CAPTION, WINDOW_SIZE[0], WINDOW_SIZE[1], pygame.RESIZABLE | pygame.DOUBLEBUF , 16)
 # window.set_icon()
-fb = Window.create_framebuffer(FB_SIZE[0], FB_SIZE[1], flags=0, bits=32).convert_alpha()
+fb = Window.create_framebuffer(FB_SIZE[0], FB_SIZE[1], flags=0, bits=32)
 
 # print(singleton.FB_WIDTH)
 # -------- external imports --------- #
@@ -50,6 +53,11 @@ _WORLD = __layer.world
 
 __scene.add_data("bg_color", (153, 220, 80))
 
+# animations are loaded on first use -- load what this scene needs up front
+animation.AnimationManifest.preload(["player", "mage", "peasant", "grass"])
+# attacks show up later -- load them in the background
+__scene.preload(categories=["melee_swing", "fire"])
+
 
 ph = particle.ParticleHandler(None)
 ph.rect.topleft = (100, 100)
@@ -100,8 +108,10 @@ for x in range(left, right):
         GG.position.xy = (x * EGLOB.CHUNK_PIX_WIDTH, y * EGLOB.CHUNK_PIX_HEIGHT)
         GG.move_to_position()
         GG.calculate_rel_hitbox()
-        for i in range(grass_count):
-            GG.add_grass(random.randint(0, EGLOB.CHUNK_PIX_WIDTH-GG.assets.get_dimensions(0)[0]//3), random.randint(0, EGLOB.CHUNK_PIX_HEIGHT - GG.assets.get_dimensions(0)[1]//3))
+        w, h = GG.assets.get_dimensions(0)
+        blades = [(random.randint(0, EGLOB.CHUNK_PIX_WIDTH - w//3), random.randint(0, EGLOB.CHUNK_PIX_HEIGHT - h//3),
+                   random.randint(0, GG.assets.variations - 1)) for i in range(grass_count)]
+        GG.add_blades(*zip(*blades))
         # print(GG.chunk, GG.p_chunk)
         _WORLD.add_env_obj(GG)
 
@@ -125,6 +135,7 @@ _HANDLER.add_entity(AMB)
 
 WH = wind.WindHandler()
 AMB.add_system(WH)
+singleton.WIND = WH
 
 WH.add_wind(wind.Wind(0, 50, 20))
 
@@ -136,11 +147,16 @@ TIMER = clock.Timer(wait_time=3.0)
 _HANDLER.handle_changes()
 eid = list(_HANDLER.priority_entities)[0]
 
-clock.start()
+clock.start(tick_rate=TICK_RATE)
 while Window.running:
+    profiler.begin_frame()
     # change this eventually to another class that handles ui and system related things
     if user_input.is_key_pressed(pygame.K_LSHIFT) and user_input.is_key_clicked(pygame.K_d):
         EGLOB.DEBUG = not EGLOB.DEBUG
+    if user_input.is_key_pressed(pygame.K_LSHIFT) and user_input.is_key_clicked(pygame.K_p):
+        profiler.toggle()
+    if user_input.is_key_pressed(pygame.K_LSHIFT) and user_input.is_key_clicked(pygame.K_m):
+        profiler.toggle_assets()
     # ----------------------------------- #
     # update current scene
     if scenehandler.SceneHandler.CURRENT:
@@ -162,10 +178,13 @@ while Window.running:
         # TM.render_text(fb, (0, 0), True)
 
     # eventhandler updates
-    Eventhandler.update()
+    with profiler.scope("events"):
+        Eventhandler.update()
+    profiler.render_overlay(fb)
 
     # rescale framebuffer to window
-    Window.instance.blit(pygame.transform.scale(fb, (Window.WIDTH, Window.HEIGHT)), (0,0))
+    with profiler.scope("scale"):
+        Window.instance.blit(pygame.transform.scale(fb, (Window.WIDTH, Window.HEIGHT)), (0,0))
 
     user_input.update()
     for e in pygame.event.get():
@@ -192,7 +211,9 @@ while Window.running:
             fbsize = fb.get_size()
             user_input.update_ratio(Window.WIDTH, Window.HEIGHT, fbsize[0], fbsize[1])
 
-    pygame.display.update()
+    with profiler.scope("display"):
+        Window.update()
+    profiler.end_frame()
     clock.update()
 
 # CLIENT.close()
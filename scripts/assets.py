@@ -0,0 +1,28 @@
+from engine.graphics.animation import AnimationManifest
+
+from scripts import animationext, singleton
+
+"""
+Asset manifest
+- every animation category the game uses + the file it comes from
+- nothing is loaded here, categories load on first use or through AnimationManifest.preload
+"""
+
+# -------------------------------------------------- #
+# entities
+
+AnimationManifest.register("player", "assets/sprites/player.json")
+AnimationManifest.register("mage", "assets/sprites/mage.json", points=singleton.POINT_COLORS)
+AnimationManifest.register("peasant", "assets/sprites/peasant.json", points=singleton.POINT_COLORS)
+
+# -------------------------------------------------- #
+# attacks + particles
+
+AnimationManifest.register("melee_swing", "assets/sprites/particles/melee_swing.json")
+AnimationManifest.register("fire", "assets/particles/fire.json",
+                           loader=animationext.load_and_parse_aseprite_animation_wrotations, rotations=8)
+
+# -------------------------------------------------- #
+# environment
+
+AnimationManifest.register("grass", "assets/sprites/grass.json")
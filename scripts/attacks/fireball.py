@@ -5,12 +5,10 @@ from engine import singleton
 from engine.gamesystem import particle, entity
 from engine.graphics import animation
 
-from scripts import animationext, singleton as EGLOB, entityext
+from scripts import animationext, singleton as EGLOB, entityext, assets
 from scripts.events.attacks import Attack, generate_attack_data
 from scripts.game import skillhandler
-
-# -------------------------------------------------- #
-animationext.load_and_parse_aseprite_animation_wrotations("assets/particles/fire.json", 8)
+from scripts.environment import wind
 
 
 # -------------------------------------------------- #
@@ -32,6 +30,8 @@ class SmokeParticleHandler(particle.ParticleHandler):
         self.set_life(SmokeParticleHandler.FIRE_PARTICLE_LIFE)
         self.set_create_func(self._create)
         self.set_update_func(self._update)
+        # smoke drifts with the wind
+        self.set_force_func(wind.sample_wind)
 
     def _create(self):
         for item in self.parent.activeatk:
@@ -88,7 +88,7 @@ class Fire(Attack):
     IDLE_ANIM = "fire"
 
     # load
-    ANIM_CATEGORY = animation.Category.get_category(ANIM_CAT)
+    ANIM_CATEGORY = animation.AnimationManifest.get_handle(ANIM_CAT)
 
     # -------------------------------------------------- #
     # states
@@ -146,23 +146,28 @@ class Fire(Attack):
         self.phandler.update()
 
         # movement
-        self.position += self.motion
+        self.position += self.motion * entityext.get_tick_scale()
         self.move_to_position()
         # kill check
-        self.distance_travelled += self.motion.magnitude()
+        self.distance_travelled += self.motion.magnitude() * entityext.get_tick_scale()
         if self.distance_travelled > Fire.MAX_DISTANCE and self.sender:
             self.sender.remove_active_attack(self)
             self.kill()
 
     def render(self, surface):
-        surface.blit(self.sprite, self.get_glob_pos())
+        self.layer.render_queue.submit(self.sprite, self.get_glob_pos())
         # entity.render_entity_hitbox(self, surface)
         # pygame.draw.rect(surface, (255,0,0), self.get_glob_cpos())
 
     def create_particle(self, pid):
-        return [pid, self.rel_hitbox.centerx, self.rel_hitbox.centery, 1, SmokeParticleHandler.FIRE_PARTICLE_LIFE,
-                maths.normalized_random() * SmokeParticleHandler.SMOKE_MOVE_SPEED,
-                maths.normalized_random() * SmokeParticleHandler.SMOKE_MOVE_SPEED]
+        return create_smoke_particle(pid, self.rel_hitbox.centerx, self.rel_hitbox.centery)
+
+
+def create_smoke_particle(pid, x, y):
+    """Create a smoke particle drifting away from x, y"""
+    return [pid, x, y, 1, SmokeParticleHandler.FIRE_PARTICLE_LIFE,
+            maths.normalized_random() * SmokeParticleHandler.SMOKE_MOVE_SPEED,
+            maths.normalized_random() * SmokeParticleHandler.SMOKE_MOVE_SPEED]
 
 
 # ------------- setup ----------- #
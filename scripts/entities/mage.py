@@ -1,7 +1,7 @@
 # -------------------------------------------------- #
 # imports
 import pygame
-from engine.gamesystem.entity import EntityTypes
+from engine.gamesystem.entity import EntityTypes, ActivityTier
 from engine.gamesystem import particle
 from engine.graphics import animation
 from engine.misc import maths, clock
@@ -10,14 +10,11 @@ from engine import singleton
 from engine.handler.eventhandler import Event, Eventhandler
 from engine.handler import statehandler
 
-from scripts import entityext, animationext, singleton as EGLOB, skillext
+from scripts import entityext, animationext, singleton as EGLOB, skillext, assets
 from scripts.game import state, skillhandler
 
 from scripts.attacks import fireball
 
-# -------------------------------------------------- #
-animation.load_and_parse_aseprite_animation("assets/sprites/mage.json")
-
 
 # -------------------------------------------------- #
 # mage state handler
@@ -200,8 +197,7 @@ class Mage(entityext.GameEntity):
     POSTCAST_ANIM = "end_cast"
 
     # load
-    ANIM_CATEGORY = animation.Category.get_category(ANIM_CAT)
-    ANIM_CATEGORY.apply_func_to_animations(animationext.handle_handle_position)
+    ANIM_CATEGORY = animation.AnimationManifest.get_handle(ANIM_CAT)
 
     # -------------------------------------------------- #
     # states
@@ -245,7 +241,8 @@ class Mage(entityext.GameEntity):
     def __init__(self):
         super().__init__(Mage.TYPE, 100, 100)
         self.aregist = Mage.ANIM_CATEGORY.create_registry_for_all()
-        self.sprite = self.aregist[Mage.IDLE_ANIM].get_frame()
+        self.aframe = self.aregist[Mage.IDLE_ANIM].get_frame_data()
+        self.sprite = self.aframe.frame
         self.hitbox = self.aregist[Mage.IDLE_ANIM].get_hitbox()
         # distance from player
         self.player_dis = pygame.math.Vector2()
@@ -257,6 +254,8 @@ class Mage(entityext.GameEntity):
         self.atk_phandler = fireball.SmokeParticleHandler(self)
         # skill tree
         self.skhandler = Mage.SKILL_TREE.get_registry(self)
+        # particle handlers advance inside render -- never cull
+        self.cullable = False
 
     def update(self):
         self.player_dis.x = EGLOB.PLAYER.rect.centerx - self.rect.centerx
@@ -264,10 +263,7 @@ class Mage(entityext.GameEntity):
         self.shandler.player_dis = self.player_dis.magnitude()
 
         self.shandler.update()
-        self.layer.world.move_entity(self)
-
-        self.move_to_position()
-        self.motion *= Mage.LC
+        entityext.move_and_damp(self, Mage.LC)
 
         # output
         Mage.MOVE_EVENT.data['x'] = self.motion.x
@@ -276,11 +272,11 @@ class Mage(entityext.GameEntity):
         # print("mage", self.shandler.current_state)
 
     def render(self, surface):
-        surface.blit(self.sprite if self.motion.x < 0 else pygame.transform.flip(self.sprite, 1, 0),
-                     self.get_glob_pos())
-        # particle handler
-        self.phandler.render(surface)
-        self.atk_phandler.render(surface)
+        self.layer.render_queue.submit(self.aframe.get_frame(self.motion.x >= 0),
+                                       self.get_glob_pos())
+        # particles are drawn straight to the surface -- queued to stay on top of the mage
+        self.layer.render_queue.submit_draw(self.phandler.render)
+        self.layer.render_queue.submit_draw(self.atk_phandler.render)
 
     def debug(self, surface):
         super().debug(surface)
@@ -344,4 +340,4 @@ class MagicParticleHandler(particle.ParticleHandler):
 
 # -------------------------------------------------- #
 # setup
-EntityTypes.register_entity_type(Mage.TYPE, Mage)
+EntityTypes.register_entity_type(Mage.TYPE, Mage, activity=ActivityTier())
@@ -70,5 +70,5 @@ class AnimatedParticle(entityext.NonGameEntity):
             self.kill()
 
     def render(self, surface):
-        surface.blit(self.sprite if self.motion.x < 0 else pygame.transform.flip(self.sprite, 1, 0),
-                     self.get_glob_pos())
+        self.layer.render_queue.submit(self.aregist.get_frame(self.motion.x >= 0),
+                                       self.get_glob_pos())
@@ -5,17 +5,13 @@ from engine.handler import statehandler
 from engine.graphics import animation
 from engine.gamesystem import entity
 
-from scripts import singleton, entityext, animationext
+from scripts import singleton, entityext, animationext, assets
 from scripts.game import state
 
 from scripts.events import attacks
 
 from .mage import Mage
 
-# -------------------------------------------------- #
-animation.load_and_parse_aseprite_animation("assets/sprites/peasant.json")
-animation.load_and_parse_aseprite_animation("assets/sprites/particles/melee_swing.json")
-
 
 # -------------------------------------------------- #
 # states
@@ -264,7 +260,8 @@ class StateHandler(statehandler.StateHandler):
         if self.search_timer.changed:
             self.search_timer.changed = False
             self.nearby_peasants.clear()
-            for e in self.peasant.layer.world.find_nearby_entities(self.peasant.p_chunk, 1):
+            for e in self.peasant.layer.world.query_radius(self.peasant.rel_hitbox.center,
+                                                             Peasant.ENVIRO_CHECK_RADIUS):
                 if type(e) == entity.EntityTypes.get_entity_type(Mage.TYPE):
                     self.nearby_mage = e
                     self.nearby_mage_vec = self.peasant.distance_to_other(e)
@@ -296,9 +293,8 @@ class Peasant(entityext.GameEntity):
     RUN_ANIM = "run"
 
     # load
-    ANIM_CATEGORY = animation.Category.get_category(ANIM_CAT)
-    ANIM_CATEGORY.apply_func_to_animations(animationext.handle_handle_position)
-    MELEE_ANIM_CATEGORY = animation.Category.get_category(MELEE_ATTACK_CAT)
+    ANIM_CATEGORY = animation.AnimationManifest.get_handle(ANIM_CAT)
+    MELEE_ANIM_CATEGORY = animation.AnimationManifest.get_handle(MELEE_ATTACK_CAT)
 
     # -------------------------------------------------- #
     # states
@@ -320,6 +316,7 @@ class Peasant(entityext.GameEntity):
     ATTACK_RANGE = 30
     MELEE_ATTACK_RANGE = 25
     MAGE_HOVER_DIS = 120
+    ENVIRO_CHECK_RADIUS = 216
 
     # cdt
     ENVIRO_CHECK_TIMER = 2.5
@@ -346,7 +343,8 @@ class Peasant(entityext.GameEntity):
     def __init__(self):
         super().__init__(Peasant.TYPE, 100, 100)
         self.aregist = Peasant.ANIM_CATEGORY.create_registry_for_all()
-        self.sprite = self.aregist[Peasant.IDLE_ANIM].get_frame()
+        self.aframe = self.aregist[Peasant.IDLE_ANIM].get_frame_data()
+        self.sprite = self.aframe.frame
         self.hitbox = self.aregist[Peasant.IDLE_ANIM].get_hitbox()
         # distance from player
         self.player_dis = pygame.math.Vector2()
@@ -360,13 +358,11 @@ class Peasant(entityext.GameEntity):
 
         self.shandler.update()
 
-        self.layer.world.move_entity(self)
-        self.move_to_position()
-        self.motion *= Peasant.LC
+        entityext.move_and_damp(self, Peasant.LC)
 
     def render(self, surface):
-        surface.blit(self.sprite if self.motion.x < 0 else pygame.transform.flip(self.sprite, True, False),
-                     self.get_glob_pos())
+        self.layer.render_queue.submit(self.aframe.get_frame(self.motion.x >= 0),
+                                       self.get_glob_pos())
 
     def debug(self, surface):
         super().debug(surface)
@@ -380,4 +376,4 @@ class Peasant(entityext.GameEntity):
 
 # -------------------------------------------------- #
 # setup
-entity.EntityTypes.register_entity_type(Peasant.TYPE, Peasant)
+entity.EntityTypes.register_entity_type(Peasant.TYPE, Peasant, activity=entity.ActivityTier())
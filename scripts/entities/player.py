@@ -8,11 +8,7 @@ from engine.misc import maths, user_input, clock
 from engine.handler import scenehandler
 from engine.handler.eventhandler import Event, Eventhandler
 
-from scripts import entityext, animationext, singleton
-
-# -------------------------------------------------- #
-animation.load_and_parse_aseprite_animation("assets/sprites/player.json")
-
+from scripts import entityext, animationext, singleton, assets
 
 # -------------------------------------------------- #
 
@@ -27,7 +23,7 @@ class Player(entityext.GameEntity):
     RUN_ANIM = "run"
 
     # load
-    ANIM_CATEGORY = animation.Category.get_category(ANIM_CAT)
+    ANIM_CATEGORY = animation.AnimationManifest.get_handle(ANIM_CAT)
 
     # -------------------------------------------------- #
     # statistics
@@ -52,7 +48,8 @@ class Player(entityext.GameEntity):
         # mana will change in future
         super().__init__("Player", 100, 100)
         self.aregist = Player.ANIM_CATEGORY.create_registry_for_all()
-        self.sprite = self.aregist[Player.IDLE_ANIM].get_frame()
+        self.aframe = self.aregist[Player.IDLE_ANIM].get_frame_data()
+        self.sprite = self.aframe.frame
         self.hitbox = self.aregist[Player.IDLE_ANIM].get_hitbox()
         # camera and events
         self.camera = None
@@ -68,9 +65,6 @@ class Player(entityext.GameEntity):
     def update(self):
         # animations - etc
         entityext.update_ani_and_hitbox(self, Player.IDLE_ANIM, handle=False)
-        # smooth motion
-        self.motion = maths.lerp(self.motion, singleton.ZERO, Player.LC)
-
         # movement
         if user_input.is_key_pressed(pygame.K_d):
             self.motion.x += Player.MS * clock.delta_time
@@ -84,11 +78,10 @@ class Player(entityext.GameEntity):
         if user_input.is_key_pressed(pygame.K_k):
             self.kill()
 
-        # project movement to world
-        self.layer.world.move_entity(self)
-        self.move_to_position()
+        # project movement to world + smooth motion
+        moved = entityext.move_and_damp(self, 1 - Player.LC)
         # update camera
-        self.camera.campos -= self.motion
+        self.camera.campos -= moved
         self.camera.track_target()
         self.camera.update()
 
@@ -102,8 +95,8 @@ class Player(entityext.GameEntity):
 
     def render(self, surface):
         # surface.blit(self.sprite, self.get_glob_pos())
-        surface.blit(self.sprite if self.motion.x < 0 else pygame.transform.flip(self.sprite, True, False),
-                     self.camera.get_target_rel_pos())
+        self.layer.render_queue.submit(self.aframe.get_frame(self.motion.x >= 0),
+                                       self.camera.get_target_rel_pos())
 
     def debug(self, surface):
         super().debug(surface)
@@ -20,6 +20,8 @@ class Test(entityext.NonGameEntity):
 
         self.test_angle = 0
         self.test_img = filehandler.Filehandler.get_image("assets/sprites/grass.png").subsurface((0, 0, 16, 16))
+        # draws relative to position, not rect
+        self.cullable = False
 
     def start(self):
         pass
@@ -31,6 +33,9 @@ class Test(entityext.NonGameEntity):
         self.test_angle += 30 * clock.delta_time
 
     def render(self, surface):
+        self.layer.render_queue.submit_draw(self.draw)
+
+    def draw(self, surface):
         # surface.blit(pygame.transform.rotate(self.test_img, -self.test_angle).convert(), (EGLOB.WORLD_OFFSET_X-50, EGLOB.WORLD_OFFSET_Y))
         pygame.draw.line(surface, (255,0,0), self.position+self.get_glob_cpos(), self.position+singleton.UP * 10+self.get_glob_cpos())
         pygame.draw.line(surface, (255, 100, 0), self.position+self.get_glob_cpos(), self.position + self.vec*10+self.get_glob_cpos())
@@ -41,6 +46,7 @@ class TrailTest(entityext.NonGameEntity):
     def __init__(self):
         super().__init__("trailtest", None)
         self.timer = clock.Timer(2.0)
+        self.cullable = False
     
     def update(self):
         self.timer.update()
@@ -49,6 +55,9 @@ class TrailTest(entityext.NonGameEntity):
         self.rect.topleft = self.position.xy
     
     def render(self, surface):
+        self.layer.render_queue.submit_draw(self.draw)
+
+    def draw(self, surface):
         pygame.draw.circle(surface, (0, 0, 255), self.position+self.get_glob_cpos(), 1)
 
 
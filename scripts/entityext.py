@@ -2,7 +2,7 @@ import pygame
 import numpy as np
 
 from engine.gamesystem import entity
-from engine.misc import maths
+from engine.misc import maths, clock
 from engine.handler import scenehandler, eventhandler
 from engine import singleton as EGLOB
 
@@ -14,14 +14,51 @@ from .game import state
 
 def update_ani_and_hitbox(entity, ani_name, handle=True):
     """This entity must contain an shandler"""
-    entity.aregist[ani_name].update()
-    entity.sprite = entity.aregist[ani_name].get_frame()
-    entity.hitbox = entity.aregist[ani_name].get_hitbox()
+    registry = entity.aregist[ani_name]
+    registry.update()
+    entity.aframe = registry.get_frame_data()
+    entity.sprite = entity.aframe.frame
+    entity.hitbox = entity.aframe.hitbox
     if handle:
-        entity.handle_pos = entity.aregist[ani_name].get_frame_data().get_point(singleton.HANDLE_IDENTIFIER)
+        entity.handle_pos = entity.aframe.get_point(singleton.HANDLE_IDENTIFIER)
     entity.calculate_rel_hitbox()
 
 
+# motion + damping factors are tuned per tick at this many ticks per second
+MOVE_RATE = 60
+
+
+def get_tick_scale():
+    """How many MOVE_RATE ticks the current tick lasts"""
+    return clock.delta_time * MOVE_RATE
+
+
+def move_and_damp(entity, keep: float):
+    """
+    Move an entity by its motion, then multiply the motion by keep (0 <= keep < 1)
+    - gives what MOVE_RATE ticks of "move, motion *= keep" would for a tick of any length
+    - motion gained since the last call counts as acceleration spread over the tick
+    - returns the distance moved
+    """
+    ticks = get_tick_scale()
+    start = entity.settled_motion
+    if ticks <= 0:
+        moved = pygame.math.Vector2()
+    else:
+        # per tick acceleration + the motion it settles at
+        accel = (entity.motion - start) / ticks
+        rest = accel * (keep / (1 - keep))
+        decay = keep ** ticks
+        moved = (accel + rest) * ticks + (start - rest) * ((1 - decay) / (1 - keep))
+        start = rest + (start - rest) * decay
+    entity.motion.xy = moved
+    entity.layer.world.move_entity(entity)
+    entity.move_to_position()
+    entity.motion.xy = start
+    entity.settled_motion.xy = start
+    return moved
+
+
 def find_idle_mot(MS):
     dx = np.random.random() - .5
     dy = np.random.random() - .5
@@ -67,6 +104,8 @@ class GameEntity(entity.Entity):
         - mana              = int
         - level             = float
         - position          = vec2
+        - aframe            = FrameData (frame the sprite comes from)
+        - settled_motion    = vec2 (motion after the last move_and_damp)
         """
         super().__init__()
         # stats
@@ -82,6 +121,9 @@ class GameEntity(entity.Entity):
         self.eventhandler = eventhandler.EventStorage()
         # handle (where to hold weapons) position
         self.handle_pos = (0, 0)
+        # current animation frame -- renders get the facing variant from it
+        self.aframe = None
+        self.settled_motion = pygame.math.Vector2()
 
     def start(self):
         pass
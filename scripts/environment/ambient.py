@@ -8,6 +8,10 @@ class AmbienceSystem:
     def __init__(self):
         self.layer = None
 
+    def update(self):
+        """One simulation tick"""
+        pass
+
     def handle(self, surface):
         pass
 
@@ -29,16 +33,22 @@ class Ambience(entityext.NonGameEntity):
     # ----------------------------------- #
     def __init__(self):
         super().__init__("ambience", None)
+        # systems draw across the whole screen
+        self.cullable = False
         # ----------------------------------- #
         # systems to handle
         self.systems = []
 
     def update(self):
-        # screw the update function :)
-        pass
+        for system in self.systems:
+            system.update()
 
     def render(self, surface):
-        # update everything
+        # systems draw straight to the surface -- keep their place in the render queue
+        self.layer.render_queue.submit_draw(self.handle_systems)
+
+    def handle_systems(self, surface):
+        """Draw every system"""
         for system in self.systems:
             system.handle(surface)
 
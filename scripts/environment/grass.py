@@ -1,10 +1,13 @@
+import math
 import random
-from math import sin
+import pygame
+import numpy as np
 
-import pygame.transform
+from itertools import repeat, count
 
 from engine import singleton as EGLOB
-from engine.graphics import animation
+from engine.graphics import animation, surfcache
+from engine.handler.filehandler import AssetHandle, AssetRefs, Filehandler
 from engine.misc import clock
 
 from scripts import singleton, animationext, entityext
@@ -20,10 +23,18 @@ class GrassAssets:
 
     @classmethod
     def get_asset(cls, name: str, file: str):
+        AssetRefs.use("grass", name)
         if name not in cls.ASSETS:
             cls.ASSETS[name] = GrassAssets(file)
         return cls.ASSETS[name]
 
+    @classmethod
+    def remove_asset(cls, name: str):
+        """Unload grass assets - their rotations are left to the rotation cache"""
+        asset = cls.ASSETS.pop(name, None)
+        if asset:
+            asset.handle.release()
+
     # -------------------------------------------------- #
     # class
 
@@ -32,41 +43,109 @@ class GrassAssets:
         self.info = animation.load_and_parse_aseprite_animation(file)
         self.aregist = animation.Category.get_category(self.info["cat"][0]).anims.values()
         self.aregist = list(self.aregist)[0].get_registry()
-        self.images = [[] for i in range(self.aregist.parent.length)]
+        # the blades are cut from the category
+        self.handle = AssetHandle("category", self.info["cat"][0])
         self.load_range = (20, 160)
         self.skip = int(self.load_range[1] - self.load_range[0]) // 16
-        for i in range(self.load_range[0], self.load_range[1], self.skip):
-            angle = i
-            for c in range(self.aregist.parent.length):
-                self.images[c].append(pygame.transform.rotate(self.aregist.parent.frames[c].oframe, -angle))
+        # rotated blades are made when first drawn -- see surfcache.ROTATIONS
+        self.frames = [f.oframe for f in self.aregist.parent.frames]
         # variations
-        self.variations = len(self.images)
-        self.var_length = len(self.images[0])
+        self.variations = len(self.frames)
+        self.var_length = len(range(self.load_range[0], self.load_range[1], self.skip))
+        # angles get_sprites maps onto a rotation -- below load_range the index counts from the end
+        self.angle_range = (self.load_range[0] - self.var_length * self.skip, self.load_range[0] - 1)
         # get dimension data from each image set
-        self.dimensions = [self.images[i][0].get_size() for i in range(len(self.images))]
+        self.dimensions = [self.get_image(i, 0).get_size() for i in range(self.variations)]
+        self.max_size = None
 
     def get_dimensions(self, image_set: int):
         """Get image dimensions for the i-th image set"""
         return self.dimensions[image_set]
 
+    def get_image(self, var: int, index: int):
+        """Get the index-th rotation of a variation - negative indices count from the end"""
+        if index < 0:
+            index += self.var_length
+        if not 0 <= index < self.var_length:
+            raise IndexError(f"Grass rotation {index} out of range")
+        return surfcache.get_rotation(self.frames[var], -(self.load_range[0] + index * self.skip))
+
+    def get_max_size(self):
+        """Size every rotated blade fits into"""
+        if not self.max_size:
+            sizes = [self.get_image(v, i).get_size() for v in range(self.variations) for i in range(self.var_length)]
+            self.max_size = (max(w for w, h in sizes), max(h for w, h in sizes))
+        return self.max_size
+
     def get_sprite(self, var: int, angle: float):
-        return self.images[var][int(angle - self.load_range[0]) // self.skip]
+        return self.get_image(var, int(angle - self.load_range[0]) // self.skip)
+
+    def get_sprites(self, variations, angles):
+        """get_sprite for arrays of variations + angles - returns a list of surfaces"""
+        # int() truncates towards 0, then // floors -- same as get_sprite
+        index = np.trunc(angles - self.load_range[0]).astype(np.int64) // self.skip
+        # negative indices count from the end, like get_image
+        key = np.asarray(variations, np.int64) * self.var_length + index % self.var_length
+        used = np.unique(key)
+        table = np.empty(self.variations * self.var_length, dtype=object)
+        for k in used.tolist():
+            table[k] = self.get_image(k // self.var_length, k % self.var_length)
+        return table[key].tolist()
+
+
+AssetRefs.register_kind("grass", GrassAssets.remove_asset, lambda name: 0, lambda: GrassAssets.ASSETS.keys())
 
 
 # -------------------------------------------------- #
 # grass handler
 # each chunk will have a grass handler
 
+
 class GrassHandler(entityext.NonGameEntity):
+    # one blade -- position relative to the handler + variation
+    BLADE = np.dtype([("x", np.int16), ("y", np.int16), ("var", np.uint8)])
+    # starting blade capacity -- doubled when full
+    CAPACITY = 64
+    # tiles of a chunk, row major -- blades outside the chunk belong to the closest edge tile
+    TILE_COLUMNS = -(-EGLOB.CHUNK_PIX_WIDTH // singleton.GRASS_TILE_SIZE)
+    TILE_ROWS = -(-EGLOB.CHUNK_PIX_HEIGHT // singleton.GRASS_TILE_SIZE)
+    TILE_COUNT = TILE_COLUMNS * TILE_ROWS
+    # blades sway with sin(run_time + x) -> every 2 pi seconds the field looks the same
+    PERIOD = 2 * math.pi
+    # baked keyframes of every handler {(bake id, keyframe): surface}
+    KEYFRAMES = surfcache.SurfaceCache("grass", singleton.GRASS_BAKE_BYTES)
+    BAKE_IDS = count()
+
+    @classmethod
+    def get_tiles(cls, x, y):
+        """Get the tile index of blade positions"""
+        size = singleton.GRASS_TILE_SIZE
+        return (np.clip(np.asarray(x) // size, 0, cls.TILE_COLUMNS - 1) +
+                np.clip(np.asarray(y) // size, 0, cls.TILE_ROWS - 1) * cls.TILE_COLUMNS)
+
     def __init__(self, grass_assets: str):
         super().__init__("grass-handler", None)
         self.assets = GrassAssets.get_asset("general", grass_assets)
         self.aregist = self.assets.aregist
 
         # -------------------------------------------------- #
-        # grass cache
+        # grass cache -- the first grass_count blades are used, sorted by tile
         self.grass_count = 0
-        self.grass = {}
+        self.blades = np.zeros(GrassHandler.CAPACITY, dtype=GrassHandler.BLADE)
+        # blades of tile t = blades[tile_starts[t]:tile_starts[t + 1]]
+        self.tile_starts = np.zeros(GrassHandler.TILE_COUNT + 1, dtype=np.int64)
+        # blade position bounds of every tile [left, top, right, bottom] -- sprite size not included
+        self.tile_area = np.zeros((GrassHandler.TILE_COUNT, 4), dtype=np.int32)
+        self.update_tiles()
+
+        # ----------------------------------- #
+        # baked keyframes -- a new id whenever the blades change, old keyframes age out of the cache
+        self.bake_id = next(GrassHandler.BAKE_IDS)
+        self.bake_area = None
+        # drawn blade by blade until then (disturbed blades)
+        self.live_until = 0.0
+        # feet of the entities standing in the grass [(x, y)...]
+        self.pushers = []
 
         # ----------------------------------- #
         # wind effect
@@ -79,28 +158,201 @@ class GrassHandler(entityext.NonGameEntity):
             self.wind_timer.changed = False
             # now generate new wind instance
             pass
+        if not self.grass_count:
+            return
+        # keyframes do not bend -- blades entities or the wind reach are drawn live until they settle
+        area = self.get_bake_area().move(self.rect.x, self.rect.y)
+        self.pushers = self.get_pushers(area.inflate(singleton.GRASS_PUSH_RADIUS * 2, singleton.GRASS_PUSH_RADIUS * 2))
+        if self.pushers:
+            self.disturb(singleton.GRASS_SETTLE)
+        wind = singleton.WIND
+        if wind and not wind.is_calm() and wind.field.get_peak(area) >= singleton.WIND_CALM:
+            self.disturb(singleton.GRASS_SETTLE)
+
+    def get_angles(self, x, time: float = None):
+        """Sway angles of blades at x - where they are at <time> (default: now)"""
+        angles = np.sin((clock.run_time if time is None else time) + x)
+        angles *= 30
+        angles -= 45
+        return angles
+
+    def get_pushers(self, area):
+        """Get the feet of every entity (the player too) whose hitbox touches area"""
+        return [entity.rel_hitbox.midbottom for entity in self.layer.world.query_rect(area, include_priority=True)]
+
+    def bend(self, blades, angles):
+        """Bend blades away from entities + in the direction of the wind - one field lookup for all of them"""
+        wind = singleton.WIND
+        if wind and wind.is_calm():
+            wind = None
+        if not self.pushers and not wind:
+            return angles
+        x = blades["x"].astype(np.int64) + self.rect.x
+        y = blades["y"].astype(np.int64) + self.rect.y
+        # blade roots -- x, y are the sprite top left
+        w, h = self.assets.get_max_size()
+        for px, py in self.pushers:
+            dx = x + w // 2 - px
+            push = np.maximum(1 - np.hypot(dx, y + h - py) / singleton.GRASS_PUSH_RADIUS, 0)
+            angles += np.sign(dx) * push * singleton.GRASS_PUSH_BEND
+        if wind:
+            vx, vy = wind.sample(x, y)
+            angles += np.clip(vx * singleton.GRASS_WIND_BEND, -singleton.GRASS_WIND_MAX_BEND,
+                              singleton.GRASS_WIND_MAX_BEND)
+        # past the table the index would wrap onto the other side
+        np.clip(angles, *self.assets.angle_range, out=angles)
+        return angles
 
-    def update_blade(self, blade: list):
-        b = self.grass[blade]
-        b[2] = sin(clock.run_time + b[0]) * 30 - 45
-        # print(b[2])
+    def disturb(self, duration: float):
+        """Draw the blades live (not from keyframes) for the next <duration> seconds"""
+        self.live_until = max(self.live_until, clock.run_time + duration)
+
+    # -------------------------------------------------- #
+    # tiles
+
+    def get_blades(self):
+        """Get every used blade"""
+        return self.blades[:self.grass_count]
+
+    def update_tiles(self):
+        """Rebuild the tile starts + bounds from the (sorted) blades"""
+        blades = self.get_blades()
+        tiles = GrassHandler.get_tiles(blades["x"], blades["y"])
+        self.tile_starts[0] = 0
+        np.cumsum(np.bincount(tiles, minlength=GrassHandler.TILE_COUNT), out=self.tile_starts[1:])
+        # empty tiles never intersect anything
+        self.tile_area[:, :2] = np.iinfo(np.int32).max
+        self.tile_area[:, 2:] = np.iinfo(np.int32).min
+        np.minimum.at(self.tile_area[:, 0], tiles, blades["x"])
+        np.minimum.at(self.tile_area[:, 1], tiles, blades["y"])
+        np.maximum.at(self.tile_area[:, 2], tiles, blades["x"])
+        np.maximum.at(self.tile_area[:, 3], tiles, blades["y"])
+
+    def get_visible_blades(self):
+        """Get the blades of every tile that intersects the camera viewport + margin"""
+        viewport = self.layer.camera.viewport
+        margin = EGLOB.CULL_MARGIN
+        w, h = self.assets.get_max_size()
+        # viewport relative to the handler
+        left, top = viewport.left - margin - self.rect.x, viewport.top - margin - self.rect.y
+        right, bottom = viewport.right + margin - self.rect.x, viewport.bottom + margin - self.rect.y
+        area = self.tile_area
+        tiles = np.flatnonzero((area[:, 0] < right) & (area[:, 2] + w > left) &
+                               (area[:, 1] < bottom) & (area[:, 3] + h > top))
+        if len(tiles) == GrassHandler.TILE_COUNT:
+            return self.get_blades()
+        if not len(tiles):
+            return self.blades[:0]
+        # neighbouring tiles are one slice of blades
+        starts, ends = self.tile_starts[tiles], self.tile_starts[tiles + 1]
+        breaks = np.flatnonzero(starts[1:] != ends[:-1]) + 1
+        slices = [self.blades[s:e] for s, e in zip(starts[np.r_[0, breaks]].tolist(),
+                                                    ends[np.r_[breaks - 1, len(ends) - 1]].tolist())]
+        return slices[0] if len(slices) == 1 else np.concatenate(slices)
+
+    # -------------------------------------------------- #
+    # rendering
 
     def render(self, surface):
         # update and render like particles
+        if not self.grass_count:
+            return
+        if singleton.GRASS_BAKED and clock.run_time >= self.live_until:
+            self.render_baked()
+            return
+        blades = self.get_visible_blades()
+        if not len(blades):
+            return
         cpos = self.get_glob_pos()
-        for blade in self.grass:
-            self.update_blade(blade)
-            surface.blit(self.assets.get_sprite(self.grass[blade][3], self.grass[blade][2]),
-                         (cpos[0] + self.grass[blade][0], cpos[1] + self.grass[blade][1]))
-            # pygame.transform.rotate(self.assets.images[0][0], 
-            #           self.grass[blade][2])
+        sprites = self.assets.get_sprites(blades["var"], self.bend(blades, self.get_angles(blades["x"])))
+        dests = zip((blades["x"] + cpos[0]).tolist(), (blades["y"] + cpos[1]).tolist())
+        self.layer.render_queue.submit_many(zip(sprites, dests, repeat(None), repeat(0)))
 
-        # for i in range(self.assets.var_length):
-        #     surface.blit(self.assets.images[0][i], (EGLOB.WORLD_OFFSET_X + i * 16, EGLOB.WORLD_OFFSET_Y))
+    def render_baked(self):
+        """Draw the keyframe closest to the current sway"""
+        area = self.get_bake_area().move(self.rect.x, self.rect.y)
+        if not self.layer.camera.viewport.inflate(EGLOB.CULL_MARGIN * 2, EGLOB.CULL_MARGIN * 2).colliderect(area):
+            return
+        frames = singleton.GRASS_KEYFRAMES
+        keyframe = round(clock.run_time % GrassHandler.PERIOD / GrassHandler.PERIOD * frames) % frames
+        image = GrassHandler.KEYFRAMES.get((self.bake_id, keyframe), self.bake, keyframe)
+        cpos = self.get_glob_pos()
+        self.layer.render_queue.submit(image, (cpos[0] + self.bake_area.x, cpos[1] + self.bake_area.y))
+
+    def get_bake_area(self):
+        """Area every blade is drawn into - relative to the handler"""
+        if not self.bake_area:
+            w, h = self.assets.get_max_size()
+            area = self.tile_area
+            left, top = int(area[:, 0].min()), int(area[:, 1].min())
+            self.bake_area = pygame.Rect(left, top, int(area[:, 2].max()) + w - left,
+                                         int(area[:, 3].max()) + h - top)
+        return self.bake_area
+
+    def bake(self, keyframe: int):
+        """Render every blade at a keyframe of the sway period into one surface"""
+        blades = self.get_blades()
+        area = self.get_bake_area()
+        angles = self.get_angles(blades["x"], keyframe * GrassHandler.PERIOD / singleton.GRASS_KEYFRAMES)
+        sprites = self.assets.get_sprites(blades["var"], angles)
+        dests = zip((blades["x"] - area.x).tolist(), (blades["y"] - area.y).tolist())
+        image = pygame.Surface(area.size, pygame.SRCALPHA, 32)
+        image.blits(zip(sprites, dests), doreturn=False)
+        return Filehandler.convert(image)
 
     def debug(self, surface):
         pass
 
+    # -------------------------------------------------- #
+    # blades
+
+    def changed(self):
+        """The blades changed - keyframes are outdated"""
+        self.bake_id = next(GrassHandler.BAKE_IDS)
+        self.bake_area = None
+
     def add_grass(self, x, y, i_orientation=0):
+        """Add a single blade - inserted at the end of its tile"""
+        n = self.grass_count
+        if n == len(self.blades):
+            self.blades = np.concatenate((self.blades, np.zeros_like(self.blades)))
+        tile = int(GrassHandler.get_tiles(x, y))
+        i = int(self.tile_starts[tile + 1])
+        # overlapping copies are safe in numpy
+        self.blades[i + 1:n + 1] = self.blades[i:n]
+        self.blades[i] = (x, y, random.randint(0, self.assets.variations - 1))
+        self.tile_starts[tile + 1:] += 1
+        area = self.tile_area[tile]
+        area[:] = (min(area[0], x), min(area[1], y), max(area[2], x), max(area[3], y))
         self.grass_count += 1
-        self.grass[self.grass_count] = [x, y, int(i_orientation), random.randint(0, self.assets.variations - 1)]
+        self.changed()
+
+    def add_blades(self, x, y, variations=None):
+        """Add many blades at once - random variations unless given"""
+        x, y = np.asarray(x), np.asarray(y)
+        added = np.zeros(len(x), dtype=GrassHandler.BLADE)
+        added["x"], added["y"] = x, y
+        added["var"] = np.random.randint(0, self.assets.variations, len(x)) if variations is None else variations
+        blades = np.concatenate((self.get_blades(), added))
+        # stable -> blades keep their order inside a tile
+        order = np.argsort(GrassHandler.get_tiles(blades["x"], blades["y"]), kind="stable")
+        self.grass_count = len(blades)
+        self.blades = np.zeros(max(GrassHandler.CAPACITY, len(self.blades), self.grass_count),
+                               dtype=GrassHandler.BLADE)
+        self.blades[:self.grass_count] = blades[order]
+        self.update_tiles()
+        self.changed()
+
+    def remove_blades(self, area):
+        """Remove every blade inside area (relative to the handler) - returns how many were removed"""
+        blades = self.get_blades()
+        inside = ((blades["x"] >= area[0]) & (blades["x"] < area[0] + area[2]) &
+                  (blades["y"] >= area[1]) & (blades["y"] < area[1] + area[3]))
+        removed = int(np.count_nonzero(inside))
+        if removed:
+            # filtering keeps the tile order
+            self.grass_count -= removed
+            self.blades[:self.grass_count] = blades[~inside]
+            self.update_tiles()
+            self.changed()
+        return removed
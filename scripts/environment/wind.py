@@ -1,10 +1,12 @@
 import pygame
 import random
 import math
+import numpy as np
 
 from engine.misc import clock, maths
+from engine import singleton as EGLOB
 
-from scripts import entityext
+from scripts import singleton, entityext
 from scripts.environment import ambient
 
 
@@ -49,13 +51,106 @@ class Wind(entityext.NonGameEntity):
         pygame.draw.circle(surface, Wind.DEBUG_COLOR, self.get_glob_pos(), self.power, 1)
 
     def power_at(self, point):
-        """Find the power of the wind at a certain point"""
+        """Find the power of the wind at a certain point - see WindField for many points"""
         return self.position.distance_to(point) / self.power
 
     def __hash__(self):
         return self.id
 
 
+# ----------------------------------- #
+# wind field
+
+class WindField:
+    """
+    Coarse grid of wind velocities around the camera
+    - every tick the field is carried along itself + pulled towards the winds inside it
+    - any amount of points is read with one bilinear lookup
+    """
+
+    def __init__(self, cell: int, columns: int, rows: int):
+        """
+        Constructor for WindField
+        contains:
+        - cell              = int (pixels per cell)
+        - origin            = [int, int] (world position of the top left cell)
+        - velocity          = np.ndarray [rows, columns, 2] (pixels / second)
+        - peak              = float (fastest wind in the field)
+        """
+        self.cell = cell
+        self.origin = [0, 0]
+        self.velocity = np.zeros((rows, columns, 2))
+        self.peak = 0.0
+        # cell centers relative to the origin
+        self.centers = (np.stack(np.mgrid[0:rows, 0:columns][::-1], axis=-1) + 0.5) * cell
+
+    def follow(self, viewport, margin: int):
+        """Keep the field around a viewport - cells that enter the field start calm"""
+        x = (viewport.left // self.cell - margin) * self.cell
+        y = (viewport.top // self.cell - margin) * self.cell
+        dx, dy = (x - self.origin[0]) // self.cell, (y - self.origin[1]) // self.cell
+        if not dx and not dy:
+            return
+        self.origin[0], self.origin[1] = x, y
+        rows, columns = self.velocity.shape[:2]
+        old = self.velocity
+        self.velocity = np.zeros_like(old)
+        if abs(dx) < columns and abs(dy) < rows:
+            self.velocity[max(-dy, 0):rows - max(dy, 0), max(-dx, 0):columns - max(dx, 0)] = \
+                old[max(dy, 0):rows - max(-dy, 0), max(dx, 0):columns - max(-dx, 0)]
+
+    def sample(self, x, y):
+        """Get the wind (vx, vy arrays) at world positions - 0 outside the field"""
+        rows, columns = self.velocity.shape[:2]
+        gx = (np.asarray(x, dtype=np.float64) - self.origin[0]) / self.cell - 0.5
+        gy = (np.asarray(y, dtype=np.float64) - self.origin[1]) / self.cell - 0.5
+        x0, y0 = np.floor(gx), np.floor(gy)
+        fx, fy = (gx - x0)[..., None], (gy - y0)[..., None]
+        inside = ((x0 >= 0) & (x0 < columns - 1) & (y0 >= 0) & (y0 < rows - 1))[..., None]
+        x0 = np.clip(x0, 0, columns - 2).astype(np.intp)
+        y0 = np.clip(y0, 0, rows - 2).astype(np.intp)
+        v = self.velocity
+        result = ((v[y0, x0] * (1 - fx) + v[y0, x0 + 1] * fx) * (1 - fy) +
+                  (v[y0 + 1, x0] * (1 - fx) + v[y0 + 1, x0 + 1] * fx) * fy)
+        result *= inside
+        return result[..., 0], result[..., 1]
+
+    def get_peak(self, area):
+        """Fastest wind in the cells under an area (world rect) - samples never exceed it"""
+        rows, columns = self.velocity.shape[:2]
+        left = max((area[0] - self.origin[0]) // self.cell, 0)
+        top = max((area[1] - self.origin[1]) // self.cell, 0)
+        right = min((area[0] + area[2] - self.origin[0]) // self.cell + 1, columns)
+        bottom = min((area[1] + area[3] - self.origin[1]) // self.cell + 1, rows)
+        if left >= right or top >= bottom:
+            return 0.0
+        return float(np.abs(self.velocity[int(top):int(bottom), int(left):int(right)]).max())
+
+    def advect(self, dt: float):
+        """Carry the field along itself - every cell takes the wind from where it came from"""
+        if not self.peak:
+            return
+        back = self.centers - self.velocity * dt
+        vx, vy = self.sample(back[..., 0] + self.origin[0], back[..., 1] + self.origin[1])
+        self.velocity[..., 0] = vx
+        self.velocity[..., 1] = vy
+
+    def blow(self, winds, dt: float):
+        """Pull the field towards the winds - falls off linearly to the edge of a wind"""
+        target = np.zeros_like(self.velocity)
+        if winds:
+            data = np.array([(w.position.x, w.position.y, w.power, w.motion.x * w.speed, w.motion.y * w.speed)
+                             for w in winds])[:, :, None, None]
+            # [winds, rows, columns] -- winds smaller than a cell still reach their cell
+            distance = np.hypot(self.centers[..., 0] + self.origin[0] - data[:, 0],
+                                self.centers[..., 1] + self.origin[1] - data[:, 1])
+            falloff = np.clip(1 - distance / np.maximum(data[:, 2], self.cell), 0, 1)
+            target[..., 0] = (falloff * data[:, 3]).sum(axis=0)
+            target[..., 1] = (falloff * data[:, 4]).sum(axis=0)
+        self.velocity += (target - self.velocity) * min(dt * singleton.WIND_RESPONSE, 1.0)
+        self.peak = float(np.abs(self.velocity).max())
+
+
 # ----------------------------------- #
 # wind handler
 
@@ -67,33 +162,63 @@ class WindHandler(ambient.AmbienceSystem):
     def __init__(self):
         super().__init__()
         self.winds = set()
+        # the viewport + margin on every side
+        margin = singleton.WIND_FIELD_MARGIN
+        self.field = WindField(singleton.WIND_CELL_SIZE,
+                               -(-EGLOB.FB_WIDTH // singleton.WIND_CELL_SIZE) + margin * 2 + 1,
+                               -(-EGLOB.FB_HEIGHT // singleton.WIND_CELL_SIZE) + margin * 2 + 1)
 
     def add_wind(self, wind):
         """Add a new wind object to the wind array"""
         self.winds.add(wind)
         wind.layer = self.layer
+        wind.start()
 
     def remove_wind(self, wind):
         """Remove a wind from the array"""
         self.winds.remove(wind)
 
-    def handle(self, surface):
+    def update(self):
+        """Move the winds + advance the field - one simulation tick"""
         for wind in self.winds:
             wind.update()
+        self.field.follow(self.layer.camera.viewport, singleton.WIND_FIELD_MARGIN)
+        self.field.advect(clock.delta_time)
+        self.field.blow(self.winds, clock.delta_time)
+
+    def handle(self, surface):
+        for wind in self.winds:
             wind.render(surface)
 
     def debug(self, surface):
         for wind in self.winds:
             wind.debug(surface)
 
+    def is_calm(self):
+        """Check if the wind moves nothing anywhere"""
+        return self.field.peak < singleton.WIND_CALM
+
+    def sample(self, x, y):
+        """Get the wind (vx, vy arrays) at world positions"""
+        return self.field.sample(x, y)
+
+    def sample_entities(self, entities):
+        """Get the wind (vx, vy arrays) at the hitbox centers of entities"""
+        centers = np.array([e.rel_hitbox.center for e in entities], dtype=np.float64).reshape(-1, 2)
+        return self.field.sample(centers[:, 0], centers[:, 1])
+
     def affect_function(self, affected):
         """
         Function that allows systems to interact with world
         <affected> = an entity or other system
+        - returns the wind at its position
         """
-        for wind in self.winds:
-            e = self.layer.handler.get_entity(wind)
-            if e.power_at(affected.position) > 1:
-                continue
-            # handle interaction
+        vx, vy = self.field.sample(affected.position.x, affected.position.y)
+        return pygame.math.Vector2(float(vx), float(vy))
+
 
+def sample_wind(x, y):
+    """Wind at world positions for particle handlers - None while there is no wind"""
+    if singleton.WIND is None or singleton.WIND.is_calm():
+        return None
+    return singleton.WIND.sample(x, y)
@@ -41,12 +41,10 @@ class Attack(AnimatedParticle):
     def update(self):
         super().update()
         # check if hit an object
-        for entity in self.layer.world.find_nearby_entities(self.chunk, 0):
+        for entity in self.layer.world.query_rect(self.rel_hitbox):
             if entity.id == self.id or (self.sender and entity.id == self.sender.id):
                 continue
-            # TODO - swap out this is temporary
-            if self.rel_hitbox.colliderect(entity.rel_hitbox):
-                Eventhandler.emit_signal(Event(Attack.HIT_SIGNAL, {'a': self, 'b': entity}))
+            Eventhandler.emit_signal(Event(Attack.HIT_SIGNAL, {'a': self, 'b': entity}))
 
     def debug(self, surface):
         super().debug(surface)
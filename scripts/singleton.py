@@ -16,11 +16,47 @@ ZERO = pygame.math.Vector2(0,0)
 
 HANDLE_IDENTIFIER = "handler"
 HANDLE_POS_COL = (0, 255, 0)
+# named marker points found on animation frames {name: color}
+POINT_COLORS = {HANDLE_IDENTIFIER: HANDLE_POS_COL}
+
+# -------------------------------------------------- #
+# grass
+
+# draw undisturbed grass from pre-rendered keyframes of one sway period
+GRASS_BAKED = True
+# keyframes per period -- more = smoother sway + more memory
+GRASS_KEYFRAMES = 12
+# memory for every handler's keyframes together, least recently drawn are baked again when needed
+GRASS_BAKE_BYTES = 32 * 1024 * 1024
+# blades are grouped into square tiles of this many pixels, only tiles inside the viewport are drawn
+GRASS_TILE_SIZE = 36
+# degrees a blade bends per pixel / second of wind + the most it bends
+GRASS_WIND_BEND = 0.6
+GRASS_WIND_MAX_BEND = 30
+# blades bend away from entities within this many pixels of their feet + the bend right at their feet (degrees)
+GRASS_PUSH_RADIUS = 14
+GRASS_PUSH_BEND = 40
+# blades are drawn live for this many seconds after the wind or an entity touched them
+GRASS_SETTLE = 1.0
+
+# -------------------------------------------------- #
+# wind
+
+# pixels per wind field cell
+WIND_CELL_SIZE = 16
+# cells the field reaches past the camera viewport
+WIND_FIELD_MARGIN = 4
+# how fast the field follows the winds (1 / seconds)
+WIND_RESPONSE = 4.0
+# wind slower than this (pixels / second) does not move anything
+WIND_CALM = 1.0
 
 # -------------------------------------------------- #
 # singletons
 
 PLAYER = None
+# the WindHandler grass + particles sample
+WIND = None
 
 # -------------------------------------------------- #
 # event + function wrappers
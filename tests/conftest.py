@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pygame
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks import harness
+
+# the engine reads ENGINE_HEADLESS on import -- boot before any test imports it
+FB = harness.boot()
+
+
+@pytest.fixture
+def bench():
+    """A fresh headless scene + layer, seeded"""
+    harness.seed(0)
+    return harness.Bench(FB)
+
+
+def make_surface(w: int = 19, h: int = 7):
+    """A surface with a different color + alpha on every pixel"""
+    surface = pygame.Surface((w, h), pygame.SRCALPHA, 32)
+    for x in range(w):
+        for y in range(h):
+            surface.set_at((x, y), (x * 13 % 256, y * 37 % 256, (x + y) * 5 % 256, (x * y) % 256))
+    return surface
@@ -1,7 +1,13 @@
+import os
+os.environ["ENGINE_HEADLESS"] = "1"
+
 import engine
+from engine import headless
 from engine.network import server
+from engine.handler import scenehandler
+from engine.window import Window
 
-from engine import scenehandler
+TICK_RATE = 30
 
 
 def add_entity(s, h, e):
@@ -9,11 +15,23 @@ def add_entity(s, h, e):
     s.send_to_all({"type": "CreateEntity", "data": e})
 
 
-def main(server):
+def create_world():
+    """Create the server scene - returns its entity handler"""
+    # scripts read the framebuffer dimensions on import
+    from scripts import singleton
+    from scripts.entities import mage, peasant, player
+
     __scene = scenehandler.Scene()
-    __handler = __scene.handler
+    scenehandler.SceneHandler.push_state(__scene)
+    __layer = __scene.add_layer()
+    __handler = __layer.handler
     # ----------------------------------- #
     # create world
+    # the ai targets the player -- stands in for the connected players
+    singleton.PLAYER = player.Player()
+    singleton.PLAYER.position.xy = (0, 0)
+    singleton.PLAYER.move_to_position()
+
     m = mage.Mage()
     m.position.xy = (100, 100)
 
@@ -23,12 +41,27 @@ def main(server):
     p2.position.xy = (100, 100)
 
     # ----------------------------------- #
+    __handler.add_entity(singleton.PLAYER)
     __handler.add_entity(m)
     __handler.add_entity(p)
     __handler.add_entity(p2)
+    return __handler
 
-SERVER = server.Server()
-SERVER.run()
-SERVER.close()
 
+def main(server):
+    create_world()
+    # ----------------------------------- #
+    # simulate in real time - no rendering
+    headless.run(fps=TICK_RATE, realtime=True)
+
+
+if __name__ == "__main__":
+    # ----------------------------------- #
+    # the server has no window - but scripts still need framebuffer dimensions
+    WW = 1280//3
+    Window.create_window("Server", 1280, int(1280/16*9), 0, 32)
+    fb = Window.create_framebuffer(WW, int(WW/16*9))
 
+    SERVER = server.Server()
+    SERVER.run(main)
+    SERVER.close()
@@ -0,0 +1,49 @@
+import pytest
+
+from engine.gamesystem import entity as gentity
+from engine.misc import clock
+
+from benchmarks import harness
+
+from conftest import FB
+
+
+class Walker(gentity.Entity):
+    """Walks right at a constant speed"""
+    SPEED = 120
+
+    def update(self):
+        self.rect.x += round(Walker.SPEED * clock.delta_time)
+
+
+def run(reduced_rate: int, frames: int = 60):
+    """Rendered x of a Walker every frame - 120 frames per second at 60 ticks per second"""
+    bench = harness.Bench(FB, fps=120)
+    e = Walker()
+    bench.handler.add_entity(e)
+    # full_dis = -1 --> always on the reduced tier
+    activity = gentity.ActivityTier(full_dis=-1, reduced_dis=1000, reduced_rate=reduced_rate)
+    clock.start(0, tick_rate=60)
+    drawn = []
+    for i in range(frames):
+        # the handler picks the activity up from EntityTypes when the entity is added
+        e.activity = activity
+        bench.frame(i)
+        drawn.append(e.get_glob_pos()[0])
+    clock.start(0)
+    return e, drawn
+
+
+def test_reduced_tier_catches_up_on_skipped_time():
+    full = run(1)[0]
+    reduced = run(3)[0]
+    assert abs(full.rect.x - reduced.rect.x) <= Walker.SPEED * 3 / 60
+
+
+@pytest.mark.parametrize("reduced_rate", [1, 3])
+def test_reduced_tier_interpolates_between_updates(reduced_rate):
+    drawn = run(reduced_rate)[1]
+    # once on the reduced tier, every frame draws the same step -- no snapping on update ticks
+    steps = [b - a for a, b in zip(drawn[20:], drawn[21:])]
+    assert max(steps) == pytest.approx(min(steps))
+    assert steps[0] == pytest.approx(Walker.SPEED / 120)
@@ -0,0 +1,70 @@
+import math
+
+from engine.graphics import animation
+from engine.misc import clock
+
+# registers the animation manifest
+from scripts import assets
+
+NAME = "peasant"
+
+
+def get_anim():
+    """The longest animation of the category, every frame the same duration"""
+    anims = animation.Category.get_category(NAME).anims.values()
+    anim = max(anims, key=lambda a: a.length)
+    assert anim.length > 2 and len(set(anim.durations.tolist())) == 1
+    return anim
+
+
+def queue(registry, dt: float, count: int, monkeypatch):
+    monkeypatch.setattr(clock, "delta_time", dt)
+    for i in range(count):
+        registry.update()
+
+
+def test_frames_change_at_the_next_step(monkeypatch):
+    anim = get_anim()
+    registry = anim.get_registry()
+    animation.AnimationClock.step()
+    queue(registry, anim.durations[0], 1, monkeypatch)
+    # update() only queues the time -- the frame changes when the next tick steps the clock
+    assert registry.fnum == 0
+    assert registry.get_frame_data() is anim.frames[0]
+    animation.AnimationClock.step()
+    assert registry.fnum == 1
+    assert registry.get_frame_data() is anim.frames[1]
+    animation.AnimationClock.step()
+    assert registry.fnum == 1
+
+
+def test_step_advances_every_frame_the_time_covers(monkeypatch):
+    anim = get_anim()
+    duration = anim.durations[0]
+    registry = anim.get_registry()
+    animation.AnimationClock.step()
+    # several updates in one tick
+    queue(registry, duration * 0.75, 3, monkeypatch)
+    animation.AnimationClock.step()
+    assert registry.fnum == 2
+    assert math.isclose(registry.tpass, duration * 0.25)
+    # past the end of the animation -- loops once + keeps the leftover
+    queue(registry, duration * (anim.length - 2), 1, monkeypatch)
+    animation.AnimationClock.step()
+    assert registry.fnum == 0
+    assert registry.has_finished() and not registry.has_finished()
+    assert math.isclose(registry.tpass, duration * 0.25)
+
+
+def test_reloaded_categories_reuse_their_durations():
+    registries = [a.get_registry() for a in animation.Category.get_category(NAME).anims.values()]
+    size = len(animation.AnimationClock.durations)
+    for i in range(3):
+        animation.Category.remove_category(NAME)
+        category = animation.Category.get_category(NAME)
+        registries = [a.get_registry() for a in category.anims.values()]
+        assert len(animation.AnimationClock.durations) == size
+    for registry in registries:
+        offset = registry.parent.clock_offset
+        assert animation.AnimationClock.durations[offset:offset + registry.parent.length].tolist() == \
+            registry.parent.durations.tolist()
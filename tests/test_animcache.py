@@ -0,0 +1,34 @@
+import os
+
+import pygame
+
+from engine import singleton
+from engine.graphics import animation, animcache, rawimage
+
+from conftest import make_surface
+
+GRASS = os.path.join("assets", "sprites", "grass.json")
+
+
+def test_animcache_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(singleton, "ANIMATION_CACHE_DIR", str(tmp_path))
+    source = animcache.AnimationSource(GRASS)
+    parsed = animation.parse_frame_data(source.data["frames"])
+    # analysed data the cache has to keep
+    for anims in parsed.values():
+        for frames in anims.values():
+            for i, frame in enumerate(frames):
+                frame.ohitbox = pygame.Rect(i, 1, 3, 4)
+                frame.points = {"handler": (i, 2)}
+    sheet = make_surface()
+    assert animcache.read(source) is None
+    animcache.save(source, source.data["meta"], parsed, sheet)
+    metadata, loaded, loaded_sheet = animcache.load(source, animation.FrameData)
+    assert metadata == source.data["meta"]
+    assert rawimage.get_pixels(loaded_sheet) == rawimage.get_pixels(sheet)
+    assert loaded.keys() == parsed.keys()
+    for cat, anims in parsed.items():
+        assert loaded[cat].keys() == anims.keys()
+        for anim, frames in anims.items():
+            assert [animcache.frame_to_dict(f) for f in loaded[cat][anim]] == \
+                   [animcache.frame_to_dict(f) for f in frames]
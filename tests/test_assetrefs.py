@@ -0,0 +1,52 @@
+import os
+
+from engine.graphics import animation
+from engine.handler import scenehandler
+from engine.handler.filehandler import AssetHandle, AssetRefs, Filehandler
+
+# registers the animation manifest
+from scripts import assets
+
+SHARED = os.path.join("assets", "particles", "particle_blast5.png")
+OWN = os.path.join("assets", "particles", "particle_blast6.png")
+NAME = "peasant"
+
+
+def test_popped_scenes_unload_what_only_they_used():
+    SceneHandler = scenehandler.SceneHandler
+    # scenes of earlier tests let go of everything
+    SceneHandler.clean()
+    assert NAME not in animation.Category.CATEGORIES
+    first, second = scenehandler.Scene(), scenehandler.Scene()
+    SceneHandler.push_state(first)
+    Filehandler.get_image(SHARED)
+    SceneHandler.push_state(second)
+    Filehandler.get_image(SHARED)
+    Filehandler.get_image(OWN)
+    animation.Category.get_category(NAME)
+    assert AssetRefs.COUNTS[("image", SHARED)] == 2
+    assert AssetRefs.COUNTS[("image", OWN)] == AssetRefs.COUNTS[("category", NAME)] == 1
+    # popping the second scene keeps what the first one still uses
+    assert SceneHandler.pop_state() is second
+    assert SceneHandler.CURRENT is first and AssetRefs.OWNER is first
+    assert SHARED in Filehandler.LOADED_IMAGES
+    assert OWN not in Filehandler.LOADED_IMAGES
+    assert NAME not in animation.Category.CATEGORIES
+    assert SceneHandler.pop_state() is first
+    assert SHARED not in Filehandler.LOADED_IMAGES
+    assert ("image", SHARED) not in AssetRefs.COUNTS
+    assert AssetRefs.OWNER is None
+
+
+def test_handles_keep_assets_past_their_scene():
+    SceneHandler = scenehandler.SceneHandler
+    SceneHandler.clean()
+    scene = scenehandler.Scene()
+    SceneHandler.push_state(scene)
+    Filehandler.get_image(OWN)
+    handle = AssetHandle("image", OWN)
+    SceneHandler.pop_state()
+    assert OWN in Filehandler.LOADED_IMAGES
+    handle.release()
+    handle.release()
+    assert OWN not in Filehandler.LOADED_IMAGES
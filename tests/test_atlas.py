@@ -0,0 +1,48 @@
+import os
+
+from engine import singleton
+from engine.graphics import animation, atlas, rawimage
+from engine.handler.filehandler import Filehandler
+
+# registers the animation manifest
+from scripts import assets
+
+NAME = "peasant"
+SHEET = os.path.join("assets", "sprites", "peasant.png")
+
+
+def reload(name: str):
+    """Unload + load a category again"""
+    animation.Category.remove_category(name)
+    Filehandler.unload_image(SHEET)
+    atlas.Atlas.INDEX = None
+    return animation.Category.get_category(name)
+
+
+def get_frames(category):
+    return [f for name in sorted(category.anims) for f in category.anims[name].frames]
+
+
+def test_packed_categories_do_not_keep_their_sheet(tmp_path, monkeypatch):
+    monkeypatch.setattr(singleton, "ATLAS_DIR", str(tmp_path))
+    monkeypatch.setattr(singleton, "ATLAS", False)
+    try:
+        sheet = reload(NAME)
+        assert SHEET in Filehandler.LOADED_IMAGES
+        expected = [rawimage.get_pixels(f.oframe) for f in get_frames(sheet)]
+        atlas.Atlas.build([sheet], str(tmp_path))
+        monkeypatch.setattr(singleton, "ATLAS", True)
+        packed = reload(NAME)
+        assert SHEET not in Filehandler.LOADED_IMAGES
+        assert all(h.key != SHEET for h in packed.handles)
+        assert all(anim.sprite is None for anim in packed.anims.values())
+        frames = get_frames(packed)
+        assert [rawimage.get_pixels(f.oframe) for f in frames] == expected
+        # blits can use the page + area
+        for f in frames:
+            page, area = f.get_atlas_frame()
+            assert page is not f.frame
+            assert rawimage.get_pixels(page.subsurface(area)) == rawimage.get_pixels(f.frame)
+    finally:
+        monkeypatch.undo()
+        reload(NAME)
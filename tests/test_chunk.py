@@ -0,0 +1,67 @@
+import numpy as np
+import pygame
+import pytest
+
+from engine import singleton
+from engine.gamesystem import entity as gentity
+from engine.world import chunk
+
+
+@pytest.mark.parametrize("x, y", [(0, 0), (1, -1), (-1, 1), (-32768, 32767), (32767, -32768), (123, -4567)])
+def test_pack_key_round_trips(x, y):
+    assert chunk.unpack_key(chunk.pack_key(x, y)) == (x, y)
+
+
+def test_pack_key_is_unique_around_the_origin():
+    keys = {chunk.pack_key(x, y) for x in range(-20, 21) for y in range(-20, 21)}
+    assert len(keys) == 41 * 41
+
+
+def test_world_chunks_use_pack_key(bench):
+    c = bench.world.get_chunk(-3, 7)
+    assert bench.world.chunks[chunk.pack_key(-3, 7)] is c
+    assert bench.world.peek_chunk(-3, 7) is c
+    assert bench.world.peek_chunk(7, -3) is None
+
+
+def scatter_entities(bench, count: int, seed: int = 0):
+    """Entities with random hitboxes around the origin, binned by their top left like World.move_entity"""
+    rng = np.random.default_rng(seed)
+    spread = singleton.CHUNK_PIX_WIDTH * 3
+    result = []
+    for i in range(count):
+        e = gentity.Entity()
+        e.priority = i == 0
+        e.rect.update(*rng.integers(-spread, spread, 2).tolist(), 16, 16)
+        e.hitbox.update(*rng.integers(0, 8, 2).tolist(), *rng.integers(1, 24, 2).tolist())
+        e.rel_hitbox.update(e.rect.x + e.hitbox.x, e.rect.y + e.hitbox.y, e.hitbox.w, e.hitbox.h)
+        e.p_chunk = [e.rect.x // singleton.CHUNK_PIX_WIDTH, e.rect.y // singleton.CHUNK_PIX_HEIGHT]
+        bench.handler.add_entity(e)
+        result.append(e)
+    bench.handler.handle_changes()
+    return result
+
+
+def ids(entities):
+    """Ids of the found entities - each found once"""
+    result = [e.id for e in entities]
+    assert len(result) == len(set(result))
+    return set(result)
+
+
+def test_query_rect_matches_a_full_scan(bench):
+    entities = scatter_entities(bench, 300)
+    for rect in [pygame.Rect(-50, -70, 40, 30), pygame.Rect(0, 0, 1, 1), pygame.Rect(-400, 100, 900, 250),
+                 pygame.Rect(entities[0].rel_hitbox)]:
+        assert ids(bench.world.query_rect(rect)) == ids(e for e in entities[1:] if rect.colliderect(e.rel_hitbox))
+        # the priority entity (player) only when asked for
+        assert ids(bench.world.query_rect(rect, include_priority=True)) == \
+            ids(e for e in entities if rect.colliderect(e.rel_hitbox))
+
+
+def test_query_radius_matches_a_full_scan(bench):
+    entities = scatter_entities(bench, 300)
+    for center, radius in [((0, 0), 40), ((-123.5, 87.25), 70.5), ((300, -300), 0), ((10, 10), 500)]:
+        assert ids(bench.world.query_radius(center, radius)) == \
+            ids(e for e in entities[1:]
+                if (e.rel_hitbox.centerx - center[0]) ** 2 + (e.rel_hitbox.centery - center[1]) ** 2 <= radius ** 2)
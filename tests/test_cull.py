@@ -0,0 +1,46 @@
+import numpy as np
+import pygame
+
+from engine import singleton
+from engine.gamesystem import entity as gentity
+
+
+def add_entities(bench, count: int, seed: int = 0):
+    """Entities with random hitboxes around the origin"""
+    rng = np.random.default_rng(seed)
+    result = []
+    for i in range(count):
+        e = gentity.Entity()
+        e.rel_hitbox.update(*rng.integers(-600, 600, 2).tolist(), *rng.integers(1, 40, 2).tolist())
+        bench.handler.add_entity(e)
+        result.append(e)
+    bench.handler.handle_changes()
+    return result
+
+
+def test_cull_keeps_entities_touching_the_viewport_margin(bench):
+    entities = add_entities(bench, 400)
+    viewport = pygame.Rect(-100, -80, 320, 180)
+    bench.layer.camera.viewport = viewport
+    reach = viewport.inflate(singleton.CULL_MARGIN * 2, singleton.CULL_MARGIN * 2)
+    # never culled, even far away
+    entities[0].cullable = False
+    entities[0].rel_hitbox.topleft = (5000, 5000)
+    expected = {e.id for e in entities if reach.colliderect(e.rel_hitbox) or not e.cullable}
+    handler = bench.handler
+    handler.reset_cull_count()
+    visible = handler.cull_entities(handler.entities)
+    assert {e.id for e in visible} == expected
+    assert 0 < len(expected) < len(entities)
+    assert handler.culled == len(entities) - len(expected)
+    # a new frame starts counting again
+    handler.reset_cull_count()
+    assert handler.last_culled == len(entities) - len(expected) and handler.culled == 0
+
+
+def test_cull_skips_removed_entities(bench):
+    entities = add_entities(bench, 20)
+    bench.layer.camera.viewport = pygame.Rect(-1000, -1000, 2000, 2000)
+    bench.handler.remove_entity(entities[3].id)
+    visible = bench.handler.cull_entities(bench.handler.entities)
+    assert {e.id for e in visible} == {e.id for e in entities} - {entities[3].id}
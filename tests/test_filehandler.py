@@ -0,0 +1,45 @@
+import os
+
+import pygame
+
+from engine.graphics import rawimage, surfcache
+from engine.handler.filehandler import Filehandler
+
+IMAGE = os.path.join("assets", "particles", "particle_blast1.png")
+
+
+def test_derived_images_are_cached_per_transform():
+    Filehandler.unload_image(IMAGE)
+    cache = Filehandler.DERIVED_IMAGES
+    hits, misses = cache.hits, cache.misses
+    image = Filehandler.get_image(IMAGE)
+    w, h = image.get_size()
+    scaled = Filehandler.get_image_and_scale_float(IMAGE, [1.5, 2])
+    assert Filehandler.get_image_and_scale_float(IMAGE, [1.5, 2]) is scaled
+    assert rawimage.get_pixels(scaled) == rawimage.get_pixels(pygame.transform.scale(image, (int(w * 1.5), h * 2)))
+    rotated = Filehandler.get_image_rotated(IMAGE, 30)
+    assert Filehandler.get_image_rotated(IMAGE, 30) is rotated
+    assert rawimage.get_pixels(rotated) == rawimage.get_pixels(pygame.transform.rotate(image, 30))
+    flipped = Filehandler.get_image_flipped(IMAGE, True)
+    assert Filehandler.get_image_flipped(IMAGE, 1, 0) is flipped
+    assert rawimage.get_pixels(flipped) == rawimage.get_pixels(pygame.transform.flip(image, True, False))
+    assert (cache.hits - hits, cache.misses - misses) == (3, 3)
+    # unloading the image drops what was made from it
+    Filehandler.unload_image(IMAGE)
+    assert not [key for key in cache.surfaces if key[0] == IMAGE]
+
+
+def test_derived_images_stay_in_budget(monkeypatch):
+    Filehandler.unload_image(IMAGE)
+    cache = Filehandler.DERIVED_IMAGES
+    w, h = Filehandler.get_image(IMAGE).get_size()
+    size = surfcache.get_surface_bytes(Filehandler.get_image_and_scale_float(IMAGE, [2, 2]))
+    # room for one of the scaled images
+    monkeypatch.setattr(cache, "budget", size * 3 // 2)
+    evictions = cache.evictions
+    Filehandler.get_image_and_scale_float(IMAGE, [2, 1.5])
+    assert cache.bytes <= cache.budget
+    assert cache.evictions > evictions
+    assert (IMAGE, "scale", ((w * 2, h * 2),)) not in cache.surfaces
+    assert (IMAGE, "scale", ((w * 2, int(h * 1.5)),)) in cache.surfaces
+    Filehandler.unload_image(IMAGE)
@@ -0,0 +1,51 @@
+import pygame
+
+from engine.graphics import animation, rawimage
+
+# registers the animation manifest
+from scripts import assets, singleton
+
+NAME = "mage"
+
+
+def get_frames():
+    category = animation.Category.get_category(NAME)
+    return [f for name in sorted(category.anims) for f in category.anims[name].frames]
+
+
+def test_flipped_frames_mirror_the_frame():
+    for f in get_frames():
+        flipped = f.get_frame(True)
+        assert flipped is f.get_frame(True)
+        assert rawimage.get_pixels(flipped) == rawimage.get_pixels(pygame.transform.flip(f.get_frame(), True, False))
+
+
+def test_flipped_hitboxes_and_points_mirror_the_frame():
+    for f in get_frames():
+        w = f.get_frame().get_width()
+        hitbox, fhitbox = f.get_hitbox(), f.get_hitbox(True)
+        assert (fhitbox.left, fhitbox.right) == (w - hitbox.right, w - hitbox.left)
+        assert (fhitbox.y, fhitbox.h) == (hitbox.y, hitbox.h)
+        x, y = f.get_point(singleton.HANDLE_IDENTIFIER)
+        assert f.get_point(singleton.HANDLE_IDENTIFIER, True) == (f.oframe.get_width() - 1 - x, y)
+
+
+def test_rescaling_rebuilds_the_flipped_variants():
+    animation.Category.remove_category(NAME)
+    f = get_frames()[0]
+    f.get_frame(True), f.get_hitbox(True)
+    f.rescale_sprite(2)
+    assert f.get_frame(True).get_size() == f.get_frame().get_size() == \
+        (f.oframe.get_width() * 2, f.oframe.get_height() * 2)
+    assert rawimage.get_pixels(f.get_frame(True)) == \
+        rawimage.get_pixels(pygame.transform.flip(f.get_frame(), True, False))
+    assert f.get_hitbox(True).right == f.get_frame().get_width() - f.get_hitbox().left
+    # other tests get an unscaled category
+    animation.Category.remove_category(NAME)
+
+
+def test_registry_passes_flip_through():
+    registry = next(iter(animation.Category.get_category(NAME).anims.values())).get_registry()
+    data = registry.get_frame_data()
+    assert registry.get_frame(True) is data.get_frame(True)
+    assert registry.get_hitbox(True) is data.get_hitbox(True)
@@ -0,0 +1,255 @@
+import numpy as np
+import pygame
+
+from engine import singleton as EGLOB
+from scripts import singleton
+from scripts.environment import grass
+
+TILE = singleton.GRASS_TILE_SIZE
+
+
+def make_grass(bench):
+    """A grass handler at the world origin, added to the bench world"""
+    GG = grass.GrassHandler("assets/sprites/grass.json")
+    bench.world.add_env_obj(GG)
+    bench.world.env.handle_changes()
+    return GG
+
+
+def random_blades(count: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return (rng.integers(0, EGLOB.CHUNK_PIX_WIDTH, count), rng.integers(0, EGLOB.CHUNK_PIX_HEIGHT, count),
+            rng.integers(0, 2, count))
+
+
+def check_tiles(GG):
+    """Every tile slice holds exactly the blades of that tile + the bounds match them"""
+    blades = GG.get_blades()
+    tiles = grass.GrassHandler.get_tiles(blades["x"], blades["y"])
+    assert np.all(np.diff(tiles) >= 0)
+    for t in np.unique(tiles).tolist():
+        s, e = GG.tile_starts[t], GG.tile_starts[t + 1]
+        assert np.all(tiles[s:e] == t)
+        assert tuple(GG.tile_area[t]) == (blades["x"][s:e].min(), blades["y"][s:e].min(),
+                                          blades["x"][s:e].max(), blades["y"][s:e].max())
+    assert GG.tile_starts[-1] == GG.grass_count
+
+
+def test_get_tiles_is_row_major_and_clamped():
+    columns, rows = grass.GrassHandler.TILE_COLUMNS, grass.GrassHandler.TILE_ROWS
+    assert grass.GrassHandler.get_tiles(0, 0) == 0
+    assert grass.GrassHandler.get_tiles(TILE - 1, TILE - 1) == 0
+    assert grass.GrassHandler.get_tiles(TILE, 0) == 1
+    assert grass.GrassHandler.get_tiles(0, TILE) == columns
+    assert grass.GrassHandler.get_tiles(TILE * 2 + 3, TILE * 3 + 5) == 2 + 3 * columns
+    # blades outside the chunk belong to the closest edge tile
+    assert grass.GrassHandler.get_tiles(-5, -5) == 0
+    assert grass.GrassHandler.get_tiles(EGLOB.CHUNK_PIX_WIDTH * 2, EGLOB.CHUNK_PIX_HEIGHT * 2) == columns * rows - 1
+
+
+def test_add_grass_inserts_at_the_end_of_its_tile(bench):
+    GG = make_grass(bench)
+    x, y, var = random_blades(300)
+    for i in range(len(x)):
+        GG.add_grass(int(x[i]), int(y[i]))
+    check_tiles(GG)
+    # blades of one tile keep the order they were added in
+    blades = GG.get_blades()
+    tiles = grass.GrassHandler.get_tiles(x, y)
+    for t in np.unique(tiles)[:10].tolist():
+        s, e = GG.tile_starts[t], GG.tile_starts[t + 1]
+        assert blades["x"][s:e].tolist() == x[tiles == t].tolist()
+        assert blades["y"][s:e].tolist() == y[tiles == t].tolist()
+
+
+def test_add_blades_matches_add_grass(bench):
+    single, bulk = make_grass(bench), make_grass(bench)
+    x, y, var = random_blades(200)
+    for i in range(len(x)):
+        single.add_grass(int(x[i]), int(y[i]))
+    # the random variations add_grass picked, in the order the blades were given
+    order = np.argsort(grass.GrassHandler.get_tiles(x, y), kind="stable")
+    bulk.add_blades(x[:50], y[:50], single.get_blades()["var"][np.argsort(order)][:50])
+    bulk.add_blades(x[50:], y[50:], single.get_blades()["var"][np.argsort(order)][50:])
+    assert bulk.get_blades().tolist() == single.get_blades().tolist()
+    assert np.array_equal(bulk.tile_starts, single.tile_starts)
+    assert np.array_equal(bulk.tile_area, single.tile_area)
+
+
+def test_remove_blades_compacts_in_order(bench):
+    GG = make_grass(bench)
+    x, y, var = random_blades(400)
+    GG.add_blades(x, y, var)
+    before = GG.get_blades().copy()
+    area = (TILE, TILE, TILE * 2 + 7, TILE + 3)
+    inside = ((before["x"] >= area[0]) & (before["x"] < area[0] + area[2]) &
+              (before["y"] >= area[1]) & (before["y"] < area[1] + area[3]))
+    assert GG.remove_blades(area) == np.count_nonzero(inside) > 0
+    assert GG.get_blades().tolist() == before[~inside].tolist()
+    check_tiles(GG)
+    assert GG.remove_blades(area) == 0
+
+
+def test_visible_blades_cover_the_viewport(bench):
+    GG = make_grass(bench)
+    x, y, var = random_blades(1000)
+    GG.add_blades(x, y, var)
+    w, h = GG.assets.get_max_size()
+    margin = EGLOB.CULL_MARGIN
+    viewport = pygame.Rect(TILE * 3, TILE * 2, TILE * 2, TILE * 2)
+    bench.layer.camera.viewport = viewport
+    visible = GG.get_visible_blades()
+    # every blade whose sprite reaches into the viewport + margin is drawn
+    blades = GG.get_blades()
+    reach = viewport.inflate(margin * 2, margin * 2)
+    needed = ((blades["x"] < reach.right) & (blades["x"] + w > reach.left) &
+              (blades["y"] < reach.bottom) & (blades["y"] + h > reach.top))
+    assert set(map(tuple, blades[needed].tolist())) <= set(map(tuple, visible.tolist()))
+    assert 0 < len(visible) < GG.grass_count
+    # a viewport away from the grass draws nothing
+    bench.layer.camera.viewport = pygame.Rect(-EGLOB.CHUNK_PIX_WIDTH * 4, 0, TILE, TILE)
+    assert len(GG.get_visible_blades()) == 0
+
+
+def test_entities_push_blades_aside(bench):
+    from engine.gamesystem import entity as gentity
+    GG = make_grass(bench)
+    w, h = GG.assets.get_max_size()
+    # a row of blades rooted at y = 48
+    GG.add_blades(np.arange(0, 200, 4), np.full(50, 48 - h), np.zeros(50, dtype=np.uint8))
+    walker = gentity.Entity()
+    walker.rect.update(100, 40, 8, 8)
+    walker.rel_hitbox.update(walker.rect)
+    bench.handler.add_entity(walker)
+    bench.handler.handle_changes()
+    GG.update()
+    assert GG.pushers == [walker.rel_hitbox.midbottom]
+    blades = GG.get_blades()
+    angles = GG.get_angles(blades["x"], 0)
+    bent = GG.bend(blades, angles.copy()) - angles
+    roots = blades["x"] + w // 2
+    # blades lean away from the entity, far blades do not move
+    assert np.all(bent[roots < walker.rel_hitbox.centerx] <= 0)
+    assert np.all(bent[roots > walker.rel_hitbox.centerx] >= 0)
+    assert np.any(bent != 0)
+    assert np.all(bent[np.abs(roots - walker.rel_hitbox.centerx) > singleton.GRASS_PUSH_RADIUS] == 0)
+
+
+def test_pushed_blades_stay_in_the_rotation_table(bench):
+    GG = make_grass(bench)
+    low, high = GG.assets.angle_range
+    w, h = GG.assets.get_max_size()
+    # a blade at the top of its sway, pushed right from its root
+    GG.add_blades(np.array([100]), np.array([48 - h]), np.zeros(1, dtype=np.uint8))
+    GG.pushers = [(100 + w // 2 - 1, 48)]
+    blades = GG.get_blades()
+    angles = GG.bend(blades, np.array([-15.0]))
+    assert angles[0] == high
+    assert GG.assets.get_sprites(blades["var"], angles) == [GG.assets.get_image(0, -1)]
+    # pushed the other way from the bottom of the table
+    GG.pushers = [(100 + w // 2 + 1, 48)]
+    angles = GG.bend(blades, np.array([low + 10.0]))
+    assert angles[0] == low
+    assert GG.assets.get_sprites(blades["var"], angles) == [GG.assets.get_image(0, 0)]
+
+
+def test_wind_on_pushed_blades_stays_in_the_rotation_table(bench, monkeypatch):
+    from scripts.environment import wind
+    GG = make_grass(bench)
+    high = GG.assets.angle_range[1]
+    w, h = GG.assets.get_max_size()
+    GG.add_blades(np.array([100]), np.array([48 - h]), np.zeros(1, dtype=np.uint8))
+    # a gale blowing right over the whole field
+    WH = wind.WindHandler()
+    WH.field.velocity[..., 0] = 1000
+    WH.field.peak = 1000
+    monkeypatch.setattr(singleton, "WIND", WH)
+    blades = GG.get_blades()
+    assert GG.bend(blades, np.array([-15.0]))[0] == -15 + singleton.GRASS_WIND_MAX_BEND
+    # pushed + blown past the end of the table
+    GG.pushers = [(100 + w // 2 - 1, 48)]
+    angles = GG.bend(blades, np.array([-15.0]))
+    assert angles[0] == high
+    assert GG.assets.get_sprites(blades["var"], angles) == [GG.assets.get_image(0, -1)]
+
+
+def test_the_player_pushes_blades_too(bench):
+    from benchmarks import scenarios
+    GG = make_grass(bench)
+    w, h = GG.assets.get_max_size()
+    GG.add_blades(np.arange(0, 200, 4), np.full(50, 48 - h), np.zeros(50, dtype=np.uint8))
+    player = scenarios.spawn_player(bench, 100, 30)
+    bench.handler.handle_changes()
+    player.calculate_rel_hitbox()
+    GG.update()
+    assert GG.pushers == [player.rel_hitbox.midbottom]
+
+
+def test_get_sprites_matches_get_sprite(bench):
+    GG = make_grass(bench)
+    low, high = GG.assets.angle_range
+    rng = np.random.default_rng(1)
+    variations = rng.integers(0, GG.assets.variations, 500)
+    angles = np.r_[rng.uniform(low, high, 496), low, high, -45.5, -45.0]
+    assert GG.assets.get_sprites(variations, angles) == \
+        [GG.assets.get_sprite(v, a) for v, a in zip(variations.tolist(), angles.tolist())]
+
+
+def test_render_matches_the_per_blade_path(bench, monkeypatch):
+    from math import sin
+    from engine.misc import clock
+    GG = make_grass(bench)
+    x, y, var = random_blades(400)
+    GG.add_blades(x, y, var)
+    monkeypatch.setattr(singleton, "GRASS_BAKED", False)
+    monkeypatch.setattr(clock, "run_time", 12.3)
+    bench.layer.camera.viewport = pygame.Rect(-100, -100, EGLOB.CHUNK_PIX_WIDTH * 2, EGLOB.CHUNK_PIX_HEIGHT * 2)
+    queue = bench.layer.render_queue
+    queue.clear()
+    GG.render(bench.fb)
+    # what the dict of per blade lists drew, in the order the blades are stored
+    cpos = GG.get_glob_pos()
+    expected = [(GG.assets.get_sprite(v, sin(12.3 + bx) * 30 - 45), (cpos[0] + bx, cpos[1] + by), None, 0)
+                for bx, by, v in GG.get_blades().tolist()]
+    assert queue.items == expected
+    queue.clear()
+
+
+def test_baked_keyframes_match_live_blades(bench, monkeypatch):
+    from engine.graphics import rawimage
+    from engine.misc import clock
+    GG = make_grass(bench)
+    x, y, var = random_blades(300, seed=3)
+    GG.add_blades(x, y, var)
+    bench.layer.camera.viewport = pygame.Rect(-100, -100, EGLOB.CHUNK_PIX_WIDTH * 2, EGLOB.CHUNK_PIX_HEIGHT * 2)
+    queue = bench.layer.render_queue
+    keyframe = 5
+    monkeypatch.setattr(clock, "run_time", keyframe * grass.GrassHandler.PERIOD / singleton.GRASS_KEYFRAMES)
+    # the live blades drawn into a surface the size of the bake area
+    monkeypatch.setattr(singleton, "GRASS_BAKED", False)
+    queue.clear()
+    GG.render(bench.fb)
+    area = GG.get_bake_area()
+    cpos = GG.get_glob_pos()
+    expected = pygame.Surface(area.size, pygame.SRCALPHA, 32)
+    expected.blits([(s, (dx - cpos[0] - area.x, dy - cpos[1] - area.y)) for s, (dx, dy), a, f in queue.items])
+    # baked -- one keyframe image at the bake area, made once
+    monkeypatch.setattr(singleton, "GRASS_BAKED", True)
+    queue.clear()
+    GG.render(bench.fb)
+    GG.render(bench.fb)
+    assert len(queue.items) == 2 and queue.items[0] == queue.items[1]
+    image, dest = queue.items[0][:2]
+    assert dest == (cpos[0] + area.x, cpos[1] + area.y)
+    assert rawimage.get_pixels(image) == rawimage.get_pixels(expected)
+    # new blades make new keyframes
+    GG.add_blades(np.array([5]), np.array([5]), np.zeros(1, dtype=np.uint8))
+    queue.clear()
+    GG.render(bench.fb)
+    assert queue.items[0][0] is not image
+    # disturbed grass is drawn live
+    GG.disturb(1.0)
+    queue.clear()
+    GG.render(bench.fb)
+    assert len(queue.items) == GG.grass_count
+    queue.clear()
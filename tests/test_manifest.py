@@ -0,0 +1,52 @@
+import subprocess
+import sys
+
+import pytest
+
+from engine.graphics import animation
+
+# registers the animation manifest
+from scripts import assets
+from scripts.entities import peasant
+
+from conftest import ROOT
+
+NAME = "peasant"
+
+
+def test_importing_entities_loads_no_assets():
+    script = ("from benchmarks import harness; harness.boot()\n"
+              "import scripts.entities.mage, scripts.entities.peasant, scripts.entities.player\n"
+              "import scripts.attacks.fireball\n"
+              "from engine.graphics import animation\n"
+              "from engine.handler.filehandler import Filehandler\n"
+              "assert animation.AnimationManifest.ENTRIES\n"
+              "print(len(animation.Category.CATEGORIES), len(Filehandler.LOADED_IMAGES))\n")
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split()[-2:] == ["0", "0"]
+
+
+def test_handles_load_on_first_use():
+    animation.Category.remove_category(NAME)
+    handle = animation.AnimationManifest.get_handle(NAME)
+    # the handle entity classes keep
+    assert handle is peasant.Peasant.ANIM_CATEGORY
+    assert not handle.is_loaded() and handle.category is None
+    # any attribute of the category loads it
+    anims = handle.anims
+    assert handle.is_loaded()
+    assert anims is animation.Category.CATEGORIES[NAME].anims
+    assert animation.Category.get_category(NAME) is handle.get()
+
+
+def test_preload_reports_progress():
+    for name in ("peasant", "mage"):
+        animation.Category.remove_category(name)
+    assert list(animation.AnimationManifest.iter_preload(["peasant", "mage"])) == [(1, 2), (2, 2)]
+    assert {"peasant", "mage"} <= animation.Category.CATEGORIES.keys()
+
+
+def test_unknown_categories_raise():
+    with pytest.raises(KeyError):
+        animation.AnimationManifest.load("not-a-category")
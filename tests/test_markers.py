@@ -0,0 +1,70 @@
+import numpy as np
+import pygame
+import pytest
+
+from engine import singleton
+from engine.graphics import animation, rawimage
+
+H, V, P = singleton.HORIZONTAL_HITBOX_COL, singleton.VERTICAL_HITBOX_COL, (0, 255, 0)
+
+
+def make_sheet(w: int, h: int, seed: int):
+    """Random pixels with a few markers of each color - some with the wrong alpha"""
+    rng = np.random.default_rng(seed)
+    sheet = pygame.Surface((w, h), pygame.SRCALPHA, 32)
+    pixels = rng.integers(0, 200, (w, h, 4))
+    for x, y, c in zip(rng.integers(0, w, 12), rng.integers(0, h, 12), rng.integers(0, 3, 12)):
+        pixels[x, y] = (H, V, P)[c] + (255 if rng.random() < 0.8 else 100,)
+    for x in range(w):
+        for y in range(h):
+            sheet.set_at((x, y), pixels[x, y].tolist())
+    return sheet
+
+
+def get_at_scan(image, area, color, columns, rows):
+    """The first pixel of a color - columns outer, rows inner - cleared like the old loops did"""
+    for x in columns:
+        for y in rows:
+            if image.get_at((area.x + x, area.y + y)) == color:
+                image.set_at((area.x + x, area.y + y), (0, 0, 0, 0))
+                return x, y
+    return None
+
+
+def get_at_hitbox(image, area):
+    """The hitbox scan before SheetMarkers"""
+    w, h = area.size
+    result = pygame.Rect(0, 0, w, h)
+    left = get_at_scan(image, area, H, range(w // 2), range(h))
+    result.x = left[0] + 1 if left else 0
+    right = get_at_scan(image, area, H, range(w - 1, w // 2 - 1, -1), range(h))
+    result.w = (right[0] if right else w) - result.x
+    top = get_at_scan(image, area, V, range(w), range(h // 2))
+    result.y = top[1] + 1 if top else 0
+    bottom = get_at_scan(image, area, V, range(w), range(h - 1, h // 2 - 1, -1))
+    result.h = (bottom[1] if bottom else h) - result.y
+    return result
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_image_scan_matches_get_at(seed):
+    image = make_sheet(23, 17, seed)
+    expected = image.copy()
+    hitbox = get_at_hitbox(expected, expected.get_rect())
+    point = get_at_scan(expected, expected.get_rect(), P, range(23), range(17)) or (0, 0)
+    assert animation.find_and_remove_image_hitbox(image) == hitbox
+    assert animation.find_and_remove_image_points(image, {"handle": P}) == {"handle": point}
+    assert rawimage.get_pixels(image) == rawimage.get_pixels(expected)
+
+
+def test_sheet_scan_matches_get_at_per_frame():
+    sheet = make_sheet(64, 30, 42)
+    expected = sheet.copy()
+    frames = [pygame.Rect(x, y, 16, 15) for y in (0, 15) for x in (0, 16, 32, 48)]
+    markers = animation.SheetMarkers(sheet)
+    for area in frames:
+        assert markers.find_hitbox(area) == get_at_hitbox(expected, area)
+        point = get_at_scan(expected, area, P, range(area.w), range(area.h)) or (0, 0)
+        assert markers.find_points(area, {"handle": P}) == {"handle": point}
+    markers.clear()
+    assert rawimage.get_pixels(sheet) == rawimage.get_pixels(expected)
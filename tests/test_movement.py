@@ -0,0 +1,53 @@
+import pygame
+import pytest
+
+from engine.misc import clock
+
+from benchmarks import harness
+from scripts import entityext
+
+from conftest import FB
+
+
+class Pushed(entityext.GameEntity):
+    """Accelerates the same way the game entities do"""
+    ACCEL = pygame.math.Vector2(90, -30)
+    KEEP = 0.3
+
+    def __init__(self):
+        super().__init__("pushed", 1, 1)
+
+    def update(self):
+        self.motion += Pushed.ACCEL * clock.delta_time
+        entityext.move_and_damp(self, Pushed.KEEP)
+
+
+def run(fps: int, seconds: float = 1.0):
+    """Position + motion of a Pushed entity after <seconds> at <fps> ticks per second"""
+    bench = harness.Bench(FB, fps=fps)
+    e = Pushed()
+    bench.handler.add_entity(e)
+    clock.start(0)
+    for i in range(round(seconds * fps)):
+        bench.frame(i)
+    return tuple(e.position), tuple(e.motion)
+
+
+def test_move_and_damp_matches_per_tick_damping():
+    # one MOVE_RATE tick = the plain "move, motion *= keep" loop
+    position, motion = pygame.math.Vector2(), pygame.math.Vector2()
+    for i in range(entityext.MOVE_RATE):
+        motion += Pushed.ACCEL / entityext.MOVE_RATE
+        position += motion
+        motion *= Pushed.KEEP
+    result = run(entityext.MOVE_RATE)
+    assert result[0] == pytest.approx(tuple(position))
+    assert result[1] == pytest.approx(tuple(motion))
+
+
+@pytest.mark.parametrize("fps", [20, 30, 120])
+def test_move_and_damp_is_tick_rate_independent(fps):
+    reference = run(entityext.MOVE_RATE)
+    result = run(fps)
+    assert result[0] == pytest.approx(reference[0])
+    assert result[1] == pytest.approx(reference[1])
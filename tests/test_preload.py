@@ -0,0 +1,55 @@
+import os
+
+import pygame
+
+from engine.graphics import animation, rawimage
+from engine.handler.filehandler import Filehandler
+
+# registers the animation manifest
+from scripts import assets
+
+NAME = "peasant"
+IMAGE = os.path.join("assets", "particles", "particle_blast1.png")
+
+
+def get_frames(category):
+    return [rawimage.get_pixels(f.get_frame(0)) for name in sorted(category.anims)
+            for f in category.anims[name].frames]
+
+
+def test_background_loading_matches_loading_in_place(bench):
+    animation.Category.remove_category(NAME)
+    category = animation.Category.get_category(NAME)
+    expected = get_frames(category)
+    hitboxes = [tuple(f.hitbox) for anim in category.anims.values() for f in anim.frames]
+    animation.Category.remove_category(NAME)
+    Filehandler.unload_image(IMAGE)
+    queue = bench.scene.preload([IMAGE], [NAME])
+    assert bench.scene.get_load_progress() == 0 and not bench.scene.is_loaded()
+    queue.wait()
+    assert bench.scene.is_loaded() and bench.scene.get_load_progress() == 1.0
+    assert not queue.errors
+    # the scene holds what it loaded
+    assert {("image", IMAGE), ("category", NAME)} <= bench.scene.handles.keys()
+    category = animation.Category.CATEGORIES[NAME]
+    assert get_frames(category) == expected
+    assert [tuple(f.hitbox) for anim in category.anims.values() for f in anim.frames] == hitboxes
+    assert rawimage.get_pixels(Filehandler.LOADED_IMAGES[IMAGE]) == \
+        rawimage.get_pixels(Filehandler.convert(pygame.image.load(IMAGE)))
+    bench.scene.clean()
+
+
+def test_loaded_assets_are_not_queued_again(bench):
+    animation.Category.get_category(NAME)
+    queue = bench.scene.preload(categories=[NAME])
+    assert queue.is_done() and queue.get_progress() == 1.0
+    assert ("category", NAME) in bench.scene.handles
+    bench.scene.clean()
+
+
+def test_failed_loads_are_reported(bench):
+    queue = bench.scene.preload([os.path.join("assets", "missing.png")])
+    queue.wait()
+    assert queue.is_done() and queue.get_progress() == 1.0
+    assert [name for name, e in queue.errors] == [os.path.join("assets", "missing.png")]
+    bench.scene.clean()
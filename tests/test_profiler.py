@@ -0,0 +1,53 @@
+import numpy as np
+import pygame
+
+from engine.misc import clock, profiler
+
+from benchmarks import scenarios
+
+
+def test_ring_buffer_keeps_the_newest_values():
+    ring = profiler.RingBuffer(4)
+    assert ring.get_stats() == (0.0, 0.0, 0.0)
+    for i in range(6):
+        ring.push(i / 1000)
+    assert ring.get_values().tolist() == [0.002, 0.003, 0.004, 0.005]
+    mean, p95, peak = ring.get_stats()
+    assert np.isclose(mean, 3.5) and np.isclose(peak, 5.0) and 4.0 < p95 <= 5.0
+
+
+def test_disabled_profiler_records_nothing():
+    profiler.set_enabled(False)
+    with profiler.scope("test"):
+        pass
+    profiler.end_frame()
+    assert "test" not in profiler.current and "test" not in profiler.stages
+
+
+def test_profiled_frames_time_stages_and_entity_types(bench):
+    scenarios.build_crowd(bench, 6, 2, 100)
+    clock.start(0)
+    profiler.set_enabled(True)
+    try:
+        for i in range(5):
+            profiler.begin_frame()
+            bench.frame(i)
+            profiler.end_frame()
+        stages, types = profiler.get_stats()
+        for name in ("frame", "animations", "world.tick", "entities.tick", "world.render", "entities.render"):
+            assert profiler.stages[name].count == 5
+            assert stages[name][0] > 0
+        assert stages["frame"][2] >= stages["entities.tick"][2]
+        for kind in (profiler.UPDATE, profiler.RENDER):
+            assert profiler.entity_types[("Peasant", kind)].count == 5
+            assert profiler.entity_types[("Mage", kind)].count == 5
+        # the overlay draws the tables
+        surface = pygame.Surface((320, 240))
+        profiler.render_overlay(surface)
+        assert surface.get_bounding_rect().w > 0
+    finally:
+        profiler.set_enabled(False)
+    # turning it on again starts over
+    profiler.set_enabled(True)
+    assert not profiler.stages and not profiler.entity_types
+    profiler.set_enabled(False)
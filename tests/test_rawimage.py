@@ -0,0 +1,42 @@
+import pygame
+
+from engine import singleton
+from engine.graphics import rawimage
+
+from conftest import make_surface
+
+
+def test_rawimage_round_trip(tmp_path):
+    surface = make_surface()
+    path = str(tmp_path / "image-0123456789abcdef.raw")
+    rawimage.save(path, surface)
+    loaded = rawimage.load(path)
+    assert loaded.get_size() == surface.get_size()
+    assert rawimage.get_pixels(loaded) == rawimage.get_pixels(surface)
+
+
+def test_rawimage_rejects_bad_files(tmp_path):
+    assert rawimage.load(str(tmp_path / "missing.raw")) is None
+    path = tmp_path / "bad.raw"
+    path.write_bytes(b"not a container")
+    assert rawimage.load(str(path)) is None
+
+
+def test_rawimage_load_image_compiles_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(singleton, "RAW_IMAGE_DIR", str(tmp_path))
+    png = str(tmp_path / "image.png")
+    pygame.image.save(make_surface(), png)
+    assert not rawimage.is_compiled(png)
+    first = rawimage.load_image(png)
+    assert rawimage.is_compiled(png)
+    assert rawimage.get_pixels(rawimage.load_image(png)) == rawimage.get_pixels(first)
+    assert rawimage.get_pixels(first) == rawimage.get_pixels(pygame.image.load(png))
+
+
+def test_rawimage_save_drops_outdated_containers(tmp_path):
+    keep = ["image-0123456789abcdef.anim", "other-0123456789abcdef.raw", "image-0123.raw"]
+    for name in keep + ["image-fedcba9876543210.raw"]:
+        (tmp_path / name).write_bytes(b"")
+    path = str(tmp_path / "image-0123456789abcdef.raw")
+    rawimage.save(path, make_surface())
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(keep + ["image-0123456789abcdef.raw"])
@@ -0,0 +1,45 @@
+import pygame
+
+from engine.graphics import rawimage, renderqueue
+
+from conftest import make_surface
+
+
+def test_flush_keeps_the_submission_order():
+    sprite = make_surface(12, 9)
+    calls = [("blit", (0, 0)), ("blit", (4, 3)), ("draw", (255, 0, 0), (6, 2, 5, 5)), ("blit", (8, 4)),
+             ("draw", (0, 0, 255), (0, 0, 3, 3)), ("draw", (0, 255, 0), (2, 1, 4, 4)), ("blit", (1, 5))]
+    expected = pygame.Surface((24, 16), pygame.SRCALPHA, 32)
+    queue = renderqueue.RenderQueue()
+    for kind, *args in calls:
+        if kind == "blit":
+            expected.blit(sprite, args[0])
+            queue.submit(sprite, args[0])
+        else:
+            pygame.draw.rect(expected, *args)
+            queue.submit_draw(pygame.draw.rect, *args)
+    target = pygame.Surface((24, 16), pygame.SRCALPHA, 32)
+    queue.flush(target)
+    assert rawimage.get_pixels(target) == rawimage.get_pixels(expected)
+    assert queue.last_count == 4
+    assert not queue.items and not queue.draws
+
+
+def test_submit_many_and_area():
+    sprite = make_surface(12, 9)
+    area = pygame.Rect(2, 1, 5, 5)
+    expected = pygame.Surface((16, 16), pygame.SRCALPHA, 32)
+    expected.blit(sprite, (0, 0))
+    expected.blit(sprite, (3, 3), area)
+    expected.blit(sprite, (5, 2), None, pygame.BLEND_RGBA_ADD)
+    queue = renderqueue.RenderQueue()
+    queue.submit(sprite, (0, 0))
+    queue.submit_many([(sprite, (3, 3), area, 0), (sprite, (5, 2), None, pygame.BLEND_RGBA_ADD)])
+    target = pygame.Surface((16, 16), pygame.SRCALPHA, 32)
+    queue.flush(target)
+    assert rawimage.get_pixels(target) == rawimage.get_pixels(expected)
+    # cleared queues draw nothing
+    queue.submit(sprite, (0, 0))
+    queue.clear()
+    queue.flush(target)
+    assert queue.last_count == 0
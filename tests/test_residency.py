@@ -0,0 +1,44 @@
+from engine import singleton
+from engine.gamesystem import entity as gentity
+
+
+def fill(world, count: int, start: int = 100):
+    """Create <count> empty chunks far from the camera"""
+    for i in range(count):
+        world.get_chunk(start + i, start)
+
+
+def test_env_chunks_stay_resident(bench):
+    world = bench.world
+    obj = gentity.Entity()
+    obj.chunk = [100, 100]
+    world.add_env_obj(obj)
+    world.env.handle_changes()
+    # env objects live in chunk.env only
+    assert not world.peek_chunk(100, 100).entities
+    world.residency.budget = 4
+    fill(world, 20, start=101)
+    world.residency.update()
+    assert world.peek_chunk(100, 100) is not None
+    assert world.env.entity_buffer[obj.id] is obj
+    assert world.residency.get_resident() <= 4
+
+
+def test_evict_backs_off_when_chunks_are_in_use(bench):
+    world = bench.world
+    residency = world.residency
+    residency.budget = 0
+    # chunks around the camera are never unloaded
+    keep = max(singleton.RENDER_DIS) + 1
+    for x in range(-keep, keep + 1):
+        world.get_chunk(x, 0)
+    resident = residency.get_resident()
+    residency.update()
+    assert residency.get_resident() == resident
+    # nothing could be freed -- the next pass waits
+    fill(world, 3)
+    residency.update()
+    assert residency.get_resident() == resident + 3
+    residency.tick = residency.next_evict - 1
+    residency.update()
+    assert residency.get_resident() == resident
@@ -0,0 +1,23 @@
+import time
+
+from engine import headless
+from engine.misc import clock
+
+import servermain
+
+
+def test_server_loop_ticks_the_world():
+    handler = servermain.create_world()
+    clock.start(0)
+    assert headless.run(frames=10, fps=servermain.TICK_RATE) == 10
+    assert handler.ticks == 10
+    assert len(handler.entities) == 3
+
+
+def test_server_loop_runs_in_real_time():
+    servermain.create_world()
+    start = time.perf_counter()
+    headless.run(frames=6, fps=servermain.TICK_RATE, realtime=True)
+    # capped at the tick rate -- uncapped these frames take a few milliseconds
+    assert time.perf_counter() - start >= 3 / servermain.TICK_RATE
+    clock.start(0)
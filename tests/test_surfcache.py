@@ -0,0 +1,45 @@
+import pygame
+
+from engine.graphics import animation, surfcache
+
+# registers the animation manifest
+from scripts import assets
+
+from conftest import make_surface
+
+
+def test_cache_evicts_least_recently_used_over_budget():
+    surface = make_surface(4, 4)
+    size = surfcache.get_surface_bytes(surface)
+    cache = surfcache.SurfaceCache("test-lru", size * 3)
+    for key in "abc":
+        cache.add(key, surface.copy())
+    # a hit makes "a" the most recently used
+    assert cache.get("a", pygame.Surface, (1, 1)) is cache.surfaces["a"]
+    cache.get("d", surface.copy)
+    assert list(cache.surfaces) == ["c", "a", "d"]
+    assert cache.get_stats() == {"surfaces": 3, "bytes": size * 3, "budget": size * 3, "hits": 1, "misses": 1,
+                                 "evictions": 1}
+    # the newest surface stays even when it alone is over the budget
+    cache.add("big", make_surface(40, 40))
+    assert list(cache.surfaces) == ["big"]
+    assert cache.bytes == surfcache.get_surface_bytes(cache.surfaces["big"])
+    cache.remove("big")
+    assert len(cache) == 0 and cache.bytes == 0
+    del surfcache.SurfaceCache.CACHES[cache.name]
+
+
+def test_rotation_keys_stay_bounded():
+    fire = animation.Category.get_category("fire").get_animation("fire")
+    registry = fire.get_registry()
+    sources = {f.get_frame(flip) for f in fire.frames for flip in (0, 1)}
+    surfcache.ROTATIONS.remove_matching(lambda key: key[0] in sources)
+    # a fireball flying in every direction
+    for i in range(720):
+        registry.angle = i * 0.5 - 180
+        registry.update_angle()
+        registry.fnum = i % fire.length
+        registry.get_frame(i % 2 == 1)
+    angles = {key[1] for key in surfcache.ROTATIONS.surfaces if key[0] in sources}
+    assert 0 < len(angles) <= (fire.rotations - 1) * 2
+    assert all(abs(a) % fire.rot_angle == 0 for a in angles)
@@ -0,0 +1,66 @@
+import pytest
+
+from engine.handler import handler
+from engine.misc import clock
+
+from benchmarks import harness, scenarios
+
+from conftest import FB
+
+
+def build(transforms: bool, scenario: str):
+    """A seeded scenario with or without the batched TransformStore"""
+    harness.seed(0)
+    bench = harness.Bench(FB)
+    bench.layer.handler = handler.Handler(bench.layer, transforms=transforms)
+    if scenario:
+        scenario = scenarios.Scenario.get_scenario(scenario)
+        scenario.build(bench, **scenario.params)
+    else:
+        scenarios.spawn_player(bench)
+    clock.start(0)
+    return bench
+
+
+def get_entities(bench):
+    """Every entity in spawn order - ids keep counting across runs"""
+    buffer = bench.handler.entity_buffer
+    return [buffer[i] for i in sorted(bench.handler.entities | bench.handler.priority_entities)]
+
+
+def test_batched_player_matches_single_moves():
+    results = []
+    for transforms in (False, True):
+        bench = build(transforms, None)
+        bench.handler.handle_changes()
+        get_entities(bench)[0].motion.xy = (4.5, -3.25)
+        for i in range(20):
+            bench.frame(i)
+        player = get_entities(bench)[0]
+        results.append((tuple(player.position), tuple(player.rect), list(player.chunk),
+                        tuple(bench.layer.camera.position)))
+    assert results[0] == results[1]
+
+
+def test_batched_moves_sync_rect_and_hitbox():
+    bench = build(True, "crowd-small")
+    for i in range(30):
+        bench.frame(i)
+    for e in get_entities(bench):
+        assert (e.rect.x, e.rect.y) == (round(e.position.x), round(e.position.y))
+        assert e.rel_hitbox.topleft == (e.rect.x + e.hitbox.x, e.rect.y + e.hitbox.y)
+        slot = bench.handler.transforms.slots[e.id]
+        assert tuple(bench.handler.transforms.rel_hitbox[slot]) == tuple(e.rel_hitbox)
+
+
+def test_batched_crowd_stays_close_to_single_moves():
+    # batched entities see the others where they were at the start of the tick -> tiny drift only
+    runs = []
+    for transforms in (False, True):
+        bench = build(transforms, "crowd-small")
+        for i in range(30):
+            bench.frame(i)
+        runs.append([tuple(e.position) for e in get_entities(bench)])
+    assert len(runs[0]) == len(runs[1])
+    for single, batched in zip(*runs):
+        assert single == pytest.approx(batched, abs=0.5)
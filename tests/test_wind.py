@@ -0,0 +1,70 @@
+import numpy as np
+import pygame
+import pytest
+
+from scripts.environment import wind
+
+CELL = 16
+
+
+def make_field(columns: int = 6, rows: int = 4):
+    """A field at the origin with a different velocity in every cell"""
+    field = wind.WindField(CELL, columns, rows)
+    field.velocity[..., 0] = np.arange(rows * columns).reshape(rows, columns) + 1
+    field.velocity[..., 1] = -field.velocity[..., 0]
+    return field
+
+
+def test_follow_shifts_whole_cells():
+    field = make_field()
+    old = field.velocity.copy()
+    # less than a cell -- nothing moves
+    field.follow(pygame.Rect(CELL - 1, 0, 10, 10), 0)
+    assert field.origin == [0, 0]
+    assert np.array_equal(field.velocity, old)
+    # one cell right + two down
+    field.follow(pygame.Rect(CELL, CELL * 2, 10, 10), 0)
+    assert field.origin == [CELL, CELL * 2]
+    assert np.array_equal(field.velocity[:-2, :-1], old[2:, 1:])
+    # cells that enter the field start calm
+    assert not field.velocity[-2:].any() and not field.velocity[:, -1].any()
+    # back to the start -- the cells shifted out are gone
+    field.follow(pygame.Rect(0, 0, 10, 10), 0)
+    assert np.array_equal(field.velocity[2:, 1:], old[2:, 1:])
+    assert not field.velocity[:2].any() and not field.velocity[:, 0].any()
+
+
+def test_follow_keeps_a_margin():
+    field = make_field()
+    field.follow(pygame.Rect(CELL * 10 + 3, CELL * 5, 10, 10), 2)
+    assert field.origin == [CELL * 8, CELL * 3]
+
+
+def test_follow_far_away_clears_the_field():
+    field = make_field()
+    field.follow(pygame.Rect(CELL * 100, 0, 10, 10), 0)
+    assert not field.velocity.any()
+
+
+def test_sample_is_bilinear_between_cell_centers():
+    field = make_field()
+    v = field.velocity
+    # cell centers are the cell values
+    vx, vy = field.sample([CELL * 1.5, CELL * 3.5], [CELL * 0.5, CELL * 2.5])
+    assert vx.tolist() == [v[0, 1, 0], v[2, 3, 0]]
+    assert vy.tolist() == [v[0, 1, 1], v[2, 3, 1]]
+    # half way between four centers is their average
+    vx, vy = field.sample(CELL * 2, CELL * 2)
+    assert vx == pytest.approx(v[1:3, 1:3, 0].mean())
+    # quarter of the way along x
+    vx, vy = field.sample(CELL * 0.5 + CELL / 4, CELL * 0.5)
+    assert vx == pytest.approx(v[0, 0, 0] * 0.75 + v[0, 1, 0] * 0.25)
+
+
+def test_sample_outside_the_field_is_calm():
+    field = make_field()
+    field.follow(pygame.Rect(CELL * 4, CELL * 4, 10, 10), 0)
+    field.velocity[:] = 5
+    vx, vy = field.sample([0, CELL * 4 + CELL, CELL * 100], [0, CELL * 4 + CELL, 0])
+    assert vx.tolist() == [0, 5, 0]
+    assert vy.tolist() == [0, 5, 0]